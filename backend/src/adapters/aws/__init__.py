@@ -1,11 +1,19 @@
-from .cloudwatch import CloudwatchLogService
+from .cloudwatch import CloudwatchLogService, InsightsQuery, QueryStatistics
 from .ecs import ECSService
 from .eventbridge import EventBridgeService
 from .lambda_function import LambdaService
+from .s3 import S3Service
+from .sts import STSService
+from .tagging import ResourceTaggingService
 
 __all__ = [
     "ECSService",
     "LambdaService",
     "CloudwatchLogService",
+    "InsightsQuery",
+    "QueryStatistics",
     "EventBridgeService",
+    "ResourceTaggingService",
+    "S3Service",
+    "STSService",
 ]
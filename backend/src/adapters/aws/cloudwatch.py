@@ -1,20 +1,143 @@
+import re
 import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
 
 import boto3
 from types_boto3_logs.client import CloudWatchLogsClient
 from types_boto3_logs.type_defs import ResultFieldTypeDef
 
 from src.common.constants import AWS_ENDPOINT, AWS_REGION
-from src.common.exceptions import RequestTimeoutError
 from src.common.logger import logger
 from src.common.meta import SingletonMeta
+from src.common.utils.backoff import exponential_backoff
+
+# Statuses of a query that has not produced its final results yet
+QUERY_PENDING_STATUSES = ("Scheduled", "Running")
+# Status of a query that read all its logs, the others (Failed, Cancelled, Timeout) may not have
+QUERY_COMPLETE_STATUS = "Complete"
+# Insights returns at most 10,000 rows, whatever the `limit` command says
+QUERY_MAX_RESULTS = 10000
+QUERY_LIMIT_PATTERN = re.compile(r"\|\s*limit\s+(\d+)", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class InsightsQuery:
+    log_group_names: list[str]
+    query_string: str
+    start_time: int
+    end_time: int
+
+    @property
+    def limit(self) -> int:
+        """Maximum number of rows the query can return."""
+        if match := QUERY_LIMIT_PATTERN.search(self.query_string):
+            return min(int(match.group(1)), QUERY_MAX_RESULTS)
+        return QUERY_MAX_RESULTS
+
+    def split(self) -> list["InsightsQuery"]:
+        """Split the query in two, by log groups first, then by time range.
+
+        Returns an empty list when the query covers a single log group over a single second.
+        """
+        if len(self.log_group_names) > 1:
+            middle = len(self.log_group_names) // 2
+            return [
+                InsightsQuery(self.log_group_names[:middle], self.query_string, self.start_time, self.end_time),
+                InsightsQuery(self.log_group_names[middle:], self.query_string, self.start_time, self.end_time),
+            ]
+        if self.end_time > self.start_time:
+            middle = (self.start_time + self.end_time) // 2
+            return [
+                InsightsQuery(self.log_group_names, self.query_string, self.start_time, middle),
+                # the end time is inclusive, the second `middle` belongs to the first half only
+                InsightsQuery(self.log_group_names, self.query_string, middle + 1, self.end_time),
+            ]
+        return []
+
+
+@dataclass(frozen=True)
+class QueryStatistics:
+    """Statistics of a finished (or abandoned) Insights query.
+
+    `records_scanned`, `bytes_scanned` and `records_matched` come from the `statistics` block of
+    GetQueryResults, `bytes_scanned` being what Insights charges for. `duration` is measured from
+    the start of the query to its last poll, `polls` counts the GetQueryResults calls.
+    """
+
+    query_id: str
+    query: InsightsQuery
+    status: str
+    depth: int  # number of times the submitted query was split to get here
+    truncated: bool = False  # hit its row limit and could not be split any further
+    records_scanned: float = 0.0
+    bytes_scanned: float = 0.0
+    records_matched: float = 0.0
+    duration: float = 0.0
+    polls: int = 0
+
+
+@dataclass
+class _SplitQuery:
+    """A submitted query along with the rows merged from its sub-queries."""
+
+    query: InsightsQuery
+    outstanding: int = 1
+    results: list = field(default_factory=list)
+    failed: bool = False  # one of the sub-queries did not complete
+
+
+@dataclass
+class _RunningQuery:
+    query: InsightsQuery
+    origin: _SplitQuery
+    depth: int
+    time_depth: int  # number of times the time range was bisected to get here
+    delays: Iterator[float]
+    next_poll_at: float = field(default=0.0)
+    started_at: float = field(default_factory=time.time)
+    polls: int = 0
+
+    def statistics(
+        self, query_id: str, status: str, statistics: dict | None = None, truncated: bool = False
+    ) -> QueryStatistics:
+        statistics = statistics or {}
+        return QueryStatistics(
+            query_id=query_id,
+            query=self.query,
+            status=status,
+            depth=self.depth,
+            truncated=truncated,
+            records_scanned=statistics.get("recordsScanned", 0.0),
+            bytes_scanned=statistics.get("bytesScanned", 0.0),
+            records_matched=statistics.get("recordsMatched", 0.0),
+            duration=time.time() - self.started_at,
+            polls=self.polls,
+        )
 
 
 class CloudwatchLogService(metaclass=SingletonMeta):
     client: CloudWatchLogsClient
 
-    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT):
-        self.client = boto3.client("logs", region_name=region, endpoint_url=endpoint_url)
+    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT, session: boto3.Session | None = None):
+        self.client = (session or boto3).client("logs", region_name=region, endpoint_url=endpoint_url)
+
+    def start_query(self, query: InsightsQuery) -> str:
+        logger.debug(f"Querying logs for groups: {query.log_group_names} from {query.start_time} to {query.end_time}")
+        response = self.client.start_query(
+            logGroupNames=query.log_group_names,
+            queryString=query.query_string,
+            startTime=query.start_time,
+            endTime=query.end_time,
+        )
+        return response.get("queryId")
+
+    def stop_query(self, query_id: str):
+        try:
+            self.client.stop_query(queryId=query_id)
+        except Exception as e:
+            # the query may have finished in the meantime
+            logger.debug(f"Could not stop query {query_id}: {e}")
 
     def query_logs(
         self,
@@ -22,28 +145,146 @@ class CloudwatchLogService(metaclass=SingletonMeta):
         query_string: str,
         start_time: int,
         end_time: int,
-        timeout: int = 15,
-        delay: int = 1,
+        deadline: float | None = None,
+        on_statistics: Callable[[QueryStatistics], None] | None = None,
     ) -> list[ResultFieldTypeDef]:
-        logger.debug(f"Querying logs for groups: {log_group_names} from {start_time} to {end_time}")
-        query_time = time.time()
-        # start the query
-        start_query_response = self.client.start_query(
-            logGroupNames=log_group_names,
-            queryString=query_string,
-            startTime=start_time,
-            endTime=end_time,
-        )
-        query_id = start_query_response.get("queryId")
-
-        # Wait for the query to complete
-        response = {"status": "Running"}
-        while response.get("status") == "Running":
-            if time.time() - query_time > timeout:
-                raise RequestTimeoutError(
-                    f"CloudWatch Logs Insights query timed out after {timeout}s for log groups: {log_group_names}"
+        query = InsightsQuery(log_group_names, query_string, start_time, end_time)
+        for _, results in self.query_logs_concurrently(
+            [query], max_concurrent_queries=1, deadline=deadline, on_statistics=on_statistics
+        ):
+            return results
+        return []
+
+    def query_logs_concurrently(
+        self,
+        queries: Iterable[InsightsQuery],
+        max_concurrent_queries: int = 10,
+        deadline: float | None = None,
+        initial_delay: float = 0.5,
+        max_delay: float = 5.0,
+        max_time_split_depth: int = 6,
+        on_statistics: Callable[[QueryStatistics], None] | None = None,
+    ) -> Iterable[tuple[InsightsQuery, list[ResultFieldTypeDef]]]:
+        """Run Insights queries side by side, keeping at most `max_concurrent_queries` in flight.
+
+        Queries are started up front and polled together; each (query, results) pair is yielded
+        as soon as the query finishes, so the total wall time is bound by the slowest query.
+        Every query is first checked after `initial_delay`, then with a jittered exponential
+        backoff capped at `max_delay`. Queries still running at `deadline` (epoch seconds) are
+        stopped and abandoned, so they neither block the caller nor keep consuming quota.
+
+        A query that ends with another status than Complete (Failed, Cancelled, Timeout) is not
+        yielded, like an abandoned query: its log groups have not been scanned.
+
+        A query whose results hit its row limit is split into sub-queries (see InsightsQuery.split):
+        by log groups down to single log groups, then by halving the time range, up to
+        `max_time_split_depth` times. Sub-queries run alongside the other queries and their rows
+        are merged, the submitted query is yielded once all of them have finished. Results still
+        truncated are logged, and flagged in the statistics of their query.
+
+        `on_statistics` is called with the statistics of every query that was started, sub-queries
+        and abandoned queries included.
+        """
+        # (query, submitted query, split depth, time split depth)
+        pending: list[tuple[InsightsQuery, _SplitQuery, int, int]] = [
+            (query, _SplitQuery(query), 0, 0) for query in queries
+        ]
+        pending.reverse()  # pop() from the tail keeps the submission order
+        running: dict[str, _RunningQuery] = {}
+
+        while pending or running:
+            if deadline is not None and time.time() >= deadline:
+                self._abandon(running, pending, on_statistics)
+                return
+
+            # Top up the in-flight queries
+            while pending and len(running) < max_concurrent_queries:
+                query, origin, depth, time_depth = pending.pop()
+                try:
+                    query_id = self.start_query(query)
+                except self.client.exceptions.LimitExceededException:
+                    # Account-wide concurrent query quota reached, retry once a slot frees up
+                    pending.append((query, origin, depth, time_depth))
+                    break
+                delays = exponential_backoff(initial_delay, max_delay)
+                running[query_id] = _RunningQuery(
+                    query=query,
+                    origin=origin,
+                    depth=depth,
+                    time_depth=time_depth,
+                    delays=delays,
+                    next_poll_at=time.time() + next(delays),
                 )
-            time.sleep(delay)
-            response = self.client.get_query_results(queryId=query_id)
-        logger.debug(f"Query completed with status: {response.get('status')}")
-        return response.get("results", [])
+
+            # Sleep until the next query is due (or the deadline)
+            wake_at = min((r.next_poll_at for r in running.values()), default=time.time() + initial_delay)
+            if deadline is not None:
+                wake_at = min(wake_at, deadline)
+            time.sleep(max(0.0, wake_at - time.time()))
+
+            for query_id, running_query in list(running.items()):
+                if running_query.next_poll_at > time.time():
+                    continue
+
+                response = self.client.get_query_results(queryId=query_id)
+                running_query.polls += 1
+                status = response.get("status")
+                if status in QUERY_PENDING_STATUSES:
+                    running_query.next_poll_at = time.time() + next(running_query.delays)
+                    continue
+
+                del running[query_id]
+                results = response.get("results", [])
+                query, origin = running_query.query, running_query.origin
+                logger.debug(f"Query {query_id} completed with status: {status}, {len(results)} rows")
+
+                # a query hitting its limit is split by log groups first, which is bounded by the chunk size,
+                # then by time range, which has its own budget so that a noisy log group is not starved of it
+                complete, sub_queries = status == QUERY_COMPLETE_STATUS, []
+                time_split = len(query.log_group_names) == 1
+                if complete and len(results) >= query.limit:
+                    if not time_split or running_query.time_depth < max_time_split_depth:
+                        sub_queries = query.split()
+                truncated = complete and len(results) >= query.limit and not sub_queries
+                if on_statistics:
+                    on_statistics(running_query.statistics(query_id, status, response.get("statistics"), truncated))
+
+                if not complete:
+                    logger.warning(f"Query {query_id} ended with status {status}, log groups: {query.log_group_names}")
+                    origin.failed = True
+                elif sub_queries:
+                    # Re-run the query in smaller pieces, they are picked up first
+                    logger.debug(f"Query {query_id} hit its limit of {query.limit} rows, splitting it")
+                    origin.outstanding += len(sub_queries) - 1
+                    depth, time_depth = running_query.depth + 1, running_query.time_depth + time_split
+                    pending.extend((sub_query, origin, depth, time_depth) for sub_query in sub_queries)
+                    continue
+                elif truncated:
+                    logger.warning(
+                        f"Query results truncated to {query.limit} rows for log groups: {query.log_group_names} "
+                        f"from {query.start_time} to {query.end_time}"
+                    )
+
+                if not origin.failed:
+                    origin.results.extend(results)
+                origin.outstanding -= 1
+                if origin.outstanding == 0 and not origin.failed:
+                    yield origin.query, origin.results
+
+    def _abandon(
+        self,
+        running: dict[str, _RunningQuery],
+        pending: list[tuple[InsightsQuery, _SplitQuery, int, int]],
+        on_statistics: Callable[[QueryStatistics], None] | None = None,
+    ):
+        for query_id, running_query in running.items():
+            logger.warning(
+                f"Deadline reached, stopping query {query_id} for log groups: {running_query.query.log_group_names}"
+            )
+            self.stop_query(query_id)
+            if on_statistics:
+                on_statistics(running_query.statistics(query_id, "Abandoned"))
+        for query, *_ in pending:
+            logger.warning(f"Deadline reached, skipping query for log groups: {query.log_group_names}")
+        running.clear()
+        pending.clear()
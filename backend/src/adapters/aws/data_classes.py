@@ -1,9 +1,14 @@
-import re
+import base64
+import gzip
 import json
+import re
 from enum import Enum
+from functools import cached_property
+from typing import Iterator
 from aws_lambda_powertools.utilities.data_classes import (
     CloudWatchAlarmData,
     EventBridgeEvent,
+    SQSEvent,
     event_source
 )
 
@@ -15,9 +20,12 @@ __all__ = [
     "CfnStackStatus",
     "CwAlarmEvent",
     "CwLogEvent",
+    "CwLogsSubscriptionEvent",
     "EventBridgeEvent",
     "HealthEvent",
     "GuardDutyFindingEvent",
+    "ResourceChangeEvent",
+    "SQSEvent",
 ]
 
 
@@ -164,8 +172,84 @@ class CwLogData(DictWrapper):
     def logs(self) -> list:
         return self.get("logs", [])
 
+    @property
+    def templates(self) -> list:
+        return self.get("templates", [])
+
+    @property
+    def account(self) -> str | None:
+        return self.get("account")
+
+    @property
+    def region(self) -> str | None:
+        return self.get("region")
+
 
 class CwLogEvent(EventBridgeEvent):
     @property
     def detail(self) -> CwLogData:
         return CwLogData(self["detail"])
+
+
+# Resource Change Event --------------------------
+class ResourceChangeEvent(EventBridgeEvent):
+    """Tag change or CloudTrail API call event of a Lambda function or an ECS cluster."""
+
+    @property
+    def resource_arns(self) -> list[str]:
+        if self.resources:
+            return self.resources
+
+        # CloudTrail events carry the resource in the API request/response
+        response = self.detail.get("responseElements") or {}
+        if arn := response.get("functionArn") or response.get("cluster", {}).get("clusterArn"):
+            return [arn]
+
+        request = self.detail.get("requestParameters") or {}
+        if function_name := request.get("functionName"):
+            if function_name.startswith("arn:"):
+                return [function_name]
+            return [f"arn:aws:lambda:{self.region}:{self.account}:function:{function_name}"]
+        return []
+
+
+# CloudWatch Logs Subscription Event --------------------------
+class CwLogsSubscriptionEvent(DictWrapper):
+    """Payload of a CloudWatch Logs subscription filter, `{"awslogs": {"data": <base64 gzip JSON>}}`.
+
+    The payload is decoded once, on first access: the whole document is decompressed, then parsed.
+    It is not an incremental decode, a delivery being bounded by the size of a Lambda event payload.
+    """
+
+    @cached_property
+    def decoded_data(self) -> dict:
+        return json.loads(gzip.decompress(base64.b64decode(self["awslogs"]["data"])))
+
+    @property
+    def message_type(self) -> str:
+        return self.decoded_data["messageType"]
+
+    @property
+    def is_control_message(self) -> bool:
+        """CloudWatch Logs checks that the destination is reachable with a CONTROL_MESSAGE."""
+        return self.message_type == "CONTROL_MESSAGE"
+
+    @property
+    def owner(self) -> str:
+        return self.decoded_data["owner"]
+
+    @property
+    def log_group(self) -> str:
+        return self.decoded_data["logGroup"]
+
+    @property
+    def log_stream(self) -> str:
+        return self.decoded_data["logStream"]
+
+    @property
+    def subscription_filters(self) -> list[str]:
+        return self.decoded_data.get("subscriptionFilters", [])
+
+    def log_events(self) -> Iterator[dict]:
+        """Log events of the payload, `{"id": ..., "timestamp": <ms>, "message": ...}`."""
+        yield from self.decoded_data.get("logEvents", [])
@@ -1,33 +1,51 @@
 from typing import Iterable
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from types_boto3_ecs.client import ECSClient
 from types_boto3_ecs.type_defs import ClusterTypeDef
 
-from src.common.constants import AWS_ENDPOINT, AWS_REGION
-from src.common.exceptions import InternalServerError
+from src.common.constants import AWS_ENDPOINT, AWS_MAX_ATTEMPTS, AWS_REGION
+from src.common.exceptions import InternalServerError, NotFoundError
 from src.common.meta import SingletonMeta
 
+# describe_clusters accepts at most 100 clusters per call
+DESCRIBE_CLUSTERS_MAX = 100
+
 
 # Service -----------------------------------
 class ECSService(metaclass=SingletonMeta):
     client: ECSClient
 
-    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT):
-        self.client = boto3.client("ecs", region_name=region, endpoint_url=endpoint_url)
-
-    def list_clusters(self, **kwargs) -> Iterable[ClusterTypeDef]:
-        """List all ECS clusters."""
+    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT, session: boto3.Session | None = None):
+        # Transient failures (throttling, 5xx, connection errors) are retried per request,
+        # so a failed page does not restart the whole walk
+        config = Config(retries={"max_attempts": AWS_MAX_ATTEMPTS, "mode": "adaptive"})
+        self.client = (session or boto3).client("ecs", region_name=region, endpoint_url=endpoint_url, config=config)
+
+    def list_clusters(self) -> Iterable[ClusterTypeDef]:
+        """List all ECS clusters, described 100 at a time."""
+        pages = self.client.get_paginator("list_clusters").paginate(
+            PaginationConfig={"PageSize": DESCRIBE_CLUSTERS_MAX}
+        )
         try:
-            response = self.client.list_clusters(**kwargs)
-
-            if cluster_arns := response.get("clusterArns", []):
-                clusters = self.client.describe_clusters(clusters=cluster_arns, include=["TAGS", "CONFIGURATIONS"])
-
-                yield from clusters.get("clusters", [])
+            for page in pages:
+                if cluster_arns := page.get("clusterArns", []):
+                    response = self.client.describe_clusters(clusters=cluster_arns, include=["TAGS", "CONFIGURATIONS"])
+                    yield from response.get("clusters", [])
 
-            if cursor := response.get("nextToken"):
-                yield from self.list_clusters(nextToken=cursor)
+        except (BotoCoreError, ClientError) as e:
+            raise InternalServerError(f"An unexpected error occurred while listing ECS clusters: {e}")
 
+    def get_cluster(self, cluster: str) -> ClusterTypeDef:
+        """Get an active ECS cluster by name or ARN."""
+        try:
+            response = self.client.describe_clusters(clusters=[cluster], include=["TAGS", "CONFIGURATIONS"])
         except Exception as e:
-            raise InternalServerError(f"An unexpected error occurred while listing ECS clusters: {e}")
+            raise InternalServerError(f"An unexpected error occurred while describing ECS cluster: {e}")
+
+        clusters = [item for item in response.get("clusters", []) if item.get("status") != "INACTIVE"]
+        if not clusters:
+            raise NotFoundError(f"ECS cluster {cluster} not found")
+        return clusters[0]
@@ -1,3 +1,5 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Unpack
 
 import boto3
@@ -8,6 +10,50 @@ from src.common.constants import AWS_ENDPOINT, AWS_REGION
 from src.common.exceptions import UnprocessedError
 from src.common.logger import logger
 from src.common.meta import SingletonMeta
+from src.common.utils.backoff import exponential_backoff
+
+# PutEvents accepts at most 10 entries and 256 KB per request
+PUT_EVENTS_MAX_ENTRIES = 10
+PUT_EVENTS_MAX_SIZE = 256 * 1024
+# Entries failing with these error codes are rejected for good, resending them is pointless
+PUT_EVENTS_NON_RETRYABLE_ERRORS = ("MalformedDetail", "InvalidArgument", "ValidationException")
+
+
+def entry_size(entry: PutEventsRequestEntryTypeDef) -> int:
+    """Size of an entry as counted by PutEvents (see "Calculating PutEvents event entry size")."""
+    size = 14 if entry.get("Time") else 0
+    for key in ("Source", "DetailType", "Detail"):
+        size += len(entry.get(key, "").encode("utf-8"))
+    size += sum(len(resource.encode("utf-8")) for resource in entry.get("Resources", []))
+    return size
+
+
+def pack_entries(
+    entries: List[PutEventsRequestEntryTypeDef],
+    max_entries: int = PUT_EVENTS_MAX_ENTRIES,
+    max_size: int = PUT_EVENTS_MAX_SIZE,
+) -> tuple[list[list[PutEventsRequestEntryTypeDef]], list[PutEventsRequestEntryTypeDef]]:
+    """
+    Pack entries into as few PutEvents requests as possible (first-fit decreasing).
+    :param entries: entries to pack
+    :param max_entries: maximum number of entries per request
+    :param max_size: maximum size of a request in bytes
+    :return: the batches, and the entries too large to be sent at all
+    """
+    batches: list[tuple[int, list]] = []
+    oversized = []
+    for size, entry in sorted(((entry_size(entry), entry) for entry in entries), key=lambda item: -item[0]):
+        if size > max_size:
+            oversized.append(entry)
+            continue
+        for i, (batch_size, batch) in enumerate(batches):
+            if len(batch) < max_entries and batch_size + size <= max_size:
+                batch.append(entry)
+                batches[i] = (batch_size + size, batch)
+                break
+        else:
+            batches.append((size, [entry]))
+    return [batch for _, batch in batches], oversized
 
 
 # Service -----------------------------------
@@ -17,17 +63,57 @@ class EventBridgeService(metaclass=SingletonMeta):
     def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT):
         self.client = boto3.client("events", region_name=region, endpoint_url=endpoint_url)
 
-    def put_events(self, events: List[Unpack[PutEventsRequestEntryTypeDef]]):
-        """Publish an event to the AWS EventBus."""
-        response = self.client.put_events(Entries=events)
+    def put_events(
+        self,
+        events: List[Unpack[PutEventsRequestEntryTypeDef]],
+        max_attempts: int = 3,
+        max_concurrent_requests: int = 4,
+    ):
+        """Publish events to the AWS EventBus.
 
-        failed_count = response.get("FailedEntryCount", 0)
-        status_code = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
-        entries = response.get("Entries", [])
+        Events are packed into as few requests as the PutEvents limits allow (10 entries, 256 KB),
+        and the requests are sent concurrently. Only the entries reported as failed are resent,
+        with backoff, up to `max_attempts` times.
+        """
+        batches, oversized = pack_entries(events)
+        for entry in oversized:
+            logger.error(f"Event too large to be published ({entry_size(entry)} bytes): {entry.get('DetailType')}")
 
-        if failed_count > 0 or status_code != 200 or not entries:
+        with ThreadPoolExecutor(max_workers=max_concurrent_requests) as executor:
+            results = list(executor.map(lambda batch: self._put_batch(batch, max_attempts), batches))
+
+        failed = [result for batch_failed in results for result in batch_failed]
+        if failed or oversized:
             raise UnprocessedError(
-                f"Failed to publish {failed_count}/{len(events)} events to EventBridge. "
-                f"Status: {status_code}, Response: {entries}"
+                f"Failed to publish {len(failed) + len(oversized)}/{len(events)} events to EventBridge. "
+                f"Errors: {failed}"
             )
-        logger.debug(f"Event published successfully: {entries}")
+        logger.debug(f"{len(events)} events published successfully in {len(batches)} requests")
+
+    def _put_batch(self, entries: list[PutEventsRequestEntryTypeDef], max_attempts: int) -> list[dict]:
+        """Send a single request, then resend its failed entries. Returns the errors of the entries left."""
+        delays = exponential_backoff(initial=0.2, maximum=2.0)
+        rejected, errors = [], []
+        for attempt in range(1, max_attempts + 1):
+            response = self.client.put_events(Entries=entries)
+            if response.get("FailedEntryCount", 0) == 0:
+                return rejected
+
+            retries, errors = [], []
+            for entry, result in zip(entries, response.get("Entries", [])):
+                if not (error_code := result.get("ErrorCode")):
+                    continue
+                error = {"ErrorCode": error_code, "ErrorMessage": result.get("ErrorMessage")}
+                if error_code in PUT_EVENTS_NON_RETRYABLE_ERRORS:
+                    rejected.append(error)
+                else:
+                    retries.append(entry)
+                    errors.append(error)
+            if not retries:
+                break
+
+            logger.warning(f"{len(retries)}/{len(entries)} events failed to publish (attempt {attempt}): {errors}")
+            entries = retries
+            if attempt < max_attempts:
+                time.sleep(next(delays))
+        return rejected + errors
@@ -1,13 +1,20 @@
 from typing import Iterable
 
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from types_boto3_lambda.client import LambdaClient
 from types_boto3_lambda.type_defs import FunctionConfigurationTypeDef
 
-from src.common.constants import AWS_ENDPOINT, AWS_REGION
-from src.common.exceptions import InternalServerError
+from src.common.constants import AWS_ENDPOINT, AWS_MAX_ATTEMPTS, AWS_REGION
+from src.common.exceptions import InternalServerError, NotFoundError
 from src.common.meta import SingletonMeta
 
+from .tagging import ResourceTaggingService
+
+# list_functions returns at most 50 functions per page
+LIST_FUNCTIONS_MAX = 50
+
 
 class FunctionConfiguration(FunctionConfigurationTypeDef):
     Tags: dict[str, str]
@@ -17,19 +24,44 @@ class FunctionConfiguration(FunctionConfigurationTypeDef):
 class LambdaService(metaclass=SingletonMeta):
     client: LambdaClient
 
-    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT):
-        self.client = boto3.client("lambda", region_name=region, endpoint_url=endpoint_url)
+    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT, session: boto3.Session | None = None):
+        # Transient failures (throttling, 5xx, connection errors) are retried per request,
+        # so a failed page does not restart the whole walk
+        config = Config(retries={"max_attempts": AWS_MAX_ATTEMPTS, "mode": "adaptive"})
+        self.client = (session or boto3).client("lambda", region_name=region, endpoint_url=endpoint_url, config=config)
+        self.tagging_service = ResourceTaggingService(region=region, endpoint_url=endpoint_url, session=session)
+
+    def list_functions(self, tag_filters: dict[str, str] | None = None) -> Iterable[FunctionConfiguration]:
+        """List Lambda functions along with their tags.
 
-    def list_functions(self, **kwargs) -> Iterable[FunctionConfiguration]:
+        The tags of all functions are resolved up front with the Resource Groups Tagging API, a call
+        per page of resources instead of a `list_tags` call per function. With `tag_filters`, only
+        the functions carrying all those tags are listed.
+        """
         try:
-            response = self.client.list_functions(**kwargs)
+            function_tags = self.tagging_service.get_resource_tags(["lambda:function"], tag_filters)
+            if tag_filters and not function_tags:
+                return
 
-            for function in response.get("Functions", []):
-                tags = self.client.list_tags(Resource=function["FunctionArn"]).get("Tags", {})
-                yield FunctionConfiguration(**function, Tags=tags)
+            pages = self.client.get_paginator("list_functions").paginate(
+                PaginationConfig={"PageSize": LIST_FUNCTIONS_MAX}
+            )
+            for page in pages:
+                for function in page.get("Functions", []):
+                    tags = function_tags.get(function["FunctionArn"])
+                    if tags is None and tag_filters:
+                        continue
+                    yield FunctionConfiguration(**function, Tags=tags or {})
 
-            if cursor := response.get("NextMarker"):
-                yield from self.list_functions(Marker=cursor)
+        except (BotoCoreError, ClientError) as e:
+            raise InternalServerError(f"An unexpected error occurred while listing Lambda functions: {e}")
 
+    def get_function(self, function_name: str) -> FunctionConfiguration:
+        """Get the configuration and tags of a function by name or ARN."""
+        try:
+            response = self.client.get_function(FunctionName=function_name)
+        except self.client.exceptions.ResourceNotFoundException as e:
+            raise NotFoundError(f"Lambda function {function_name} not found: {e}")
         except Exception as e:
-            raise InternalServerError(f"An unexpected error occurred while listing Lambda functions: {e}")
+            raise InternalServerError(f"An unexpected error occurred while getting Lambda function: {e}")
+        return FunctionConfiguration(**response["Configuration"], Tags=response.get("Tags", {}))
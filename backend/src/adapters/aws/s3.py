@@ -0,0 +1,24 @@
+import boto3
+from types_boto3_s3.client import S3Client
+
+from src.common.constants import AWS_ENDPOINT, AWS_REGION
+from src.common.exceptions import NotFoundError
+from src.common.meta import SingletonMeta
+
+
+# Service -----------------------------------
+class S3Service(metaclass=SingletonMeta):
+    client: S3Client
+
+    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT):
+        self.client = boto3.client("s3", region_name=region, endpoint_url=endpoint_url)
+
+    def put_object(self, bucket: str, key: str, body: bytes, **kwargs):
+        self.client.put_object(Bucket=bucket, Key=key, Body=body, **kwargs)
+
+    def get_object(self, bucket: str, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=bucket, Key=key)
+        except self.client.exceptions.NoSuchKey as e:
+            raise NotFoundError(f"Object s3://{bucket}/{key} not found: {e}")
+        return response["Body"].read()
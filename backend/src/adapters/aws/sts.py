@@ -0,0 +1,61 @@
+from threading import Lock
+
+import boto3
+import botocore.session
+from botocore.credentials import CredentialProvider, CredentialResolver, DeferredRefreshableCredentials
+from types_boto3_sts.client import STSClient
+
+from src.common.constants import AWS_ENDPOINT, AWS_REGION, SERVICE
+from src.common.meta import SingletonMeta
+
+
+class AssumeRoleCredentialProvider(CredentialProvider):
+    """Credentials refreshed with `refresh`, on the first call and shortly before they expire."""
+
+    METHOD = "sts-assume-role"
+    CANONICAL_NAME = "custom-sts-assume-role"
+
+    def __init__(self, refresh):
+        super().__init__()
+        self.refresh = refresh
+
+    def load(self) -> DeferredRefreshableCredentials:
+        return DeferredRefreshableCredentials(refresh_using=self.refresh, method=self.METHOD)
+
+
+# Service -----------------------------------
+class STSService(metaclass=SingletonMeta):
+    client: STSClient
+
+    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT):
+        self.client = boto3.client("sts", region_name=region, endpoint_url=endpoint_url)
+        self._sessions: dict[tuple[str, str], boto3.Session] = {}
+        self._lock = Lock()
+
+    def assume_role_session(self, role_arn: str, region: str, duration: int = 3600) -> boto3.Session:
+        """Session of an assumed role, cached per role & region.
+
+        The role is only assumed on the first call made with the session, and assumed again
+        shortly before the credentials expire, so a cached session can be used indefinitely.
+        """
+        with self._lock:
+            if session := self._sessions.get((role_arn, region)):
+                return session
+
+            def refresh() -> dict:
+                credentials = self.client.assume_role(
+                    RoleArn=role_arn, RoleSessionName=f"{SERVICE}-scanner", DurationSeconds=duration
+                )["Credentials"]
+                return {
+                    "access_key": credentials["AccessKeyId"],
+                    "secret_key": credentials["SecretAccessKey"],
+                    "token": credentials["SessionToken"],
+                    "expiry_time": credentials["Expiration"].isoformat(),
+                }
+
+            botocore_session = botocore.session.get_session()
+            resolver = CredentialResolver(providers=[AssumeRoleCredentialProvider(refresh)])
+            botocore_session.register_component("credential_provider", resolver)
+            session = boto3.Session(botocore_session=botocore_session, region_name=region)
+            self._sessions[(role_arn, region)] = session
+            return session
@@ -0,0 +1,36 @@
+import boto3
+from botocore.config import Config
+from types_boto3_resourcegroupstaggingapi.client import ResourceGroupsTaggingAPIClient
+
+from src.common.constants import AWS_ENDPOINT, AWS_MAX_ATTEMPTS, AWS_REGION
+from src.common.meta import SingletonMeta
+
+
+# Service -----------------------------------
+class ResourceTaggingService(metaclass=SingletonMeta):
+    client: ResourceGroupsTaggingAPIClient
+
+    def __init__(self, region=AWS_REGION, endpoint_url=AWS_ENDPOINT, session: boto3.Session | None = None):
+        config = Config(retries={"max_attempts": AWS_MAX_ATTEMPTS, "mode": "adaptive"})
+        self.client = (session or boto3).client(
+            "resourcegroupstaggingapi", region_name=region, endpoint_url=endpoint_url, config=config
+        )
+
+    def get_resource_tags(
+        self, resource_types: list[str], tag_filters: dict[str, str] | None = None
+    ) -> dict[str, dict[str, str]]:
+        """Get the tags of all resources of the given types (e.g. `lambda:function`), by ARN.
+
+        With `tag_filters`, only the resources carrying all those tags are returned, filtered server-side.
+        Resources that have never been tagged are not returned.
+        """
+        kwargs = {"ResourceTypeFilters": resource_types}
+        if tag_filters:
+            kwargs["TagFilters"] = [{"Key": key, "Values": [value]} for key, value in tag_filters.items()]
+
+        resource_tags = {}
+        for page in self.client.get_paginator("get_resources").paginate(**kwargs):
+            for resource in page.get("ResourceTagMappingList", []):
+                tags = {tag["Key"]: tag["Value"] for tag in resource.get("Tags", [])}
+                resource_tags[resource["ResourceARN"]] = tags
+        return resource_tags
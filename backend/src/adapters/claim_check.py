@@ -0,0 +1,137 @@
+import gzip
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Protocol
+from urllib.parse import unquote, urlparse
+from uuid import uuid4
+
+from src.adapters.aws import S3Service
+from src.common.constants import CLAIM_CHECK_THRESHOLD, CLAIM_CHECK_URL
+from src.common.exceptions import NotFoundError
+from src.common.logger import logger
+
+# Key of the reference left in place of an offloaded detail
+CLAIM_CHECK_KEY = "claim_check"
+# Longest string kept in the summary of an offloaded detail, longer ones are truncated
+SUMMARY_MAX_LENGTH = 256
+
+
+class ObjectStore(Protocol):
+    def put(self, key: str, body: bytes) -> str: ...
+
+    def get(self, uri: str) -> bytes: ...
+
+
+class S3ObjectStore:
+    """Objects stored under `s3://{bucket}/{prefix}`, expired by the bucket lifecycle."""
+
+    def __init__(self, bucket: str, prefix: str = "", client: S3Service | None = None):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = client or S3Service()
+
+    def put(self, key: str, body: bytes) -> str:
+        key = f"{self.prefix}/{key}" if self.prefix else key
+        self.client.put_object(self.bucket, key, body, ContentEncoding="gzip", ContentType="application/json")
+        return f"s3://{self.bucket}/{key}"
+
+    def get(self, uri: str) -> bytes:
+        parsed = urlparse(uri)
+        return self.client.get_object(parsed.netloc, parsed.path.lstrip("/"))
+
+
+class LocalObjectStore:
+    """Objects stored as files under `base_dir`, a stand-in for S3 in local runs and tests."""
+
+    def __init__(self, base_dir: str | Path):
+        self.base_dir = Path(base_dir)
+
+    def put(self, key: str, body: bytes) -> str:
+        path = self.base_dir / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        return path.resolve().as_uri()
+
+    def get(self, uri: str) -> bytes:
+        path = Path(unquote(urlparse(uri).path))
+        if not path.is_file():
+            raise NotFoundError(f"Object {uri} not found")
+        return path.read_bytes()
+
+
+def object_store_from_url(url: str | None) -> ObjectStore | None:
+    """Build the store of a `s3://bucket/prefix` or `file:///path` URL."""
+    if not url:
+        return None
+    parsed = urlparse(url)
+    match parsed.scheme:
+        case "s3":
+            return S3ObjectStore(parsed.netloc, parsed.path)
+        case "file":
+            return LocalObjectStore(parsed.path)
+        case _:
+            raise ValueError(f"Unsupported claim check store: {url}")
+
+
+class ClaimCheck:
+    """Offload large event details to an object store, leaving a reference and a summary in their place.
+
+    The reference looks like `{"claim_check": {"uri": ..., "size": ...}, ...}`, where the rest of the
+    summary is made of the scalar fields of the detail (e.g. `log_group_name`), long strings truncated
+    and the largest fields dropped so that the reference stays under the threshold. The detail is stored
+    gzip-compressed and only fetched back by `check_out`, when it is actually needed.
+    """
+
+    def __init__(self, store: ObjectStore, threshold: int = CLAIM_CHECK_THRESHOLD):
+        self.store = store
+        self.threshold = threshold
+
+    def check_in(self, detail: str) -> str:
+        """Return the detail (a JSON string) as is if it is small enough, a reference to it otherwise."""
+        size = len(detail.encode("utf-8"))
+        if size <= self.threshold:
+            return detail
+
+        key = f"{datetime.now(UTC):%Y/%m/%d}/{uuid4()}.json.gz"
+        uri = self.store.put(key, gzip.compress(detail.encode("utf-8")))
+        logger.debug(f"Detail of {size} bytes offloaded to {uri}")
+
+        return json.dumps(
+            {**self._summary(json.loads(detail), uri, size), CLAIM_CHECK_KEY: {"uri": uri, "size": size}}
+        )
+
+    def _summary(self, data, uri: str, size: int) -> dict:
+        """Scalar fields of the detail, that fit in a reference of at most `threshold` bytes."""
+        if not isinstance(data, dict):
+            return {}
+        summary = {
+            k: v[:SUMMARY_MAX_LENGTH] if isinstance(v, str) else v
+            for k, v in data.items()
+            if not isinstance(v, (dict, list))
+        }
+        reference = {CLAIM_CHECK_KEY: {"uri": uri, "size": size}}
+        available = self.threshold - len(json.dumps(reference).encode("utf-8"))
+        # Fields are dropped largest first, down to the ones that fit
+        fields = {k: len(json.dumps({k: v}).encode("utf-8")) for k, v in summary.items()}
+        for k in sorted(fields, key=fields.get, reverse=True):
+            if sum(fields.values()) <= available:
+                break
+            del summary[k], fields[k]
+        return summary
+
+    def check_out(self, detail: dict) -> dict:
+        """Return the offloaded detail if `detail` is a reference, `detail` itself otherwise."""
+        if not is_claim_check(detail):
+            return detail
+        return json.loads(gzip.decompress(self.store.get(detail[CLAIM_CHECK_KEY]["uri"])))
+
+
+def is_claim_check(detail) -> bool:
+    return isinstance(detail, dict) and CLAIM_CHECK_KEY in detail
+
+
+def default_claim_check() -> ClaimCheck | None:
+    """Claim check configured by CLAIM_CHECK_URL/CLAIM_CHECK_THRESHOLD, if any."""
+    store = object_store_from_url(CLAIM_CHECK_URL)
+    return ClaimCheck(store) if store else None
@@ -1,6 +1,9 @@
 from .aws_config import AwsConfigMapper
 from .event import EventMapper
+from .log_checkpoint import LogCheckpointMapper
+from .log_group_cache import LogGroupCacheMapper
 from .monitoring_config import MonitoringConfigMapper
+from .notification import NotificationMapper
 from .task import TaskMapper
 from .user import UserMapper
 
@@ -10,4 +13,7 @@ __all__ = [
     "UserMapper",
     "AwsConfigMapper",
     "MonitoringConfigMapper",
+    "LogCheckpointMapper",
+    "LogGroupCacheMapper",
+    "NotificationMapper",
 ]
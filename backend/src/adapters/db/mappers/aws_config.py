@@ -1,4 +1,5 @@
 from src.adapters.db.models import AwsConfigPersistence
+from src.adapters.db.models.aws_config import aws_config_sort_key
 from src.domain.models import AwsConfig
 
 
@@ -6,9 +7,9 @@ class AwsConfigMapper:
     @classmethod
     def to_persistence(cls, model: AwsConfig) -> AwsConfigPersistence:
         return AwsConfigPersistence(
-            # Keys (Singleton)
+            # Keys
             pk="CONFIG",
-            sk="AWS",
+            sk=aws_config_sort_key(model.account_id, model.region),
             # Attributes
             id=model.id,
             account_id=model.account_id,
@@ -1,7 +1,10 @@
 import json
+from typing import Iterable
 
+from src.adapters.claim_check import ClaimCheck
 from src.adapters.db.models import EventPersistence
-from src.domain.models import Event
+from src.adapters.db.models.event import event_partition
+from src.domain.models import Event, LazyEvent
 
 
 class EventMapper:
@@ -9,7 +12,7 @@ class EventMapper:
     def to_persistence(cls, model: Event) -> EventPersistence:
         return EventPersistence(
             # Keys
-            pk="EVENT",
+            pk=event_partition(model.id),
             sk=model.id,
             # Attributes
             id=model.id,
@@ -29,17 +32,35 @@ class EventMapper:
         )
 
     @classmethod
-    def to_entity(cls, persistence: EventPersistence) -> Event:
+    def to_entity(cls, persistence: EventPersistence, claim_check: ClaimCheck | None = None) -> Event:
+        """Map a persisted event, an offloaded detail is only fetched back when a claim check is given."""
+        detail = json.loads(persistence.detail)
+        if claim_check:
+            detail = claim_check.check_out(detail)
         return Event(
             id=persistence.id,
             account=persistence.account,
             region=persistence.region,
             source=persistence.source,
             detail_type=persistence.detail_type,
-            detail=json.loads(persistence.detail),
+            detail=detail,
             severity=persistence.severity,
             resources=json.loads(persistence.resources),
             published_at=persistence.published_at,
             updated_at=persistence.updated_at,
             expired_at=persistence.expired_at,
         )
+
+    @classmethod
+    def to_lazy_entity(cls, persistence: EventPersistence, fields: Iterable[str] | None = None) -> LazyEvent:
+        """Map a listed event, read with the `fields` projection (all fields when None) plus its id.
+
+        Only the fields read are set, and `detail` is parsed on first access. An offloaded detail is
+        left as its reference.
+        """
+        fields = {"id", *fields} if fields else set(Event.model_fields)
+        values = {field: getattr(persistence, field) for field in fields - {"detail", "resources"}}
+        if "resources" in fields:
+            values["resources"] = json.loads(persistence.resources)
+        detail = persistence.detail if "detail" in fields else None
+        return LazyEvent.partial(values, load_detail=(lambda: json.loads(detail)) if detail is not None else None)
@@ -0,0 +1,26 @@
+from src.adapters.db.models import LogCheckpointPersistence
+from src.common.constants import AWS_DYNAMODB_TTL
+from src.domain.models import LogCheckpoint
+
+
+class LogCheckpointMapper:
+    @classmethod
+    def to_persistence(cls, model: LogCheckpoint) -> LogCheckpointPersistence:
+        return LogCheckpointPersistence(
+            # Keys
+            pk="CHECKPOINT",
+            sk=model.log_group_name,
+            # Attributes
+            log_group_name=model.log_group_name,
+            scanned_until=model.scanned_until,
+            updated_at=model.updated_at,
+            expired_at=model.updated_at + AWS_DYNAMODB_TTL,
+        )
+
+    @classmethod
+    def to_entity(cls, persistence: LogCheckpointPersistence) -> LogCheckpoint:
+        return LogCheckpoint(
+            log_group_name=persistence.log_group_name,
+            scanned_until=persistence.scanned_until,
+            updated_at=persistence.updated_at,
+        )
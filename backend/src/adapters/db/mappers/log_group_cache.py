@@ -0,0 +1,33 @@
+from src.adapters.db.models import LogGroupCachePersistence
+from src.domain.models import LogGroupCache
+
+
+class LogGroupCacheMapper:
+    @classmethod
+    def sort_key(cls, tag_name: str, tag_value: str, scope: str | None = None) -> str:
+        """Sort key of the cache of a tag, `scope` (`{account}:{region}`) set for the targets of other accounts."""
+        return f"LOG_GROUPS#{scope}#{tag_name}#{tag_value}" if scope else f"LOG_GROUPS#{tag_name}#{tag_value}"
+
+    @classmethod
+    def to_persistence(cls, model: LogGroupCache, scope: str | None = None) -> LogGroupCachePersistence:
+        return LogGroupCachePersistence(
+            # Keys
+            pk="CACHE",
+            sk=cls.sort_key(model.tag_name, model.tag_value, scope),
+            # Attributes
+            tag_name=model.tag_name,
+            tag_value=model.tag_value,
+            log_groups=model.log_groups,
+            refreshed_at=model.refreshed_at,
+            expired_at=model.expired_at,
+        )
+
+    @classmethod
+    def to_entity(cls, persistence: LogGroupCachePersistence) -> LogGroupCache:
+        return LogGroupCache(
+            tag_name=persistence.tag_name,
+            tag_value=persistence.tag_value,
+            log_groups=persistence.log_groups.as_dict(),
+            refreshed_at=persistence.refreshed_at,
+            expired_at=persistence.expired_at,
+        )
@@ -0,0 +1,32 @@
+from src.adapters.db.models import NotificationPersistence
+from src.common.constants import AWS_DYNAMODB_TTL
+from src.domain.models import Notification, NotificationStatus
+
+
+class NotificationMapper:
+    @classmethod
+    def to_persistence(cls, model: Notification) -> NotificationPersistence:
+        return NotificationPersistence(
+            # Keys
+            pk="NOTIFICATION",
+            sk=model.event_id,
+            # Attributes
+            event_id=model.event_id,
+            status=model.status.value,
+            attempts=model.attempts,
+            next_attempt_at=model.next_attempt_at,
+            last_error=model.last_error,
+            created_at=model.created_at,
+            expired_at=model.created_at + AWS_DYNAMODB_TTL,
+        )
+
+    @classmethod
+    def to_entity(cls, persistence: NotificationPersistence) -> Notification:
+        return Notification(
+            event_id=persistence.event_id,
+            status=NotificationStatus(persistence.status),
+            attempts=persistence.attempts,
+            next_attempt_at=persistence.next_attempt_at,
+            last_error=persistence.last_error,
+            created_at=persistence.created_at,
+        )
@@ -1,7 +1,10 @@
 from .aws_config import AwsConfigPersistence
 from .base import DynamoModel
 from .event import EventPersistence
+from .log_checkpoint import LogCheckpointPersistence
+from .log_group_cache import LogGroupCachePersistence
 from .monitoring_config import MonitoringConfigPersistence
+from .notification import NotificationPersistence
 from .task import TaskPersistence
 from .user import UserPersistence
 
@@ -12,4 +15,7 @@ __all__ = [
     "UserPersistence",
     "AwsConfigPersistence",
     "MonitoringConfigPersistence",
+    "LogCheckpointPersistence",
+    "LogGroupCachePersistence",
+    "NotificationPersistence",
 ]
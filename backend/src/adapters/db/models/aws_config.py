@@ -2,11 +2,20 @@ from pynamodb.attributes import BooleanAttribute, NumberAttribute, UnicodeAttrib
 
 from .base import DynamoModel, KeyAttribute
 
+# Sort key of the single AWS configuration stored before they were keyed by account & region
+LEGACY_AWS_CONFIG_SORT_KEY = "AWS"
+# Discriminator of that item, shared with the monitoring configuration
+LEGACY_AWS_CONFIG_DISCRIMINATOR = "CONFIG"
 
-class AwsConfigPersistence(DynamoModel, discriminator="CONFIG"):
-    # Keys (Singleton: pk=CONFIG, sk=AWS)
+
+def aws_config_sort_key(account_id: str, region: str) -> str:
+    return f"AWS#{account_id}#{region}"
+
+
+class AwsConfigPersistence(DynamoModel, discriminator="AWS_CONFIG"):
+    # Keys (one per account & region: pk=CONFIG, sk=AWS#{account_id}#{region})
     pk = KeyAttribute(hash_key=True, default="CONFIG")
-    sk = KeyAttribute(range_key=True, default="AWS")
+    sk = UnicodeAttribute(range_key=True)  # see `aws_config_sort_key`
     # Attributes
     id = UnicodeAttribute(null=False)
     account_id = UnicodeAttribute(null=False)
@@ -1,10 +1,17 @@
+import zlib
 from typing import Any
 
-from pynamodb.attributes import DiscriminatorAttribute, UnicodeAttribute
+from pynamodb.attributes import Attribute, DiscriminatorAttribute, UnicodeAttribute
+from pynamodb.constants import BINARY, STRING
 from pynamodb.indexes import Projection
 from pynamodb.models import Model
 
-from src.common.constants import AWS_DYNAMODB_TABLE, AWS_ENDPOINT, AWS_REGION
+from src.common.constants import (
+    AWS_DYNAMODB_COMPRESSION_THRESHOLD,
+    AWS_DYNAMODB_TABLE,
+    AWS_ENDPOINT,
+    AWS_REGION,
+)
 
 
 # Attributes -----------------------------------------------------------
@@ -31,6 +38,48 @@ class KeyAttribute(UnicodeAttribute):
         return super().__set__(instance, value)
 
 
+class CompressedUnicodeAttribute(Attribute[str]):
+    """A text stored as binary, zlib-compressed when it is larger than `threshold` bytes.
+
+    The first byte of the stored value tells how the rest is encoded (`RAW` or `ZLIB`), so the
+    threshold and the codec can change without rewriting the items. Values stored as plain text
+    (a DynamoDB string) by a former `UnicodeAttribute` are read as is.
+    """
+
+    attr_type = BINARY
+
+    # Header byte of the stored value
+    RAW = b"\x00"
+    ZLIB = b"\x01"
+
+    def __init__(self, threshold: int = AWS_DYNAMODB_COMPRESSION_THRESHOLD, level: int = 6, **kwargs):
+        super().__init__(**kwargs)
+        self.threshold = threshold
+        self.level = level
+
+    def serialize(self, value: str) -> bytes:
+        data = value.encode("utf-8")
+        if len(data) > self.threshold:
+            compressed = zlib.compress(data, self.level)
+            if len(compressed) < len(data):
+                return self.ZLIB + compressed
+        return self.RAW + data
+
+    def deserialize(self, value: bytes | str) -> str:
+        if isinstance(value, str):
+            return value
+        header, data = value[:1], value[1:]
+        if header == self.ZLIB:
+            data = zlib.decompress(data)
+        elif header != self.RAW:
+            raise ValueError(f"Unknown encoding of attribute {self.attr_name}: {header!r}")
+        return data.decode("utf-8")
+
+    def get_value(self, value: dict[str, Any]) -> Any:
+        # Items written before the attribute was compressed hold a string
+        return value[STRING] if STRING in value else super().get_value(value)
+
+
 # Model --------------------------------------------------------------
 class DynamoMeta:
     table_name: str = AWS_DYNAMODB_TABLE
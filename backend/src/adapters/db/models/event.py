@@ -1,7 +1,41 @@
+import re
+import zlib
+from datetime import UTC, date, datetime
+
 from pynamodb.attributes import NumberAttribute, UnicodeAttribute
 from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
 
-from .base import DynamoMeta, DynamoModel, KeyAttribute
+from src.common.constants import AWS_DYNAMODB_EVENT_SHARDS
+
+from .base import CompressedUnicodeAttribute, DynamoMeta, DynamoModel, KeyAttribute
+
+# Partition of the events stored before they were bucketed & sharded, see `EventRepository.migrate_legacy`
+LEGACY_EVENT_PARTITION = "EVENT"
+# Event ids start with the publication timestamp: {published_at}-{event_id}
+EVENT_ID_PATTERN = re.compile(r"^(\d{10})-")
+
+
+def event_day(event_id: str) -> date | None:
+    """Day (UTC) an event was published, read from its id. None for the ids without timestamp."""
+    if match := EVENT_ID_PATTERN.match(event_id):
+        return datetime.fromtimestamp(int(match.group(1)), tz=UTC).date()
+    return None
+
+
+def event_partition(event_id: str, shards: int = AWS_DYNAMODB_EVENT_SHARDS) -> str:
+    """Partition key of an event, `EVENT#{yyyymmdd}#{shard}`, the shard being a stable hash of the id.
+
+    Spreading the events of a day over `shards` partitions spreads the writes, and the reads of a
+    day are made in parallel. The ids without timestamp belong to the legacy partition.
+    """
+    if (day := event_day(event_id)) is None:
+        return LEGACY_EVENT_PARTITION
+    return f"EVENT#{day:%Y%m%d}#{zlib.crc32(event_id.encode()) % shards}"
+
+
+def event_partitions(day: date, shards: int = AWS_DYNAMODB_EVENT_SHARDS) -> list[str]:
+    """Partition keys of the events of a day."""
+    return [f"EVENT#{day:%Y%m%d}#{shard}" for shard in range(shards)]
 
 
 class GSI1Index(GlobalSecondaryIndex):
@@ -15,7 +49,7 @@ class GSI1Index(GlobalSecondaryIndex):
 
 class EventPersistence(DynamoModel, discriminator="EVENT"):
     # Keys
-    pk = KeyAttribute(hash_key=True, default="EVENT")
+    pk = UnicodeAttribute(hash_key=True)  # EVENT#{yyyymmdd}#{shard}, see `event_partition`
     sk = KeyAttribute(range_key=True, prefix="EVENT#")  # EVENT#{id}
     # Attributes
     id = UnicodeAttribute(null=False)  # {published_at}-{event_id}
@@ -23,9 +57,9 @@ class EventPersistence(DynamoModel, discriminator="EVENT"):
     region = UnicodeAttribute(null=False)
     source = UnicodeAttribute(null=False)
     detail_type = UnicodeAttribute(null=False)
-    detail = UnicodeAttribute(null=False)  # JSON string
+    detail = CompressedUnicodeAttribute(null=False)  # JSON string
     severity = NumberAttribute(null=False, default=0)  # 0-5
-    resources = UnicodeAttribute(null=False, default="[]")  # JSON array string
+    resources = CompressedUnicodeAttribute(null=False, default="[]")  # JSON array string
     published_at = NumberAttribute(null=False)
     updated_at = NumberAttribute(null=False)
     expired_at = NumberAttribute(null=False)  # TTL attribute
@@ -0,0 +1,14 @@
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+
+from .base import DynamoModel, KeyAttribute
+
+
+class LogCheckpointPersistence(DynamoModel, discriminator="CHECKPOINT"):
+    # Keys
+    pk = KeyAttribute(hash_key=True, default="CHECKPOINT")
+    sk = UnicodeAttribute(range_key=True)  # {log_group_name}, no prefix since names may contain "#"
+    # Attributes
+    log_group_name = UnicodeAttribute(null=False)
+    scanned_until = NumberAttribute(null=False)
+    updated_at = NumberAttribute(null=False)
+    expired_at = NumberAttribute(null=False)  # TTL attribute, drops checkpoints of removed log groups
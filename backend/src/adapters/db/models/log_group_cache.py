@@ -0,0 +1,15 @@
+from pynamodb.attributes import MapAttribute, NumberAttribute, UnicodeAttribute
+
+from .base import DynamoModel, KeyAttribute
+
+
+class LogGroupCachePersistence(DynamoModel, discriminator="CACHE"):
+    # Keys
+    pk = KeyAttribute(hash_key=True, default="CACHE")
+    sk = UnicodeAttribute(range_key=True)  # LOG_GROUPS#[{account}:{region}#]{tag_name}#{tag_value}
+    # Attributes
+    tag_name = UnicodeAttribute(null=False)
+    tag_value = UnicodeAttribute(null=False)
+    log_groups = MapAttribute(default=dict)  # {resource_arn: log_group_name}
+    refreshed_at = NumberAttribute(null=False)
+    expired_at = NumberAttribute(null=False)  # TTL attribute
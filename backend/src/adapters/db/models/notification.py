@@ -0,0 +1,17 @@
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute
+
+from .base import DynamoModel, KeyAttribute
+
+
+class NotificationPersistence(DynamoModel, discriminator="NOTIFICATION"):
+    # Keys
+    pk = KeyAttribute(hash_key=True, default="NOTIFICATION")
+    sk = KeyAttribute(range_key=True, prefix="NOTIFICATION#")  # NOTIFICATION#{event_id}
+    # Attributes
+    event_id = UnicodeAttribute(null=False)
+    status = UnicodeAttribute(null=False)  # pending | failed
+    attempts = NumberAttribute(null=False, default=0)
+    next_attempt_at = NumberAttribute(null=False)
+    last_error = UnicodeAttribute(null=True)
+    created_at = NumberAttribute(null=False)
+    expired_at = NumberAttribute(null=False)  # TTL attribute, drops notifications that could not be sent
@@ -1,6 +1,9 @@
 from .aws_config import AwsConfigRepository
 from .event import EventRepository
+from .log_checkpoint import LogCheckpointRepository
+from .log_group_cache import LogGroupCacheRepository
 from .monitoring_config import MonitoringConfigRepository
+from .notification import NotificationRepository
 from .task import TaskRepository
 from .user import UserRepository
 
@@ -10,4 +13,7 @@ __all__ = [
     "UserRepository",
     "AwsConfigRepository",
     "MonitoringConfigRepository",
+    "LogCheckpointRepository",
+    "LogGroupCacheRepository",
+    "NotificationRepository",
 ]
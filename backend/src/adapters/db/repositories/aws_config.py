@@ -1,6 +1,13 @@
 from src.adapters.db.mappers import AwsConfigMapper
 from src.adapters.db.models import AwsConfigPersistence
+from src.adapters.db.models.aws_config import (
+    LEGACY_AWS_CONFIG_DISCRIMINATOR,
+    LEGACY_AWS_CONFIG_SORT_KEY,
+    aws_config_sort_key,
+)
 from src.adapters.db.repositories.base import DynamoRepository
+from src.common.exceptions import ConflictError
+from src.common.logger import logger
 from src.domain.models import AwsConfig
 
 
@@ -8,11 +15,16 @@ class AwsConfigRepository(DynamoRepository):
     model_cls = AwsConfigPersistence
     mapper = AwsConfigMapper
 
-    def get(self) -> AwsConfig:
-        """Get AWS configuration (singleton)."""
-        model = self._get(hash_key="CONFIG", range_key="AWS")
+    def get(self, account_id: str, region: str) -> AwsConfig:
+        """Get the AWS configuration of an account & region."""
+        model = self._get(hash_key="CONFIG", range_key=aws_config_sort_key(account_id, region))
         return self.mapper.to_entity(model)
 
+    def list_all(self) -> list[AwsConfig]:
+        """List all AWS configurations (sort keys starting with `AWS`)."""
+        result = self._query(hash_key="CONFIG", range_key_condition=self.model_cls.sk.startswith("AWS"), limit=None)
+        return [self.mapper.to_entity(item) for item in result]
+
     def create(self, entity: AwsConfig):
         """Create AWS configuration."""
         model = self.mapper.to_persistence(entity)
@@ -23,6 +35,27 @@ class AwsConfigRepository(DynamoRepository):
         model = self.mapper.to_persistence(entity)
         model.save()
 
-    def delete(self):
-        """Delete AWS configuration."""
-        self._delete(hash_key="CONFIG", range_key="AWS")
+    def delete(self, account_id: str, region: str):
+        """Delete the AWS configuration of an account & region."""
+        self._delete(hash_key="CONFIG", range_key=aws_config_sort_key(account_id, region))
+
+    def migrate_legacy(self) -> AwsConfig | None:
+        """Move the configuration stored as a singleton (`sk=AWS`) to the key of its account & region.
+
+        That item is not listed: it has the discriminator of the monitoring configuration, so it is read
+        and deleted through the low-level connection. Returns the configuration moved, None if there was none.
+        """
+        connection = self.model_cls._get_connection()
+        item = connection.get_item("CONFIG", range_key=LEGACY_AWS_CONFIG_SORT_KEY).get("Item")
+        if not item or item.get("type", {}).get("S") != LEGACY_AWS_CONFIG_DISCRIMINATOR:
+            return None
+
+        item["type"] = {"S": self.model_cls._get_discriminator_attribute().get_discriminator(self.model_cls)}
+        entity = self.mapper.to_entity(self.model_cls.from_raw_data(item))
+        try:
+            self.create(entity)
+        except ConflictError:
+            logger.info(f"AWS configuration of {entity.account_id}:{entity.region} already migrated")
+        connection.delete_item("CONFIG", range_key=LEGACY_AWS_CONFIG_SORT_KEY)
+        logger.info(f"AWS configuration of {entity.account_id}:{entity.region} moved to its own key")
+        return entity
@@ -1,16 +1,35 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, List, Type, TypeVar
 
 from pydantic import BaseModel
 from pynamodb.attributes import Attribute
-from pynamodb.exceptions import DeleteError, DoesNotExist, GetError, PutError, QueryError, UpdateError
+from pynamodb.exceptions import (
+    DeleteError,
+    DoesNotExist,
+    GetError,
+    PutError,
+    QueryError,
+    TransactWriteError,
+    UpdateError,
+)
 from pynamodb.models import Condition, Index, ResultIterator
+from pynamodb.transactions import TransactWrite
 
 from src.adapters.db.mappers.base import Mapper
 from src.adapters.db.models import DynamoModel
 from src.common.exceptions import ConflictError, InternalServerError, NotFoundError, UnprocessedError
+from src.common.logger import logger
+from src.common.utils.backoff import exponential_backoff
+from src.common.utils.objects import chunks
 
 M = TypeVar("M", bound=BaseModel)
 
+# BatchWriteItem accepts at most 25 put/delete requests
+BATCH_WRITE_MAX_ITEMS = 25
+# TransactWriteItems accepts at most 100 actions
+TRANSACT_WRITE_MAX_ITEMS = 100
+
 
 class DynamoRepository[M: DynamoModel]:
     model_cls: Type[M]
@@ -74,6 +93,94 @@ class DynamoRepository[M: DynamoModel]:
         except Exception as err:
             raise InternalServerError(f"{self.__class__.__name__}: {err}")
 
+    def _transact_create(self, models: List[DynamoModel]) -> List[int]:
+        """Create items of any type in a single transaction, all of them or none.
+
+        Every item is conditioned on not existing yet. Returns the indexes of the items that
+        already exist, in which case nothing was written.
+        """
+        if len(models) > TRANSACT_WRITE_MAX_ITEMS:
+            raise ValueError(f"{self.__class__.__name__}: at most {TRANSACT_WRITE_MAX_ITEMS} items per transaction")
+
+        try:
+            with TransactWrite(connection=self.model_cls._get_connection().connection) as transaction:
+                for model in models:
+                    model_cls = type(model)
+                    transaction.save(model, condition=model_cls.pk.does_not_exist() & model_cls.sk.does_not_exist())
+        except TransactWriteError as err:
+            reasons = err.cancellation_reasons or []
+            if conflicts := [i for i, r in enumerate(reasons) if r and r.code == "ConditionalCheckFailed"]:
+                return conflicts
+            raise UnprocessedError(f"{self.__class__.__name__}: {err}")
+        except Exception as err:
+            raise InternalServerError(f"{self.__class__.__name__}: {err}")
+        return []
+
+    def _batch_create(self, models: List[M], max_workers: int = 4, max_attempts: int = 5):
+        # unconditional writes, existing items are overwritten (BatchWriteItem has no conditions)
+        self._batch_write(
+            put_items=[model.serialize() for model in models], max_workers=max_workers, max_attempts=max_attempts
+        )
+
+    def _batch_delete(self, keys: List[tuple[Any, Any]], max_workers: int = 4, max_attempts: int = 5):
+        # unconditional deletes, missing items are ignored
+        delete_items = [
+            self.model_cls(hash_key=hash_key, range_key=range_key)._get_keys() for hash_key, range_key in keys
+        ]
+        self._batch_write(delete_items=delete_items, max_workers=max_workers, max_attempts=max_attempts)
+
+    def _batch_write(
+        self,
+        put_items: List[dict] | None = None,
+        delete_items: List[dict] | None = None,
+        max_workers: int = 4,
+        max_attempts: int = 5,
+    ):
+        """Send the requests in chunks of 25, `max_workers` BatchWriteItem calls at a time.
+
+        The items DynamoDB leaves unprocessed (throttling, capacity) are resent with backoff,
+        up to `max_attempts` times per chunk.
+        """
+        requests = [("put", item) for item in put_items or []] + [("delete", key) for key in delete_items or []]
+        if not requests:
+            return
+
+        connection = self.model_cls._get_connection()  # shared by the workers, created once
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(
+                    executor.map(
+                        lambda chunk: self._batch_write_chunk(connection, chunk, max_attempts),
+                        chunks(requests, BATCH_WRITE_MAX_ITEMS),
+                    )
+                )
+        except UnprocessedError:
+            raise
+        except (PutError, DeleteError) as err:
+            raise UnprocessedError(f"{self.__class__.__name__}: {err}")
+        except Exception as err:
+            raise InternalServerError(f"{self.__class__.__name__}: {err}")
+
+    def _batch_write_chunk(self, connection, requests: List[tuple[str, dict]], max_attempts: int):
+        delays = exponential_backoff(initial=0.05, maximum=2.0)
+        put_items = [item for action, item in requests if action == "put"]
+        delete_items = [key for action, key in requests if action == "delete"]
+        for attempt in range(1, max_attempts + 1):
+            response = connection.batch_write_item(put_items=put_items, delete_items=delete_items) or {}
+            unprocessed = response.get("UnprocessedItems", {}).get(self.model_cls.Meta.table_name)
+            if not unprocessed:
+                return
+
+            put_items = [item["PutRequest"]["Item"] for item in unprocessed if "PutRequest" in item]
+            delete_items = [item["DeleteRequest"]["Key"] for item in unprocessed if "DeleteRequest" in item]
+            logger.debug(f"{len(unprocessed)}/{len(requests)} items unprocessed (attempt {attempt})")
+            if attempt < max_attempts:
+                time.sleep(next(delays))
+        raise UnprocessedError(
+            f"{self.__class__.__name__}: {len(put_items) + len(delete_items)} items left unprocessed "
+            f"after {max_attempts} attempts"
+        )
+
     def _update(self, hash_key: Any, range_key: Any = None, attributes: dict | None = None):
         # build actions
         actions = []
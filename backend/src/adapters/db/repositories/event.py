@@ -1,71 +1,295 @@
-from src.adapters.db.mappers import EventMapper
-from src.adapters.db.models import EventPersistence
-from src.adapters.db.repositories.base import DynamoRepository
+import heapq
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Iterator, List
+
+from pynamodb.models import Condition
+
+from src.adapters.claim_check import ClaimCheck
+from src.adapters.db.mappers import EventMapper, NotificationMapper
+from src.adapters.db.models import EventPersistence, NotificationPersistence
+from src.adapters.db.models.event import LEGACY_EVENT_PARTITION, event_day, event_partition, event_partitions
+from src.adapters.db.repositories.base import TRANSACT_WRITE_MAX_ITEMS, DynamoRepository
+from src.common.constants import AWS_DYNAMODB_EVENT_SHARDS
+from src.common.exceptions import NotFoundError
+from src.common.logger import logger
+from src.common.utils.datetime_utils import timestamp_to_date
 from src.common.utils.encoding import base64_to_json
-from src.domain.models.event import Event, EventQueryResult, ListEventsDTO
+from src.common.utils.objects import chunks
+from src.domain.models import Notification
+from src.domain.models.event import DEFAULT_LIST_DAYS, Event, EventQueryResult, ListEventsDTO
 
 
 class EventRepository(DynamoRepository):
     model_cls = EventPersistence
     mapper = EventMapper
 
+    def __init__(self, claim_check: ClaimCheck | None = None):
+        super().__init__()
+        # resolves offloaded details of single events, listings keep the reference & summary
+        self.claim_check = claim_check
+
     def get(self, id: str) -> Event:
-        model = self._get(hash_key="EVENT", range_key=id)
-        return self.mapper.to_entity(model)
+        return self.mapper.to_entity(self._locate(id), claim_check=self.claim_check)
+
+    def _locate(self, id: str, attributes_to_get: List[str] | None = None) -> EventPersistence:
+        """The stored event, looked up in the legacy partition if it was not migrated yet."""
+        partition = event_partition(id)
+        try:
+            return self._get(hash_key=partition, range_key=id, attributes_to_get=attributes_to_get)
+        except NotFoundError:
+            if partition == LEGACY_EVENT_PARTITION:
+                raise
+            return self._get(hash_key=LEGACY_EVENT_PARTITION, range_key=id, attributes_to_get=attributes_to_get)
+
+    @staticmethod
+    def _projection(fields: List[str] | None) -> List[str] | None:
+        """Attributes to read for the given event fields, the id being always read. None reads whole items.
+
+        A projection cuts the data transferred and parsed, not the read capacity consumed.
+        """
+        return list({"id", *fields}) if fields else None
 
     def list(self, dto: ListEventsDTO | None = None) -> EventQueryResult:
-        """List all events with optional time range filtering."""
+        """List the events published within an optional time range, the latest first unless `dto.direction` is asc.
+
+        The events of a day are spread over several partitions (see `event_partition`): the days are read
+        one after the other, the partitions of a day in parallel, and their events merged in order until
+        the page is full. The cursor is the position of the last event of the page, `{"day": "yyyymmdd",
+        "id": ...}`, from which every partition resumes. Without `start_date`, only the DEFAULT_LIST_DAYS days
+        up to `end_date` (or today) are listed, each day costing a query per partition. Events still in the
+        legacy partition are not listed, see `migrate_legacy`.
+
+        Only the `dto.fields` are read if set. The events are LazyEvents: their detail is only parsed when accessed.
+        """
         if dto is None:
             dto = ListEventsDTO()
+        descending = dto.direction != "asc"
 
-        if dto.start_date and dto.end_date:
-            range_key_condition = self.model_cls.sk.between(f"EVENT#{dto.start_date}", f"EVENT#{dto.end_date}")
-        elif dto.start_date:
-            range_key_condition = self.model_cls.sk >= f"EVENT#{dto.start_date}"
-        elif dto.end_date:
-            range_key_condition = self.model_cls.sk <= f"EVENT#{dto.end_date}"
-        else:
-            range_key_condition = None
+        # days to read & inclusive bounds of the sort keys, as the ids start with the publication timestamp
+        today = datetime.now(UTC).date()
+        last_day = timestamp_to_date(dto.end_date) if dto.end_date else today
+        first_day = (
+            timestamp_to_date(dto.start_date) if dto.start_date else last_day - timedelta(days=DEFAULT_LIST_DAYS - 1)
+        )
+        lower = str(dto.start_date) if dto.start_date else None
+        upper = f"{dto.end_date}-\uffff" if dto.end_date else None  # any id published at end_date
+        after = None
+        if dto.cursor:
+            cursor = base64_to_json(dto.cursor)
+            after, cursor_day = cursor["id"], datetime.strptime(cursor["day"], "%Y%m%d").date()
+            if descending:
+                last_day, upper = cursor_day, after
+            else:
+                first_day, lower = cursor_day, after
+        days = [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+        if descending:
+            days.reverse()
 
-        last_evaluated_key = base64_to_json(dto.cursor) if dto.cursor else None
-        scan_index_forward = "asc" == dto.direction
+        condition = self._sort_key_condition(lower, upper)
+        attributes_to_get = self._projection(dto.fields)
+        models = []
+        with ThreadPoolExecutor(max_workers=AWS_DYNAMODB_EVENT_SHARDS) as executor:
+            for day in days:
+                wanted = dto.limit - len(models) + (1 if after else 0)  # the event of the cursor is read again
+                partitions = event_partitions(day)
+                streams = self._scatter(executor, partitions, condition, descending, attributes_to_get, wanted)
+                for model in heapq.merge(*streams, key=lambda model: model.id, reverse=descending):
+                    if model.id == after:
+                        continue
+                    models.append(model)
+                    if len(models) == dto.limit:
+                        break
+                if len(models) == dto.limit:
+                    break
 
-        result = self._query(
-            hash_key="EVENT",
-            range_key_condition=range_key_condition,
-            last_evaluated_key=last_evaluated_key,
-            scan_index_forward=scan_index_forward,
+        cursor = None
+        if models and len(models) == dto.limit:
+            cursor = {"day": f"{event_day(models[-1].id):%Y%m%d}", "id": models[-1].id}
+        # the events were validated when stored, and may be partial
+        return EventQueryResult.model_construct(
+            items=[self.mapper.to_lazy_entity(model, dto.fields) for model in models],
             limit=dto.limit,
+            cursor=cursor,
         )
 
-        return EventQueryResult(
-            items=[self.mapper.to_entity(item) for item in result],
-            limit=dto.limit,
-            cursor=result.last_evaluated_key,
-        )
+    def _sort_key_condition(self, lower: str | None, upper: str | None) -> Condition | None:
+        if lower and upper:
+            return self.model_cls.sk.between(lower, upper)
+        if lower:
+            return self.model_cls.sk >= lower
+        if upper:
+            return self.model_cls.sk <= upper
+        return None
+
+    def _scatter(
+        self,
+        executor: ThreadPoolExecutor,
+        partitions: List[str],
+        condition: Condition | None,
+        descending: bool,
+        attributes_to_get: List[str] | None,
+        wanted: int,
+    ) -> List[Iterator[EventPersistence]]:
+        """Read the partitions in parallel, each as an ordered stream of events.
 
-    def list_by_source(self, source: str, start_date: int | None = None, end_date: int | None = None) -> list[Event]:
-        """List events by source with optional time range."""
+        Events are spread evenly over the partitions, so the first query of a partition only reads its
+        share of the `wanted` events, plus a margin. A stream that runs out of them while it has more
+        reads the rest on demand.
+        """
+        batch_size = math.ceil(wanted / len(partitions) * 1.5) + 1
+
+        def read(partition: str, last_evaluated_key: dict | None, limit: int) -> tuple[list, dict | None]:
+            result = self._query(
+                hash_key=partition,
+                range_key_condition=condition,
+                scan_index_forward=not descending,
+                attributes_to_get=attributes_to_get,
+                last_evaluated_key=last_evaluated_key,
+                limit=limit,
+            )
+            models = list(result)
+            return models, result.last_evaluated_key if len(models) == limit else None
+
+        def stream(partition: str, models: list, last_evaluated_key: dict | None) -> Iterator[EventPersistence]:
+            yield from models
+            while last_evaluated_key:
+                models, last_evaluated_key = read(partition, last_evaluated_key, wanted)
+                yield from models
+
+        pages = executor.map(lambda partition: read(partition, None, batch_size), partitions)
+        return [stream(partition, *page) for partition, page in zip(partitions, pages)]
+
+    def list_by_source(
+        self,
+        source: str,
+        start_date: int | None = None,
+        end_date: int | None = None,
+        fields: List[str] | None = None,
+    ) -> List[Event]:
+        """List events by source with optional time range, reading the `fields` only if set."""
+        # any id published at end_date, i.e. `{end_date}-{id}`, is within the range
         if start_date and end_date:
-            range_key_condition = self.model_cls.gsi1sk.between(f"EVENT#{start_date}", f"EVENT#{end_date}")
+            range_key_condition = self.model_cls.gsi1sk.between(str(start_date), f"{end_date}-\uffff")
         elif start_date:
-            range_key_condition = self.model_cls.gsi1sk >= f"EVENT#{start_date}"
+            range_key_condition = self.model_cls.gsi1sk >= str(start_date)
         elif end_date:
-            range_key_condition = self.model_cls.gsi1sk <= f"EVENT#{end_date}"
+            range_key_condition = self.model_cls.gsi1sk <= f"{end_date}-\uffff"
         else:
             range_key_condition = None
 
         result = self._query(
-            hash_key=f"SOURCE#{source}",
+            hash_key=source,
             range_key_condition=range_key_condition,
             index=self.model_cls.gsi1,
+            attributes_to_get=self._projection(fields),
         )
 
-        return [self.mapper.to_entity(item) for item in result]
+        return [self.mapper.to_lazy_entity(item, fields) for item in result]
 
     def create(self, entity: Event):
         model = EventMapper.to_persistence(entity)
         self._create(model)
 
+    def create_many(self, entities: List[Event]):
+        """Write the events in concurrent BatchWriteItem requests, an event already stored is overwritten."""
+        self._batch_create([EventMapper.to_persistence(entity) for entity in entities])
+
     def delete(self, id: str):
-        self._delete(hash_key="EVENT", range_key=id)
+        model = self._locate(id, attributes_to_get=["pk", "sk"])
+        self._delete(hash_key=model.pk, range_key=id)
+
+    def create_many_with_notifications(self, entities: List[Event]) -> tuple[List[str], List[str]]:
+        """Write the events along with their notification (transactional outbox), 50 events per transaction.
+
+        An event and its notification are written together or not at all, so a stored event is always
+        notified. Events already stored (redeliveries) are skipped. A transaction that fails is written
+        again one event at a time, so that an event that cannot be written fails alone.
+        Returns the ids of the events skipped, and of the events that could not be written.
+        """
+        skipped, failed = [], []
+        for chunk in chunks(entities, TRANSACT_WRITE_MAX_ITEMS // 2):
+            try:
+                skipped.extend(self._transact_create_with_notifications(chunk))
+                continue
+            except Exception:
+                if len(chunk) > 1:
+                    logger.warning(f"Failed to write {len(chunk)} events, writing them one by one", exc_info=True)
+                else:
+                    logger.exception(f"Failed to write event {chunk[0].id}")
+                    failed.append(chunk[0].id)
+                    continue
+            for entity in chunk:
+                try:
+                    skipped.extend(self._transact_create_with_notifications([entity]))
+                except Exception:
+                    logger.exception(f"Failed to write event {entity.id}")
+                    failed.append(entity.id)
+        if skipped:
+            logger.info(f"{len(skipped)} events already stored, skipped: {skipped}")
+        return skipped, failed
+
+    def _transact_create_with_notifications(self, entities: List[Event]) -> List[str]:
+        """Write the events & their notifications in one transaction, return the ids of the events already stored."""
+        skipped = []
+        while entities:
+            models = []
+            for entity in entities:
+                models.append(EventMapper.to_persistence(entity))
+                models.append(NotificationMapper.to_persistence(Notification(event_id=entity.id)))
+            if not (conflicts := self._transact_create(models)):
+                break
+            # drop the events that are already stored and write the others again
+            duplicates = {index // 2 for index in conflicts}
+            skipped.extend(entities[index].id for index in duplicates)
+            entities = [entity for index, entity in enumerate(entities) if index not in duplicates]
+        return skipped
+
+    def delete_range(self, source: str, start_date: int, end_date: int) -> int:
+        """Delete the events of a source published within a time range, return the number of deleted events."""
+        # the key attributes add their SOURCE#/EVENT# prefixes, any id published at end_date is deleted
+        result = self._query(
+            hash_key=source,
+            range_key_condition=self.model_cls.gsi1sk.between(str(start_date), f"{end_date}-\uffff"),
+            index=self.model_cls.gsi1,
+            attributes_to_get=["pk", "sk"],
+            limit=None,
+        )
+        keys = [(item.pk, item.sk) for item in result]
+        self._batch_delete(keys)
+        return len(keys)
+
+    def migrate_legacy(self, limit: int = 100) -> int:
+        """Move up to `limit` events of the legacy partition (`pk=EVENT`) to their day & shard partitions.
+
+        The ids without timestamp become `{published_at}-{id}`, and their pending notifications (outbox) are
+        moved to the new id along with them. The events are written again before being deleted, so that none
+        is lost if the migration stops midway. Returns the number of events moved, 0 once the legacy partition
+        is empty.
+        """
+        models = list(self._query(hash_key=LEGACY_EVENT_PARTITION, limit=limit))
+        legacy_keys = [(model.pk, model.sk) for model in models]
+        renamed = {}
+        for model in models:
+            id = model.id if event_day(model.id) else f"{int(model.published_at)}-{model.id}"
+            if id != model.id:
+                renamed[model.id] = id
+            model.pk, model.sk, model.id, model.gsi1sk = event_partition(id), id, id, id
+        notifications = self._outbox(list(renamed))
+        for notification in notifications:
+            notification.event_id = renamed[notification.event_id]
+        self._batch_create(models + [NotificationMapper.to_persistence(item) for item in notifications])
+        self._batch_delete(legacy_keys)
+        self._batch_write(
+            delete_items=[NotificationPersistence(hash_key="NOTIFICATION", range_key=id)._get_keys() for id in renamed]
+        )
+        logger.info(f"{len(models)} events moved out of the legacy partition, {len(notifications)} notifications")
+        return len(models)
+
+    def _outbox(self, event_ids: List[str]) -> List[Notification]:
+        """The notifications of the events still in the outbox."""
+        if not event_ids:
+            return []
+        keys = [("NOTIFICATION", event_id) for event_id in event_ids]
+        return [NotificationMapper.to_entity(item) for item in NotificationPersistence.batch_get(keys)]
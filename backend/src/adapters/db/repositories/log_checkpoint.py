@@ -0,0 +1,18 @@
+from src.adapters.db.mappers import LogCheckpointMapper
+from src.adapters.db.models import LogCheckpointPersistence
+from src.adapters.db.repositories.base import DynamoRepository
+from src.domain.models import LogCheckpoint
+
+
+class LogCheckpointRepository(DynamoRepository):
+    model_cls = LogCheckpointPersistence
+    mapper = LogCheckpointMapper
+
+    def list_all(self) -> list[LogCheckpoint]:
+        """List the checkpoints of all log groups."""
+        result = self._query(hash_key="CHECKPOINT", limit=None)
+        return [self.mapper.to_entity(item) for item in result]
+
+    def save_many(self, entities: list[LogCheckpoint]):
+        """Create or overwrite the checkpoints of several log groups."""
+        self._batch_create([self.mapper.to_persistence(entity) for entity in entities])
@@ -0,0 +1,52 @@
+from pynamodb.exceptions import UpdateError
+
+from src.adapters.db.mappers import LogGroupCacheMapper
+from src.adapters.db.models import LogGroupCachePersistence
+from src.adapters.db.repositories.base import DynamoRepository
+from src.common.exceptions import InternalServerError, NotFoundError, UnprocessedError
+from src.common.utils.datetime_utils import current_utc_timestamp
+from src.domain.models import LogGroupCache
+
+
+class LogGroupCacheRepository(DynamoRepository):
+    model_cls = LogGroupCachePersistence
+    mapper = LogGroupCacheMapper
+
+    def __init__(self, scope: str | None = None):
+        super().__init__()
+        # `{account}:{region}` of the resources, when they are discovered through an assumed role
+        self.scope = scope
+
+    def get(self, tag_name: str, tag_value: str) -> LogGroupCache:
+        """Get the log groups discovered for a tag."""
+        model = self._get(hash_key="CACHE", range_key=self.mapper.sort_key(tag_name, tag_value, self.scope))
+        return self.mapper.to_entity(model)
+
+    def save(self, entity: LogGroupCache):
+        """Create or overwrite the log groups discovered for a tag."""
+        model = self.mapper.to_persistence(entity, scope=self.scope)
+        model.save()
+
+    def delete(self, tag_name: str, tag_value: str):
+        """Drop the log groups discovered for a tag, forcing a full discovery."""
+        self._delete(hash_key="CACHE", range_key=self.mapper.sort_key(tag_name, tag_value, self.scope))
+
+    def update_log_group(self, tag_name: str, tag_value: str, resource_arn: str, log_group_name: str | None):
+        """Add, replace or (with `log_group_name=None`) remove the log group of a single resource.
+
+        The map entry is updated in place, so concurrent updates of other resources are not lost.
+        Raises NotFoundError if there is no unexpired cache to update.
+        """
+        model = self.model_cls(hash_key="CACHE", range_key=self.mapper.sort_key(tag_name, tag_value, self.scope))
+        entry = self.model_cls.log_groups[resource_arn]
+        action = entry.remove() if log_group_name is None else entry.set(log_group_name)
+        condition = self.hash_key_attr.exists() & (self.model_cls.expired_at > current_utc_timestamp())
+
+        try:
+            model.update(actions=[action], condition=condition)
+        except UpdateError as err:
+            if err.cause_response_code == "ConditionalCheckFailedException":
+                raise NotFoundError(f"{self.__class__.__name__}: {err}")
+            raise UnprocessedError(f"{self.__class__.__name__}: {err}")
+        except Exception as err:
+            raise InternalServerError(f"{self.__class__.__name__}: {err}")
@@ -1,6 +1,9 @@
+import time
+
 from src.adapters.db.mappers import MonitoringConfigMapper
 from src.adapters.db.models import MonitoringConfigPersistence
 from src.adapters.db.repositories.base import DynamoRepository
+from src.common.exceptions import NotFoundError
 from src.domain.models import MonitoringConfig
 
 
@@ -8,11 +11,27 @@ class MonitoringConfigRepository(DynamoRepository):
     model_cls = MonitoringConfigPersistence
     mapper = MonitoringConfigMapper
 
+    def __init__(self):
+        super().__init__()
+        self._cached: MonitoringConfig | None = None
+        self._cached_at: float | None = None
+
     def get(self) -> MonitoringConfig:
         """Get monitoring configuration (singleton)."""
         model = self._get(hash_key="CONFIG", range_key="MONITORING")
         return self.mapper.to_entity(model)
 
+    def get_cached(self, max_age: float = 60) -> MonitoringConfig | None:
+        """Get monitoring configuration, read at most once every `max_age` seconds. None if there is none."""
+        now = time.monotonic()
+        if self._cached_at is None or now - self._cached_at >= max_age:
+            try:
+                self._cached = self.get()
+            except NotFoundError:
+                self._cached = None
+            self._cached_at = now
+        return self._cached
+
     def create(self, entity: MonitoringConfig):
         """Create monitoring configuration."""
         model = self.mapper.to_persistence(entity)
@@ -0,0 +1,31 @@
+from itertools import islice
+from typing import List
+
+from src.adapters.db.mappers import NotificationMapper
+from src.adapters.db.models import NotificationPersistence
+from src.adapters.db.repositories.base import DynamoRepository
+from src.common.utils.datetime_utils import current_utc_timestamp
+from src.domain.models import Notification, NotificationStatus
+
+
+class NotificationRepository(DynamoRepository):
+    model_cls = NotificationPersistence
+    mapper = NotificationMapper
+
+    def list_due(self, limit: int = 100) -> List[Notification]:
+        """List the pending notifications whose next attempt is due, at most `limit` of them."""
+        result = self._query(
+            hash_key="NOTIFICATION",
+            filter_condition=(self.model_cls.status == NotificationStatus.PENDING.value)
+            & (self.model_cls.next_attempt_at <= current_utc_timestamp()),
+            limit=None,
+        )
+        return [self.mapper.to_entity(item) for item in islice(result, limit)]
+
+    def save_many(self, entities: List[Notification]):
+        """Create or overwrite several notifications, e.g. after a failed attempt."""
+        self._batch_create([self.mapper.to_persistence(entity) for entity in entities])
+
+    def delete_many(self, event_ids: List[str]):
+        """Delete the notifications of several events, once they are sent."""
+        self._batch_delete([("NOTIFICATION", event_id) for event_id in event_ids])
@@ -1,11 +1,117 @@
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from threading import Lock
 from typing import Iterable
 
-from src.adapters.aws import CloudwatchLogService, ECSService, LambdaService
+from types_boto3_ecs.type_defs import ClusterTypeDef
+
+from src.adapters.aws import CloudwatchLogService, ECSService, InsightsQuery, LambdaService, QueryStatistics
+from src.adapters.aws.lambda_function import FunctionConfiguration
+from src.adapters.db.repositories import LogGroupCacheRepository
+from src.common.exceptions import NotFoundError
 from src.common.logger import logger
+from src.common.metrics import MetricUnit, emit_metrics
+from src.common.utils.datetime_utils import current_utc_timestamp
 from src.common.utils.objects import chunks
-from src.domain.models.logs import LogEntry, LogQueryResult
+from src.domain.models.logs import LogEntry, LogGroupCache, LogQueryResult
+
+
+def function_log_group(function: FunctionConfiguration, tag_name: str, tag_value: str) -> str | None:
+    """Log group of a Lambda function, if the function is tagged for monitoring."""
+    if function.get("Tags", {}).get(tag_name, "") == tag_value:
+        return function.get("LoggingConfig", {}).get("LogGroup")
+    return None
+
+
+def cluster_log_group(cluster: ClusterTypeDef, tag_name: str, tag_value: str) -> str | None:
+    """Log group of an ECS cluster, if the cluster is tagged for monitoring."""
+    if any((tag["key"], tag["value"]) == (tag_name, tag_value) for tag in cluster.get("tags", [])):
+        return (
+            cluster.get("configuration", {})
+            .get("executeCommandConfiguration", {})
+            .get("logConfiguration", {})
+            .get("cloudWatchLogGroupName")
+        )
+    return None
+
+
+# Metrics -----------------------------------
+class InsightsMetrics:
+    """Publish the statistics of every Insights query as EMF metrics, and sum them up per run.
+
+    Query metrics are dimensioned by the number of log groups of the query, the log groups
+    themselves, the time range and the account/region are attached as metadata. The summary
+    carries the totals of the run and the chunks that scanned the most bytes.
+    """
+
+    def __init__(self, top_chunks: int = 5):
+        self.top_chunks = top_chunks
+        self._lock = Lock()  # log services of several accounts record from their own threads
+        self._statistics: list[tuple[QueryStatistics, str | None, str | None]] = []
+
+    def record(self, statistics: QueryStatistics, account: str | None = None, region: str | None = None):
+        query = statistics.query
+        emit_metrics(
+            metrics={
+                "RecordsScanned": (statistics.records_scanned, MetricUnit.Count),
+                "BytesScanned": (statistics.bytes_scanned, MetricUnit.Bytes),
+                "RecordsMatched": (statistics.records_matched, MetricUnit.Count),
+                "QueryDuration": (statistics.duration, MetricUnit.Seconds),
+                "QueryPolls": (statistics.polls, MetricUnit.Count),
+            },
+            dimensions={"LogGroupCount": str(len(query.log_group_names))},
+            metadata={
+                "query_id": statistics.query_id,
+                "status": statistics.status,
+                "split_depth": statistics.depth,
+                "truncated": statistics.truncated,
+                "log_group_names": query.log_group_names,
+                "start_time": query.start_time,
+                "end_time": query.end_time,
+                "account": account,
+                "region": region,
+            },
+        )
+        with self._lock:
+            self._statistics.append((statistics, account, region))
+
+    def flush_summary(self):
+        """Publish the totals of the queries recorded since the last flush."""
+        with self._lock:
+            recorded, self._statistics = self._statistics, []
+        if not recorded:
+            return
+
+        statistics = [item[0] for item in recorded]
+        top_chunks = sorted(recorded, key=lambda item: item[0].bytes_scanned, reverse=True)[: self.top_chunks]
+        emit_metrics(
+            metrics={
+                "Queries": (len(statistics), MetricUnit.Count),
+                "SplitQueries": (sum(item.depth > 0 for item in statistics), MetricUnit.Count),
+                "AbandonedQueries": (sum(item.status == "Abandoned" for item in statistics), MetricUnit.Count),
+                "TruncatedQueries": (sum(item.truncated for item in statistics), MetricUnit.Count),
+                "TotalRecordsScanned": (sum(item.records_scanned for item in statistics), MetricUnit.Count),
+                "TotalBytesScanned": (sum(item.bytes_scanned for item in statistics), MetricUnit.Bytes),
+                "TotalRecordsMatched": (sum(item.records_matched for item in statistics), MetricUnit.Count),
+                "TotalQueryDuration": (sum(item.duration for item in statistics), MetricUnit.Seconds),
+                "TotalQueryPolls": (sum(item.polls for item in statistics), MetricUnit.Count),
+            },
+            metadata={
+                "top_chunks": [
+                    {
+                        "log_group_names": item.query.log_group_names,
+                        "bytes_scanned": item.bytes_scanned,
+                        "duration": round(item.duration, 3),
+                        "account": account,
+                        "region": region,
+                    }
+                    for item, account, region in top_chunks
+                ],
+            },
+        )
+        logger.info(
+            f"{len(statistics)} Insights queries scanned {sum(item.bytes_scanned for item in statistics):.0f} bytes"
+        )
 
 
 # Service -----------------------------------
@@ -15,26 +121,94 @@ class LogService:
         cloudwatch_log_service: CloudwatchLogService,
         lambda_service: LambdaService,
         ecs_service: ECSService,
+        cache_repo: LogGroupCacheRepository | None = None,
+        cache_ttl: int = 3600,
+        account: str | None = None,
+        region: str | None = None,
+        metrics: InsightsMetrics | None = None,
     ):
         self.cloudwatch_log_service = cloudwatch_log_service
         self.lambda_service = lambda_service
         self.ecs_service = ecs_service
+        # Discovery cache: persisted in DynamoDB for `cache_ttl` seconds. It is read on every run, one item,
+        # so that the changes synced by SyncLogGroups are picked up by the next run
+        self.cache_repo = cache_repo
+        self.cache_ttl = cache_ttl
+        # Account & region the services point to, when they use an assumed role
+        self.account = account
+        self.region = region
+        self.metrics = metrics
 
     def list_monitoring_log_groups_by_tag(self, tag_name: str, tag_value) -> Iterable[str]:
-        """List lambda function's log groups and ECS clusters' log groups."""
-        for function in self.lambda_service.list_functions():
-            if function.get("Tags", {}).get(tag_name, "") == tag_value:
-                yield function.get("LoggingConfig", {}).get("LogGroup")
-
-        for cluster in self.ecs_service.list_clusters():
-            if any((tag["key"], tag["value"]) == (tag_name, tag_value) for tag in cluster.get("tags", [])):
-                if (
-                    log_group := cluster.get("configuration", {})
-                    .get("executeCommandConfiguration", {})
-                    .get("logConfiguration", {})
-                    .get("cloudWatchLogGroupName")
-                ):
-                    yield log_group
+        """List lambda function's log groups and ECS clusters' log groups.
+
+        Served from the discovery cache when available, a full discovery is only run when
+        the cache is missing or expired.
+        """
+        if self.cache_repo is None:
+            log_groups = self.discover_log_groups(tag_name, tag_value)
+        else:
+            log_groups = self._get_cache(tag_name, tag_value).log_groups
+        return sorted(set(log_groups.values()))
+
+    def discover_log_groups(self, tag_name: str, tag_value: str) -> dict[str, str]:
+        """Enumerate all Lambda functions and ECS clusters, return the log group of each tagged one by ARN.
+
+        Functions and clusters are enumerated side by side.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tag_filters = {tag_name: tag_value}
+            functions = executor.submit(lambda: list(self.lambda_service.list_functions(tag_filters=tag_filters)))
+            clusters = executor.submit(lambda: list(self.ecs_service.list_clusters()))
+
+        log_groups = {}
+        for function in functions.result():
+            if log_group := function_log_group(function, tag_name, tag_value):
+                log_groups[function.get("FunctionArn", log_group)] = log_group
+
+        for cluster in clusters.result():
+            if log_group := cluster_log_group(cluster, tag_name, tag_value):
+                log_groups[cluster.get("clusterArn", log_group)] = log_group
+        return log_groups
+
+    def refresh_monitoring_log_group(self, resource_arn: str, tag_name: str, tag_value: str):
+        """Update the discovery cache after a Lambda function or ECS cluster was created, deleted or (un)tagged."""
+        if self.cache_repo is None:
+            return
+
+        log_group = None
+        try:
+            if ":lambda:" in resource_arn:
+                log_group = function_log_group(self.lambda_service.get_function(resource_arn), tag_name, tag_value)
+            elif ":ecs:" in resource_arn:
+                log_group = cluster_log_group(self.ecs_service.get_cluster(resource_arn), tag_name, tag_value)
+            else:
+                logger.debug(f"Ignoring unsupported resource: {resource_arn}")
+                return
+        except NotFoundError:
+            pass  # deleted resource
+
+        try:
+            self.cache_repo.update_log_group(tag_name, tag_value, resource_arn, log_group)
+            logger.info(f"Log group of {resource_arn} set to {log_group} in the discovery cache")
+        except NotFoundError:
+            logger.debug("No discovery cache to update, the next run performs a full discovery")
+
+    def _get_cache(self, tag_name: str, tag_value: str) -> LogGroupCache:
+        try:
+            cache = self.cache_repo.get(tag_name, tag_value)
+            if cache.is_expired():
+                raise NotFoundError("Discovery cache expired")
+        except NotFoundError:
+            logger.info(f"Discovering log groups tagged {tag_name}={tag_value}")
+            cache = LogGroupCache(
+                tag_name=tag_name,
+                tag_value=tag_value,
+                log_groups=self.discover_log_groups(tag_name, tag_value),
+                expired_at=current_utc_timestamp() + self.cache_ttl,
+            )
+            self.cache_repo.save(cache)
+        return cache
 
     def query_logs(
         self,
@@ -42,30 +216,52 @@ class LogService:
         query_string: str,
         start_time: datetime,
         end_time: datetime,
-        timeout: int = 15,
-        delay: int = 1,
+        deadline: datetime | None = None,
         chunk_size: int = 10,
+        max_concurrent_queries: int = 1,
     ) -> Iterable[LogQueryResult]:
         """Query logs from CloudWatch Logs using the provided parameters.
 
+        Log groups are split into chunks of `chunk_size`, one Insights query per chunk. Up to
+        `max_concurrent_queries` chunks are queried at the same time and results are yielded
+        as each query finishes: one LogQueryResult per log group of the chunk, with empty logs
+        when nothing matched. Chunks whose query has not finished by `deadline`, or did not complete
+        (e.g. Failed), are skipped, so the log groups without a result are the ones not scanned. A chunk whose
+        results hit the row limit of the query is re-queried in smaller pieces and merged, so a
+        noisy log group neither gets truncated nor starves the other log groups of its chunk.
+
+        The statistics of every query (see QueryStatistics) are recorded by `metrics`, when set.
+
         Maps CloudWatch query results to domain LogQueryResult model.
         """
-        for chunk in chunks(log_group_names, chunk_size):
-            logger.debug(f"Querying log groups: {chunk}")
-            results = self.cloudwatch_log_service.query_logs(
+        queries = (
+            InsightsQuery(
                 log_group_names=chunk,
                 query_string=query_string,
                 start_time=int(start_time.timestamp()),
                 end_time=int(end_time.timestamp()),
-                timeout=timeout,
-                delay=delay,
             )
-            logger.debug(f"Found {len(results)} logs matching the query")
+            for chunk in chunks(log_group_names, chunk_size)
+        )
+        for query, results in self.cloudwatch_log_service.query_logs_concurrently(
+            queries,
+            max_concurrent_queries=max_concurrent_queries,
+            deadline=deadline.timestamp() if deadline else None,
+            on_statistics=self._record_statistics if self.metrics else None,
+        ):
+            logger.debug(f"Found {len(results)} logs matching the query for log groups: {query.log_group_names}")
 
             # categorize results by log_group_name and map to domain models
-            categorized_results = defaultdict(list)
+            categorized_results = {name: [] for name in query.log_group_names}
             for result in results:
                 log_entry = LogEntry.model_validate({item.get("field", " ")[1:]: item.get("value") for item in result})
-                categorized_results[log_entry.log].append(log_entry)
+                # @log is formatted as "{account_id}:{log_group_name}"
+                categorized_results.setdefault(log_entry.log.split(":", 1)[-1], []).append(log_entry)
+
+            yield from (
+                LogQueryResult(log_group_name=name, logs=logs, account=self.account, region=self.region)
+                for name, logs in categorized_results.items()
+            )
 
-            yield from (LogQueryResult(log_group_name=name, logs=logs) for name, logs in categorized_results.items())
+    def _record_statistics(self, statistics: QueryStatistics):
+        self.metrics.record(statistics, account=self.account, region=self.region)
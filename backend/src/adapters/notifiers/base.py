@@ -1,11 +1,58 @@
 import json
+from threading import Lock
 from typing import Any
 
 import requests
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from src.common.logger import logger
+from src.common.utils.rate_limiter import TokenBucket
 from src.common.utils.template import render_template
 
+from .blocks import PAYLOAD_BUILDERS
+
+# Slack accepts about 1 message per second per webhook, short bursts aside
+SLACK_WEBHOOK_RATE = 1.0
+SLACK_WEBHOOK_BURST = 1
+
+# Server errors retried by the session, with backoff. Throttling (429) is handled by SlackClient.send
+RETRYABLE_STATUSES = (500, 502, 503, 504)
+
+# Token buckets by webhook URL, shared by the clients of a container
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = Lock()
+
+
+def webhook_bucket(webhook_url: str, rate: float = SLACK_WEBHOOK_RATE, capacity: int = SLACK_WEBHOOK_BURST):
+    with _buckets_lock:
+        if webhook_url not in _buckets:
+            _buckets[webhook_url] = TokenBucket(rate=rate, capacity=capacity)
+        return _buckets[webhook_url]
+
+
+def pooled_session(pool_size: int = 4, max_retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+    """A session keeping up to `pool_size` connections alive, retrying connection and server errors.
+
+    A request that reached the server and timed out is not retried, a message could be posted twice.
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=max_retries,
+        status_forcelist=RETRYABLE_STATUSES,
+        allowed_methods=frozenset({"POST"}),
+        backoff_factor=backoff_factor,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class Message(BaseModel):
     body: str | None = None
@@ -13,9 +60,33 @@ class Message(BaseModel):
 
 
 class SlackClient:
-    def __init__(self, webhook_url: str, timeout: int = 10):
+    """Post messages to a Slack incoming webhook, no faster than the webhook accepts them.
+
+    Messages go through the token bucket of the webhook URL. A throttled message (HTTP 429) is
+    resent after its `Retry-After` delay, which holds back the other messages of the webhook too,
+    as long as the delay is below `max_retry_after` and `max_attempts` is not reached.
+
+    The client owns a pooled keep-alive session (see `pooled_session`): created along with a module-level
+    client, it is reused across warm invocations, sparing the TCP & TLS handshakes of every message.
+    """
+
+    def __init__(
+        self,
+        webhook_url: str,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10,
+        pool_size: int = 4,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_attempts: int = 3,
+        max_retry_after: float = 30,
+    ):
         self.webhook_url = webhook_url
-        self.timeout = timeout
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_attempts = max_attempts
+        self.max_retry_after = max_retry_after
+        self.bucket = webhook_bucket(webhook_url)
+        self.session = pooled_session(pool_size=pool_size, max_retries=max_retries, backoff_factor=backoff_factor)
 
     def send(self, message: Message):
         headers = {"Content-Type": "application/json"}
@@ -23,11 +94,32 @@ class SlackClient:
             "text": message.body or "",
             "attachments": message.attachments if message.attachments else [],
         }
-        response = requests.post(self.webhook_url, headers=headers, json=payload, timeout=self.timeout)
+        for attempt in range(1, self.max_attempts + 1):
+            self.bucket.acquire()
+            response = self.session.post(self.webhook_url, headers=headers, json=payload, timeout=self.timeout)
+            if response.status_code != 429:
+                break
+            retry_after = float(response.headers.get("Retry-After", 1))
+            self.bucket.pause(retry_after)
+            if attempt == self.max_attempts or retry_after > self.max_retry_after:
+                break
+            logger.warning(f"Slack webhook throttled, retrying in {retry_after}s (attempt {attempt})")
         response.raise_for_status()
 
 
 def render_message(template_file: str, context: dict | None = None) -> Message:
+    """Build the message of a template, with its Block Kit builder if it has one, from the template otherwise."""
+    context = context or {}
+    if builder := PAYLOAD_BUILDERS.get(template_file):
+        try:
+            data = builder(context)
+            return Message(body=data.get("body"), attachments=data.get("attachments", []))
+        except Exception:
+            logger.exception(f"Failed to build the blocks of '{template_file}', falling back to the template")
+    return render_template_message(template_file, context)
+
+
+def render_template_message(template_file: str, context: dict | None = None) -> Message:
     """Load message template from a file."""
     try:
         json_data = render_template(template_file, context or {})
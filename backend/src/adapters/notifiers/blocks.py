@@ -0,0 +1,233 @@
+"""Slack Block Kit builders, producing the message payloads without going through JSON text.
+
+Each message builder takes the context its Jinja template is rendered with and returns the same
+payload, `{"attachments": [...]}`. Values are escaped for mrkdwn and truncated to the Block Kit
+limits, whatever characters they contain.
+"""
+
+from typing import Any, Callable, Literal, NotRequired, TypedDict
+
+from src.common.constants import (
+    CFN_TEMPLATE_FILE,
+    CW_ALARM_TEMPLATE_FILE,
+    CW_LOG_TEMPLATE_FILE,
+    DIGEST_TEMPLATE_FILE,
+    GUARDDUTY_TEMPLATE_FILE,
+    HEALTH_TEMPLATE_FILE,
+    REPORT_TEMPLATE_FILE,
+)
+
+# Block Kit limits, longer texts are rejected by Slack
+HEADER_MAX_LENGTH = 150
+SECTION_TEXT_MAX_LENGTH = 3000
+FIELD_MAX_LENGTH = 2000
+
+
+class TextObject(TypedDict):
+    type: Literal["plain_text", "mrkdwn"]
+    text: str
+    emoji: NotRequired[bool]
+
+
+class Block(TypedDict):
+    type: Literal["header", "context", "divider", "section"]
+    text: NotRequired[TextObject]
+    fields: NotRequired[list[TextObject]]
+    elements: NotRequired[list[TextObject]]
+
+
+class Attachment(TypedDict):
+    color: str
+    blocks: list[Block]
+
+
+class Payload(TypedDict):
+    attachments: list[Attachment]
+
+
+# Primitives ---------------------------------
+def escape(value: Any) -> str:
+    """Escape the control characters of mrkdwn, see "Formatting text for app surfaces"."""
+    return str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def truncate(text: str, max_length: int) -> str:
+    return text if len(text) <= max_length else text[: max_length - 1] + "…"
+
+
+def code_block(text: str, max_length: int) -> str:
+    """A ``` block, truncated to `max_length` characters fences included."""
+    return f"```{truncate(text, max_length - 6)}```"
+
+
+def plain_text(text: str) -> TextObject:
+    return {"type": "plain_text", "text": text, "emoji": True}
+
+
+def mrkdwn(text: str, max_length: int = SECTION_TEXT_MAX_LENGTH) -> TextObject:
+    return {"type": "mrkdwn", "text": truncate(text, max_length)}
+
+
+def header(text: str) -> Block:
+    return {"type": "header", "text": plain_text(truncate(text, HEADER_MAX_LENGTH))}
+
+
+def context(*texts: str) -> Block:
+    return {"type": "context", "elements": [mrkdwn(text) for text in texts]}
+
+
+def divider() -> Block:
+    return {"type": "divider"}
+
+
+def section(text: str) -> Block:
+    return {"type": "section", "text": mrkdwn(text)}
+
+
+def fields(*texts: str) -> Block:
+    return {"type": "section", "fields": [mrkdwn(text, FIELD_MAX_LENGTH) for text in texts]}
+
+
+def payload(color: str, *blocks: Block) -> Payload:
+    return {"attachments": [{"color": color, "blocks": list(blocks)}]}
+
+
+def account_blocks(title: str, account: dict) -> list[Block]:
+    """Header of the messages about an account: title, account id & region, divider."""
+    return [
+        header(title),
+        context(f"*Account: {escape(account['id'])}  | {escape(account.get('region'))}*"),
+        divider(),
+    ]
+
+
+# Messages -----------------------------------
+def cw_alarm_payload(ctx: dict) -> Payload:
+    account = ctx["account"]
+    dimensions = "".join(f"• *{escape(k)}*: `{escape(v)}`" for k, v in ctx["metric_dimensions"].items())
+    return payload(
+        ctx["color"],
+        *account_blocks(f"{ctx['emoji']} ({account['name']}) CloudWatch Alarm: {ctx['alarm_name']}", account),
+        fields(
+            f"* :bar_chart: Metric:*\n{escape(ctx['metric_namespace'])}/{escape(ctx['metric_name'])}",
+            f"* :alarm_clock: Time:*\n{escape(ctx['time'])}",
+        ),
+        section(f"* Description:*\n{escape(ctx['alarm_description'])}"),
+        section(f"* Reason:*\n{escape(ctx['alarm_reason'])}"),
+        section(f"* Dimensions:*\n{dimensions}"),
+    )
+
+
+def cw_log_payload(ctx: dict) -> Payload:
+    account = ctx["account"]
+    if ctx.get("templates"):
+        logs = ""
+        for template in ctx["templates"]:
+            logs += f"[x{template['count']}] {template['template']}\n"
+            if template.get("samples"):
+                sample = template["samples"][0]
+                logs += f"  e.g. {sample['timestamp']}: {sample['message']}\n"
+    else:
+        logs = "".join(f"{log['timestamp']}: {log['message']}\n" for log in ctx["logs"])
+    title = "* :scroll: Logs:*\n"
+    return payload(
+        ctx["color"],
+        *account_blocks(f"{ctx['emoji']} ({account['name']}) CloudWatch Logs: {ctx['detail_type']}", account),
+        fields(f"*Log Group:*\n`{escape(ctx['log_group_name'])}`", f"* :alarm_clock: Time:*\n{escape(ctx['time'])}"),
+        section(title + code_block(escape(logs), SECTION_TEXT_MAX_LENGTH - len(title))),
+    )
+
+
+def guardduty_payload(ctx: dict) -> Payload:
+    account = ctx["account"]
+    return payload(
+        ctx["color"],
+        *account_blocks(f":shield: ({account['name']}) GuardDuty: {ctx['title']}", account),
+        fields(
+            f":label:*Type:*\n{escape(ctx['finding_type'])}",
+            f":beginner:*Severity:*\n{escape(ctx['severity_label'])}",
+            f":chart_with_upwards_trend:*Count:*\n{escape(ctx['count'])}",
+            f":alarm_clock:*Time:*\n{escape(ctx['created_at'])}",
+        ),
+        section(f"*Description:*\n{escape(ctx['description'])}"),
+        section(f"*Resource ID:*\n• `{escape(ctx['instance_id'])}`"),
+    )
+
+
+def health_payload(ctx: dict) -> Payload:
+    account = ctx["account"]
+    entities = "".join(
+        f"\n• `{escape(entity['entityValue'])}` — *{escape(entity['status'].capitalize())}*"
+        for entity in ctx["affected_entities"]
+    )
+    return payload(
+        ctx["color"],
+        *account_blocks(f"{ctx['emoji']} ({account['name']}) Health Event: {ctx['event_type_code']}", account),
+        fields(
+            f"* :gear: Service:*\n{escape(ctx['service'])}",
+            f"* :label: Category:*\n{escape(ctx['event_type_category'])}",
+            f"* :beginner: Status:*\n{escape(ctx['status'])}",
+            f"* :calendar: Start Time:*\n{escape(ctx['start_time'])}",
+        ),
+        section(f"*Description:*\n{escape(ctx['description'])}"),
+        section(f"*Affected Entities:*\n{entities}"),
+    )
+
+
+def cfn_payload(ctx: dict) -> Payload:
+    account = ctx["account"]
+    return payload(
+        ctx["color"],
+        *account_blocks(f"{ctx['emoji']} ({account['name']}) CloudFormation: {ctx['stack_name']}", account),
+        fields(
+            f":beginner:*Status:*\n`{escape(ctx['stack_status'])}`",
+            f":alarm_clock:*Time:*\n{escape(ctx['time'])}",
+        ),
+        section(f"*Reason:*\n{escape(ctx['stack_status_reason'])}"),
+        section(f"*Stack:*\n• <{ctx['console_link']}|{escape(ctx['stack_name'])}>"),
+    )
+
+
+def report_payload(ctx: dict) -> Payload:
+    blocks = [
+        header(":bar_chart: Daily Report"),
+        context(f"*Date: {escape(ctx['start'])} - {escape(ctx['end'])} | Total: {ctx['total']}*"),
+    ]
+    for stat in ctx["statistics"]:
+        emoji = ":white_check_mark:" if stat["statistics"] else ":warning:"
+        blocks.append(section(f"{emoji}*  {escape(stat['name'])}*"))
+        if stat["statistics"]:
+            counts = "".join(f"\n • {escape(type_)}: {count}" for type_, count in stat["statistics"].items())
+            blocks.append(section(code_block(counts, SECTION_TEXT_MAX_LENGTH)))
+    return payload("#4089a3", *blocks)
+
+
+def digest_payload(ctx: dict) -> Payload:
+    account = ctx["account"]
+    lines = "".join(
+        f"• *{escape(event['detail_type'])}* {escape(event['region'])} {escape(event['time'])}"
+        + (f" `{escape(event['resources'][0])}`" if event["resources"] else "")
+        + "\n"
+        for event in ctx["events"]
+    )
+    if ctx["more"]:
+        lines += f"_and {ctx['more']} more_"
+    return payload(
+        ctx["color"],
+        header(f"{ctx['emoji']} ({account['name']}) {ctx['total']} events from {ctx['source']}"),
+        context(f"*Account: {escape(account['id'])}  | {escape(ctx['start'])} - {escape(ctx['end'])}*"),
+        divider(),
+        section(lines),
+    )
+
+
+# Builder of the payload of each template, the template being the fallback
+PAYLOAD_BUILDERS: dict[str, Callable[[dict], Payload]] = {
+    CW_ALARM_TEMPLATE_FILE: cw_alarm_payload,
+    CW_LOG_TEMPLATE_FILE: cw_log_payload,
+    GUARDDUTY_TEMPLATE_FILE: guardduty_payload,
+    HEALTH_TEMPLATE_FILE: health_payload,
+    CFN_TEMPLATE_FILE: cfn_payload,
+    REPORT_TEMPLATE_FILE: report_payload,
+    DIGEST_TEMPLATE_FILE: digest_payload,
+}
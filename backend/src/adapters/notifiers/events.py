@@ -7,10 +7,12 @@ from src.adapters.aws.data_classes import (
     GuardDutyFindingEvent,
     HealthEvent,
 )
+from src.adapters.claim_check import ClaimCheck, is_claim_check
 from src.common.constants import (
     CFN_TEMPLATE_FILE,
     CW_ALARM_TEMPLATE_FILE,
     CW_LOG_TEMPLATE_FILE,
+    DIGEST_TEMPLATE_FILE,
     GUARDDUTY_TEMPLATE_FILE,
     HEALTH_TEMPLATE_FILE,
     METADATA,
@@ -59,15 +61,19 @@ def cw_alarm_event_to_message(event: EventBridgeEvent) -> Message:
 
 def cw_log_event_to_message(event: EventBridgeEvent) -> Message:
     event = CwLogEvent(event)
+    # logs scanned in another account are published from the monitoring account
+    account = event.detail.account or event.account
+    region = event.detail.region or event.region
     return render_message(
         CW_LOG_TEMPLATE_FILE,
         context={
             "emoji": ":warning:",
             "color": "#FF0000",
-            "account": {"id": event.account, "name": METADATA.get(event.account), "region": event.region},
+            "account": {"id": account, "name": METADATA.get(account), "region": region},
             "detail_type": event.detail_type,
             "log_group_name": event.detail.log_group_name,
             "logs": event.detail.logs,
+            "templates": event.detail.templates,
             "time": event.time,
         },
     )
@@ -160,9 +166,38 @@ def cfn_event_to_message(event: EventBridgeEvent) -> Message:
     )
 
 
+def events_to_digest(events: list[EventBridgeEvent], max_lines: int = 20) -> Message:
+    """A single message listing events of the same source and account, latest first."""
+    events = sorted(events, key=lambda event: event.time, reverse=True)
+    first = events[0]
+    return render_message(
+        DIGEST_TEMPLATE_FILE,
+        context={
+            "emoji": ":bell:",
+            "color": "#FFA500",
+            "account": {"id": first.account, "name": METADATA.get(first.account)},
+            "source": first.source,
+            "total": len(events),
+            "start": events[-1].time,
+            "end": first.time,
+            "events": [
+                {
+                    "detail_type": event.detail_type,
+                    "region": event.region,
+                    "time": event.time,
+                    "resources": event.resources,
+                }
+                for event in events[:max_lines]
+            ],
+            "more": max(0, len(events) - max_lines),
+        },
+    )
+
+
 class EventNotifier:
-    def __init__(self, client: SlackClient):
+    def __init__(self, client: SlackClient, claim_check: ClaimCheck | None = None):
         self.client = client
+        self.claim_check = claim_check
 
     @staticmethod
     def event_to_message(event: EventBridgeEvent) -> Message:
@@ -181,5 +216,12 @@ class EventNotifier:
                 raise ValueError(f"Unknown event source: {event.source}")
 
     def notify(self, event: EventBridgeEvent):
+        # the message needs the full detail, fetch it back if it was offloaded
+        if self.claim_check and is_claim_check(event.detail):
+            event = EventBridgeEvent({**event.raw_event, "detail": self.claim_check.check_out(event.detail)})
         message = self.event_to_message(event)
         self.client.send(message)
+
+    def notify_digest(self, events: list[EventBridgeEvent]):
+        """Notify events of the same source and account in a single message."""
+        self.client.send(events_to_digest(events))
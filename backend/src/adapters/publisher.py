@@ -1,4 +1,5 @@
 from src.adapters.aws import EventBridgeService
+from src.adapters.claim_check import ClaimCheck
 from src.domain.models.messages import Message
 
 
@@ -6,14 +7,18 @@ class Publisher:
     """Publisher adapter that publishes domain messages to EventBridge.
 
     Maps domain Message models to EventBridge event entry format.
+    Details larger than the claim check threshold are offloaded, only a reference is published.
     """
 
-    def __init__(self, client: EventBridgeService) -> None:
+    def __init__(self, client: EventBridgeService, claim_check: ClaimCheck | None = None) -> None:
         self.client = client
+        self.claim_check = claim_check
 
     def publish(self, messages: list[Message]) -> None:
         """Publish domain messages to EventBridge.
 
+        Messages are sent in as few requests as possible, see EventBridgeService.put_events.
+
         Args:
             messages: List of domain Message models to publish
         """
@@ -21,7 +26,7 @@ class Publisher:
             {
                 "Source": message.source,
                 "DetailType": message.detail_type,
-                "Detail": message.detail,
+                "Detail": self.claim_check.check_in(message.detail) if self.claim_check else message.detail,
                 "Resources": message.resources,
                 "Time": message.time,
             }
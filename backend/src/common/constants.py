@@ -6,6 +6,9 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 STATIC_DIR = BASE_DIR / "statics"
 TEMPLATE_DIR = STATIC_DIR / "templates"
+# Optional on-disk cache of the compiled templates, and whether to compile them all at import (cold start)
+TEMPLATE_BYTECODE_CACHE_DIR = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR")
+TEMPLATE_PRECOMPILE = os.getenv("TEMPLATE_PRECOMPILE", "false").lower() == "true"
 
 # Common
 SERVICE = os.getenv("SERVICE", "monitoring")
@@ -15,13 +18,30 @@ STAGE = os.getenv("STAGE", "dev")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
 LOG_EVENT = os.getenv("LOG_EVENT", "true").lower() == "true"
 
+# Metrics, published as CloudWatch embedded metric format (EMF) log lines
+METRICS_NAMESPACE = os.getenv("POWERTOOLS_METRICS_NAMESPACE", SERVICE)
+
 # AWS
 AWS_REGION = os.getenv("AWS_REGION")
 AWS_ENDPOINT = "http://localhost:4566" if STAGE == "local" else None
+AWS_MAX_ATTEMPTS = int(os.getenv("AWS_MAX_ATTEMPTS", 5))  # per request, throttling & transient errors
 # DynamoDB
 AWS_DYNAMODB_DEFAULT_QUERY_LIMIT = os.getenv("AWS_DYNAMODB_DEFAULT_QUERY_LIMIT", 50)
 AWS_DYNAMODB_TABLE = os.getenv("AWS_DYNAMODB_TABLE", "monitoring-local")
 AWS_DYNAMODB_TTL = int(os.getenv("AWS_DYNAMODB_TTL", 604800))  # 7 days in seconds
+# Number of partitions the events of a day are spread over, must not change once events are stored
+AWS_DYNAMODB_EVENT_SHARDS = int(os.getenv("AWS_DYNAMODB_EVENT_SHARDS", 8))
+# Size in bytes above which the large text attributes (e.g. event detail) are stored compressed
+AWS_DYNAMODB_COMPRESSION_THRESHOLD = int(os.getenv("AWS_DYNAMODB_COMPRESSION_THRESHOLD", 1024))
+
+# Claim check: event details larger than the threshold (bytes) are offloaded to the store,
+# e.g. s3://bucket/prefix or file:///tmp/claim-checks, disabled when no store is set
+CLAIM_CHECK_URL = os.getenv("CLAIM_CHECK_URL")
+CLAIM_CHECK_THRESHOLD = int(os.getenv("CLAIM_CHECK_THRESHOLD", 64 * 1024))
+
+# Monitoring tag of the resources whose logs are scanned
+MONITORING_TAG_NAME = os.getenv("MONITORING_TAG_NAME", "monitoring")
+MONITORING_TAG_VALUE = os.getenv("MONITORING_TAG_VALUE", "true")
 
 # Webhook URLs
 REPORT_WEBHOOK_URL = os.environ.get("REPORT_WEBHOOK_URL")
@@ -35,6 +55,7 @@ GUARDDUTY_TEMPLATE_FILE = "guardduty.jinja"
 HEALTH_TEMPLATE_FILE = "health.jinja"
 CFN_TEMPLATE_FILE = "cfn_deployment.jinja"
 REPORT_TEMPLATE_FILE = "daily_report.jinja"
+DIGEST_TEMPLATE_FILE = "digest.jinja"
 
 # Account Metadata
 METADATA = json.loads(
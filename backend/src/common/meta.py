@@ -1,8 +1,15 @@
+from threading import RLock
+
+
 class SingletonMeta(type):
+    """One instance per class and arguments, e.g. one client per region or per assumed-role session."""
+
     _instances = {}
+    _lock = RLock()  # services may create other services in __init__
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
-        return cls._instances[cls]
+        key = (cls, args, tuple(sorted(kwargs.items())))
+        with cls._lock:
+            if key not in cls._instances:
+                cls._instances[key] = super().__call__(*args, **kwargs)
+        return cls._instances[key]
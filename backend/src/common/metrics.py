@@ -0,0 +1,25 @@
+from aws_lambda_powertools.metrics import EphemeralMetrics, MetricUnit
+
+from src.common.constants import METRICS_NAMESPACE, SERVICE
+
+__all__ = ["emit_metrics", "MetricUnit"]
+
+
+def emit_metrics(
+    metrics: dict[str, tuple[float, MetricUnit]],
+    dimensions: dict[str, str] | None = None,
+    metadata: dict | None = None,
+):
+    """Print the metrics as a single EMF document, CloudWatch extracts them from the log line.
+
+    Dimensions must have a low cardinality, they define the metric series; metadata is only
+    searchable with Logs Insights and may hold anything (query ids, log group names...).
+    """
+    emf = EphemeralMetrics(namespace=METRICS_NAMESPACE, service=SERVICE)
+    for name, value in (dimensions or {}).items():
+        emf.add_dimension(name=name, value=value)
+    for name, (value, unit) in metrics.items():
+        emf.add_metric(name=name, unit=unit, value=value)
+    for key, value in (metadata or {}).items():
+        emf.add_metadata(key=key, value=value)
+    emf.flush_metrics()
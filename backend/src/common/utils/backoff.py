@@ -0,0 +1,18 @@
+import random
+from typing import Iterator
+
+
+def exponential_backoff(initial: float, maximum: float, factor: float = 2.0) -> Iterator[float]:
+    """
+    Yield exponentially growing delays with jitter.
+    Each delay is drawn from [d/2, d] ("equal jitter"), where d starts at `initial` and is
+    multiplied by `factor` after every step until it reaches `maximum`.
+    :param initial: first nominal delay in seconds
+    :param maximum: cap of the nominal delay in seconds
+    :param factor: growth factor between two consecutive delays
+    :return: infinite iterator of delays in seconds
+    """
+    delay = initial
+    while True:
+        yield delay / 2 + random.uniform(0, delay / 2)  # nosec B311 - jitter, not cryptography
+        delay = min(delay * factor, maximum)
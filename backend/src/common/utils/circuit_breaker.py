@@ -0,0 +1,44 @@
+import time
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"  # calls go through
+    OPEN = "open"  # calls are refused until `reset_timeout` has elapsed
+    HALF_OPEN = "half_open"  # a trial call goes through, its outcome closes or reopens the circuit
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency for a while, instead of piling up retries on it.
+
+    The circuit opens after `failure_threshold` consecutive failures. Once `reset_timeout`
+    seconds have elapsed, a single trial call is allowed: a success closes the circuit,
+    a failure opens it again. The state lives in memory, i.e. in a warm container.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go through."""
+        return self.state != CircuitState.OPEN
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
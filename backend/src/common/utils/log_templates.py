@@ -0,0 +1,96 @@
+import re
+from dataclasses import dataclass, field
+
+# Variable parts of a log message, masked before clustering (order matters: UUIDs contain hex and numbers)
+MASKS = [
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<UUID>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<NUM>"),
+    (re.compile(r"\b0[xX][0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*[0-9])(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b"), "<HEX>"),
+    (re.compile(r"(?<![\w.])[-+]?\d+(?:[.:/-]\d+)*"), "<NUM>"),
+]
+WILDCARD = "<*>"
+
+
+def mask_message(message: str) -> str:
+    """Replace UUIDs, hex strings and numbers with placeholders."""
+    for pattern, placeholder in MASKS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+@dataclass
+class LogCluster:
+    tokens: list[str]
+    count: int = 0
+    samples: list[int] = field(default_factory=list)  # indexes of the sample messages
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+
+class TemplateMiner:
+    """Group log messages by template, after the Drain algorithm.
+
+    Messages are masked and split into tokens, then routed by token count and their first
+    `depth` tokens (a token holding a placeholder is routed as a wildcard). Within a route,
+    a message joins the cluster whose template shares the largest part of its tokens, if
+    that part reaches `similarity`; the tokens that differ become wildcards. Otherwise the
+    message starts a new cluster.
+    """
+
+    def __init__(self, depth: int = 2, similarity: float = 0.5, max_samples: int = 3):
+        self.depth = depth
+        self.similarity = similarity
+        self.max_samples = max_samples
+        self.routes: dict[tuple, list[LogCluster]] = {}
+        self.clusters: list[LogCluster] = []
+        self._size = 0
+
+    def add(self, message: str) -> LogCluster:
+        tokens = mask_message(message).split()
+        prefix = tuple(WILDCARD if "<" in token else token for token in tokens[: self.depth])
+        route = self.routes.setdefault((len(tokens), prefix), [])
+
+        cluster = self._match(route, tokens)
+        if cluster is None:
+            cluster = LogCluster(tokens=tokens)
+            route.append(cluster)
+            self.clusters.append(cluster)
+        else:
+            cluster.tokens = [a if a == b else WILDCARD for a, b in zip(cluster.tokens, tokens)]
+
+        cluster.count += 1
+        if len(cluster.samples) < self.max_samples:
+            cluster.samples.append(self._size)
+        self._size += 1
+        return cluster
+
+    def _match(self, route: list[LogCluster], tokens: list[str]) -> LogCluster | None:
+        if not tokens:
+            return route[0] if route else None
+
+        best, best_score = None, -1.0
+        for cluster in route:
+            same = sum(a == b or a == WILDCARD for a, b in zip(cluster.tokens, tokens))
+            score = same / len(tokens)
+            if score > best_score:
+                best, best_score = cluster, score
+        return best if best_score >= self.similarity else None
+
+
+def cluster_messages(
+    messages: list[str], depth: int = 2, similarity: float = 0.5, max_samples: int = 3
+) -> list[LogCluster]:
+    """
+    Cluster log messages by template.
+    :param messages: log messages
+    :param depth: number of leading tokens a message is routed by
+    :param similarity: minimum share of tokens a message must have in common with a template to join it
+    :param max_samples: number of sample message indexes kept per cluster
+    :return: clusters, most frequent first
+    """
+    miner = TemplateMiner(depth=depth, similarity=similarity, max_samples=max_samples)
+    for message in messages:
+        miner.add(message)
+    return sorted(miner.clusters, key=lambda cluster: cluster.count, reverse=True)
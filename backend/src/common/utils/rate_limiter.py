@@ -0,0 +1,42 @@
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """Let calls through at `rate` per second on average, in bursts of up to `capacity` calls.
+
+    `acquire` blocks until a token is available. `pause` holds every call back for a while,
+    e.g. for the `Retry-After` delay of a throttled request. The state lives in memory.
+    """
+
+    def __init__(self, rate: float = 1.0, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                if (delay := self._delay()) <= 0:
+                    self.tokens -= 1
+                    return
+            # sleep without the lock, so that a `pause` meanwhile is seen on waking up
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def _delay(self) -> float:
+        """Seconds to wait for the next token, after refilling the bucket."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            self.updated_at = self.paused_until
+            return self.paused_until - now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
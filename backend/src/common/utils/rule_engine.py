@@ -0,0 +1,90 @@
+import operator
+from bisect import insort
+from typing import Any, Callable
+
+# Comparison of the value found in the data (left) with the value of the rule (right)
+OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda left, right: left in right,
+    "contains": operator.contains,
+}
+_MISSING = object()
+
+
+def compile_getter(path: str) -> Callable[[dict], Any]:
+    """Compile a dotted path (e.g. `state.value`) into a function reading it from nested dicts."""
+    keys = path.split(".")
+
+    def get(data: dict) -> Any:
+        for key in keys:
+            if not isinstance(data, dict):
+                return _MISSING
+            data = data.get(key, _MISSING)
+        return data
+
+    return get
+
+
+class _PathRules:
+    """Rules on the value at a path, highest result first."""
+
+    def __init__(self, path: str):
+        self.get = compile_getter(path)
+        self.rules: list[tuple[Callable[[Any, Any], bool], Any, int]] = []
+
+    def add(self, compare: Callable[[Any, Any], bool], value: Any, result: int):
+        insort(self.rules, (compare, value, result), key=lambda rule: -rule[2])
+
+    def evaluate(self, data: dict, best: int) -> int:
+        found = self.get(data)
+        if found is _MISSING:
+            return best
+        for compare, value, result in self.rules:
+            if result <= best:
+                break
+            try:
+                if compare(found, value):
+                    return result
+            except TypeError:
+                continue
+        return best
+
+
+class RuleEngine:
+    """Rules on dict values, compiled into a dispatch table.
+
+    Each rule compares the value at a dotted path with a constant and has a result, e.g. a severity.
+    Rules are dispatched by key, then by the first segment of their path, so evaluating data only
+    reads the paths it has. Within a path, the value is read once and the rules are tried highest
+    result first. `evaluate` returns the highest result of the rules that match.
+    """
+
+    def __init__(self):
+        self.table: dict[str, dict[str, dict[str, _PathRules]]] = {}
+        self.size = 0
+
+    def add(self, key: str, path: str, op: str, value: Any, result: int):
+        by_root = self.table.setdefault(key, {})
+        by_path = by_root.setdefault(path.split(".", 1)[0], {})
+        if path not in by_path:
+            by_path[path] = _PathRules(path)
+        by_path[path].add(OPERATORS[op], value, result)
+        self.size += 1
+
+    def evaluate(self, key: str, data: dict, default: int = 0) -> int:
+        by_root = self.table.get(key)
+        if not by_root or not isinstance(data, dict):
+            return default
+        best = default
+        for root in by_root.keys() & data.keys():
+            for path_rules in by_root[root].values():
+                best = path_rules.evaluate(data, best)
+        return best
+
+    def __len__(self) -> int:
+        return self.size
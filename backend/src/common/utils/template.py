@@ -1,8 +1,42 @@
+from pathlib import Path
 from typing import Any, Dict
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
-from src.common.constants import TEMPLATE_DIR
+from src.common.constants import TEMPLATE_BYTECODE_CACHE_DIR, TEMPLATE_DIR, TEMPLATE_PRECOMPILE
+from src.common.logger import logger
+
+
+def create_environment(bytecode_cache_dir: str | None = TEMPLATE_BYTECODE_CACHE_DIR) -> Environment:
+    """
+    Create the Jinja2 environment of the templates under TEMPLATE_DIR.
+    Compiled templates are cached in memory, and never checked for changes on disk (the templates
+    are shipped with the code). With a `bytecode_cache_dir`, the compiled templates are also cached
+    on disk, so that a new process does not compile them again.
+    """
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=False,
+        cache_size=-1,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+# Shared by every render of the process, i.e. across the warm invocations of a Lambda container
+environment = create_environment()
+
+
+def precompile_templates(env: Environment = environment) -> int:
+    """Compile every template ahead of its first render. Returns the number of templates compiled."""
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    return len(names)
 
 
 def render_template(template_file: str, context: Dict[str, Any]) -> str:
@@ -14,8 +48,14 @@ def render_template(template_file: str, context: Dict[str, Any]) -> str:
     Returns:
         str: Rendered template content as a string.
     """
-    # Set up Jinja2 environment
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True)
-    # Load and render the template
-    template = env.get_template(template_file)
+    template = environment.get_template(template_file)
     return template.render(**context)
+
+
+if TEMPLATE_PRECOMPILE:
+    precompile_templates()
+
+
+if __name__ == "__main__":
+    # Fill the bytecode cache at build time: TEMPLATE_BYTECODE_CACHE_DIR=... python -m src.common.utils.template
+    logger.info(f"{precompile_templates()} templates compiled into {TEMPLATE_BYTECODE_CACHE_DIR}")
@@ -5,9 +5,10 @@ from .config import (
     MonitoringConfig,
     ServiceConfig,
 )
-from .event import Event, EventQueryResult
-from .logs import LogEntry, LogQueryResult
+from .event import Event, EventQueryResult, LazyEvent
+from .logs import LogCheckpoint, LogEntry, LogGroupCache, LogQueryResult, LogTemplate
 from .messages import Message
+from .notification import Notification, NotificationStatus
 from .task import (
     AssignedUser,
     Task,
@@ -26,11 +27,18 @@ __all__ = [
     # Event models
     "Event",
     "EventQueryResult",
+    "LazyEvent",
     # Log models
+    "LogCheckpoint",
     "LogEntry",
+    "LogGroupCache",
     "LogQueryResult",
+    "LogTemplate",
     # Message models
     "Message",
+    # Notification models
+    "Notification",
+    "NotificationStatus",
     # User models
     "User",
     "UserRole",
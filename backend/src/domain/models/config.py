@@ -5,8 +5,12 @@ from enum import Enum
 
 from pydantic import Field, field_validator, model_validator
 
+from src.common.logger import logger
 from src.common.models import BaseModel
 from src.common.utils.datetime_utils import current_utc_timestamp
+from src.common.utils.rule_engine import OPERATORS, RuleEngine
+
+from .event import SEVERITY_LEVELS
 
 
 class AwsConfigStatus(str, Enum):
@@ -145,7 +149,7 @@ class ServiceConfig(BaseModel):
     #   "resource_types": ["AWS::EC2::Instance", "AWS::RDS::DBInstance"]
     # }
 
-    # Severity rules
+    # Severity rules, `metric` being a dotted path in the event detail (e.g. "state.value")
     severity_rules: list[dict] = []
     # [
     #   {
@@ -261,6 +265,23 @@ class MonitoringConfig(BaseModel):
         self.updated_at = current_utc_timestamp()
         self.updated_by = updated_by
 
+    def compile_severity_rules(self) -> RuleEngine:
+        """
+        Compile the severity rules of the enabled services into a rule engine, keyed by service name.
+
+        An event gets the highest severity among the rules of its service it matches. Invalid rules are skipped.
+        """
+        engine = RuleEngine()
+        for service in self.get_enabled_services():
+            for rule in service.severity_rules:
+                severity = rule.get("severity")
+                severity = SEVERITY_LEVELS.get(severity) if isinstance(severity, str) else severity
+                if not rule.get("metric") or rule.get("operator") not in OPERATORS or severity not in range(6):
+                    logger.warning(f"Invalid severity rule of {service.service_name} skipped: {rule}")
+                    continue
+                engine.add(service.service_name, rule["metric"], rule["operator"], rule.get("value"), severity)
+        return engine
+
     def get_enabled_services(self) -> list[ServiceConfig]:
         """Get list of enabled services."""
         return [s for s in self.services if s.enabled]
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 
 from src.common.utils.datetime_utils import current_utc_timestamp
 
@@ -6,7 +8,10 @@ from .base import PaginatedInputDTO, QueryResult
 
 # 90 days in seconds
 DEFAULT_TTL_DAYS = 90
+DEFAULT_LIST_DAYS = 7  # days listed when no start date is given, today included
 SECONDS_PER_DAY = 86400
+# Severity levels by label, 5 being the most severe
+SEVERITY_LEVELS = {"info": 0, "low": 1, "medium": 2, "high": 3, "critical": 4, "emergency": 5}
 
 
 # Model
@@ -74,14 +79,7 @@ class Event(BaseModel):
 
     def get_severity_label(self) -> str:
         """Get severity label for display."""
-        severity_labels = {
-            0: "info",
-            1: "low",
-            2: "medium",
-            3: "high",
-            4: "critical",
-            5: "emergency",
-        }
+        severity_labels = {level: label for label, level in SEVERITY_LEVELS.items()}
         return severity_labels.get(self.severity, "unknown")
 
     def days_until_expiry(self) -> int:
@@ -91,10 +89,62 @@ class Event(BaseModel):
         return max(0, seconds_remaining // SECONDS_PER_DAY)
 
 
+class LazyEvent(Event):
+    """Event read from the database, decoding its `detail` on first access.
+
+    Built from the attributes read only, e.g. the fields of a projection, without validation:
+    the fields left out are unset, and accessing them raises an AttributeError.
+    """
+
+    _load_detail: Callable[[], dict] | None = PrivateAttr(default=None)
+
+    @classmethod
+    def partial(cls, values: dict[str, Any], load_detail: Callable[[], dict] | None = None) -> "LazyEvent":
+        # what `model_construct` does, minus the defaults of the fields that were not read
+        event = cls.__new__(cls)
+        object.__setattr__(event, "__dict__", values)
+        object.__setattr__(event, "__pydantic_fields_set__", set(values))
+        object.__setattr__(event, "__pydantic_extra__", None)
+        object.__setattr__(event, "__pydantic_private__", {"_load_detail": load_detail})
+        return event
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "detail" and self.__pydantic_private__.get("_load_detail"):
+            self._decode_detail()
+            return self.__dict__["detail"]
+        return super().__getattr__(name)
+
+    def _decode_detail(self):
+        if load_detail := self._load_detail:
+            self.__dict__["detail"] = load_detail()
+            self._load_detail = None
+
+    def model_dump(self, **kwargs) -> dict[str, Any]:
+        self._decode_detail()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        self._decode_detail()
+        return super().model_dump_json(**kwargs)
+
+
 # DTOs
 class ListEventsDTO(PaginatedInputDTO):
     start_date: int | None = None
     end_date: int | None = None
+    # Fields to read, e.g. `["source", "published_at"]` or `["source,published_at"]`, all when None
+    fields: list[str] | None = None
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def validate_fields(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = [value]
+        if isinstance(value, list):
+            value = [field.strip() for item in value for field in str(item).split(",") if field.strip()]
+        if value and (unknown := set(value) - Event.model_fields.keys()):
+            raise ValueError(f"Unknown event fields: {', '.join(sorted(unknown))}")
+        return value
 
     @model_validator(mode="after")
     def validate_model(self):
@@ -4,7 +4,9 @@ These models represent log data structures in the domain layer,
 independent of any specific log storage or querying implementation.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from src.common.utils.datetime_utils import current_utc_timestamp
 
 
 class LogEntry(BaseModel):
@@ -23,13 +25,72 @@ class LogEntry(BaseModel):
     log_stream: str | None = None
 
 
+class LogTemplate(BaseModel):
+    """Domain model for a group of log entries sharing the same message template.
+
+    Attributes:
+        template: Message with its variable parts (UUIDs, numbers, hex...) masked
+        count: Number of log entries matching the template
+        samples: A few of the matching log entries
+    """
+
+    template: str
+    count: int
+    samples: list[LogEntry] = []
+
+
 class LogQueryResult(BaseModel):
     """Domain model for log query results.
 
     Attributes:
         log_group_name: Name of the log group that was queried
         logs: List of log entries found in the query
+        templates: Log entries grouped by template, replaces `logs` once clustered
+        account: AWS account of the log group, when scanned through an assumed role
+        region: AWS region of the log group, when scanned through an assumed role
     """
 
     log_group_name: str
+    account: str | None = None
+    region: str | None = None
     logs: list[LogEntry] = []
+    templates: list[LogTemplate] = []
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.logs and not self.templates
+
+
+class LogCheckpoint(BaseModel):
+    """Domain model for the scan progress (high-water mark) of a log group.
+
+    Attributes:
+        log_group_name: Name of the log group
+        scanned_until: Unix timestamp (seconds) up to which the log group has been queried
+        updated_at: Unix timestamp of the last update
+    """
+
+    log_group_name: str
+    scanned_until: int
+    updated_at: int = Field(default_factory=current_utc_timestamp)
+
+
+class LogGroupCache(BaseModel):
+    """Domain model for the log groups discovered for a monitoring tag.
+
+    Attributes:
+        tag_name: Name of the tag the resources were discovered by
+        tag_value: Value of the tag the resources were discovered by
+        log_groups: Log group name of every tagged resource, keyed by resource ARN
+        refreshed_at: Unix timestamp of the last full discovery
+        expired_at: Unix timestamp after which a full discovery is needed
+    """
+
+    tag_name: str
+    tag_value: str
+    log_groups: dict[str, str] = {}
+    refreshed_at: int = Field(default_factory=current_utc_timestamp)
+    expired_at: int
+
+    def is_expired(self) -> bool:
+        return current_utc_timestamp() >= self.expired_at
@@ -0,0 +1,42 @@
+"""Domain models for the notification outbox.
+
+A notification is written along with its event, in the same transaction, and sent
+to Slack later on by a separate sender, so ingesting an event never waits for Slack.
+"""
+
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from src.common.utils.datetime_utils import current_utc_timestamp
+
+
+class NotificationStatus(str, Enum):
+    """Delivery status of a notification."""
+
+    PENDING = "pending"  # Waiting to be sent, or to be retried
+    FAILED = "failed"  # Given up after too many attempts, kept until it expires
+
+
+class Notification(BaseModel):
+    """Domain model for the pending notification of an event (outbox item).
+
+    Attributes:
+        event_id: ID of the event to notify, the message is rendered from the stored event
+        status: Delivery status
+        attempts: Number of failed attempts so far
+        next_attempt_at: Unix timestamp before which the notification is not retried
+        last_error: Error of the last failed attempt
+        created_at: Unix timestamp of the creation
+    """
+
+    event_id: str
+    status: NotificationStatus = NotificationStatus.PENDING
+    attempts: int = 0
+    next_attempt_at: int = Field(default_factory=current_utc_timestamp)
+    last_error: str | None = None
+    created_at: int = Field(default_factory=current_utc_timestamp)
+
+    def is_due(self, now: int | None = None) -> bool:
+        now = now if now is not None else current_utc_timestamp()
+        return self.status == NotificationStatus.PENDING and self.next_attempt_at <= now
@@ -1,10 +1,18 @@
 from .logs import ILogService
 from .notifier import IEventNotifier, IReportNotifier
 from .publisher import IPublisher
-from .repositories import IEventRepository
+from .repositories import (
+    IEventRepository,
+    ILogCheckpointRepository,
+    IMonitoringConfigRepository,
+    INotificationRepository,
+)
 
 __all__ = [
     "IEventRepository",
+    "ILogCheckpointRepository",
+    "IMonitoringConfigRepository",
+    "INotificationRepository",
     "IPublisher",
     "IEventNotifier",
     "IReportNotifier",
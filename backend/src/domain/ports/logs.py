@@ -7,12 +7,15 @@ from src.domain.models.logs import LogQueryResult
 class ILogService(Protocol):
     def list_monitoring_log_groups_by_tag(self, tag_name: str, tag_value: str) -> Iterable[str]: ...
 
+    def refresh_monitoring_log_group(self, resource_arn: str, tag_name: str, tag_value: str) -> None: ...
+
     def query_logs(
         self,
         log_group_names: list[str],
         query_string: str,
         start_time: datetime,
         end_time: datetime,
-        timeout: int = 15,
-        delay: int = 1,
+        deadline: datetime | None = None,
+        chunk_size: int = 10,
+        max_concurrent_queries: int = 1,
     ) -> Iterable[LogQueryResult]: ...
@@ -8,6 +8,8 @@ from src.domain.models import Event
 class IEventNotifier(Protocol):
     def notify(self, event: EventBridgeEvent) -> None: ...
 
+    def notify_digest(self, events: list[EventBridgeEvent]) -> None: ...
+
 
 class IReportNotifier(Protocol):
     def report(self, events: list[Event]) -> None: ...
@@ -1,6 +1,6 @@
-from typing import Protocol
+from typing import List, Protocol
 
-from src.domain.models import Event, EventQueryResult
+from src.domain.models import Event, EventQueryResult, LogCheckpoint, MonitoringConfig, Notification
 from src.domain.models.event import ListEventsDTO
 
 
@@ -11,4 +11,30 @@ class IEventRepository(Protocol):
 
     def create(self, entity: Event) -> None: ...
 
+    def create_many(self, entities: List[Event]) -> None: ...
+
+    def create_many_with_notifications(self, entities: List[Event]) -> tuple[List[str], List[str]]: ...
+
     def delete(self, id: str) -> None: ...
+
+    def delete_range(self, source: str, start_date: int, end_date: int) -> int: ...
+
+
+class ILogCheckpointRepository(Protocol):
+    def list_all(self) -> list[LogCheckpoint]: ...
+
+    def save_many(self, entities: list[LogCheckpoint]) -> None: ...
+
+
+class IMonitoringConfigRepository(Protocol):
+    def get(self) -> MonitoringConfig: ...
+
+    def get_cached(self, max_age: float = 60) -> MonitoringConfig | None: ...
+
+
+class INotificationRepository(Protocol):
+    def list_due(self, limit: int = 100) -> list[Notification]: ...
+
+    def save_many(self, entities: list[Notification]) -> None: ...
+
+    def delete_many(self, event_ids: list[str]) -> None: ...
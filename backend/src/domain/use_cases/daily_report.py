@@ -17,8 +17,9 @@ def daily_report_use_case(event_repo: IEventRepository, notifier: IReportNotifie
     result = event_repo.list(
         ListEventsDTO(
             start_date=int(start_date.timestamp()),
-            end_date=int(end_date.timestamp()),
+            end_date=int(end_date.timestamp()) - 1,  # inclusive, the events of today are not read
             limit=100,
+            fields=["account", "detail_type", "published_at"],  # all the report needs
         )
     )
     logger.debug(f"Fetched {len(result.items)} events for daily report")
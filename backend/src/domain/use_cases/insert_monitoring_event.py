@@ -2,30 +2,102 @@ from aws_lambda_powertools.utilities.data_classes import EventBridgeEvent
 
 from src.common.logger import logger
 from src.common.utils.datetime_utils import datetime_str_to_timestamp
-from src.domain.models import Event
-from src.domain.ports.notifier import IEventNotifier
-from src.domain.ports.repositories import IEventRepository
+from src.common.utils.lru_cache import LRUCache
+from src.common.utils.rule_engine import RuleEngine
+from src.domain.models import Event, MonitoringConfig
+from src.domain.ports.repositories import IEventRepository, IMonitoringConfigRepository
 
 
-def insert_monitoring_event_use_case(event: EventBridgeEvent, event_repo: IEventRepository, notifier: IEventNotifier):
-    """Insert monitoring event use-case.
-    1. Insert the event into the database.
-    2. Notify the event to the subscribers.
+# Outcomes of an event id, as remembered by `inserted_ids`
+INSERTED = "inserted"
+DUPLICATE = "duplicate"
+
+# Severity rules compiled by config version, i.e. the `updated_at` of the config
+compiled_severity_rules: LRUCache[int, RuleEngine] = LRUCache(maxsize=4)
+
+
+def severity_rules(config: MonitoringConfig) -> RuleEngine:
+    """Severity rules of the config, compiled once per config version."""
+    rules = compiled_severity_rules.get(config.updated_at)
+    if rules is None:
+        rules = config.compile_severity_rules()
+        compiled_severity_rules.put(config.updated_at, rules)
+        logger.debug(f"{len(rules)} severity rules compiled for config version {config.updated_at}")
+    return rules
+
+
+def service_name(source: str) -> str:
+    """Service of an event source, e.g. `cloudwatch` for `aws.cloudwatch` and `monitoring.agent.cloudwatch`."""
+    return source.rsplit(".", 1)[-1]
+
+
+def insert_monitoring_events_use_case(
+    events: list[EventBridgeEvent],
+    event_repo: IEventRepository,
+    inserted_ids: LRUCache[str, str] | None = None,
+    config_repo: IMonitoringConfigRepository | None = None,
+) -> list[str]:
+    """Insert monitoring events use-case, idempotent on the EventBridge event id.
+    1. Short-circuit the events whose id is in `inserted_ids` (the ids recently handled by this container),
+       EventBridge and SQS deliver an event at least once.
+    2. Assign the severity of the other events with the severity rules of the monitoring config, if any.
+    3. Insert the events into the database, each along with its notification (transactional outbox).
+       An event already stored is skipped by the conditional write, and notified only once.
+       The notifications are sent by `send_notifications_use_case`, off the ingest path.
+    4. Remember the ids and outcome of the events handled.
+    Returns the ids of the events that could not be inserted, they are to be retried. An event that is
+    invalid or cannot be written fails on its own, the other events of the batch are still inserted.
     """
-    # 1. Insert the event into the database
-    model = Event(
-        id=event.get_id,
-        account=event.account,
-        region=event.region,
-        source=event.source,
-        detail=event.detail,
-        detail_type=event.detail_type,
-        resources=event.resources,
-        published_at=datetime_str_to_timestamp(event.time),
-    )
-    event_repo.create(model)
-    logger.info(f"Event<{model.id}> inserted")
-
-    # 2. Notify the event via the notifier
-    notifier.notify(event)
-    logger.info(f"Sent Event<{model.id}> successfully")
+    # 1. skip the redeliveries seen by this container, without validating nor writing them
+    if inserted_ids is not None:
+        redelivered = {event.get_id for event in events if event.get_id in inserted_ids}
+        if redelivered:
+            logger.info(f"{len(redelivered)} events already handled, skipped: {sorted(redelivered)}")
+            events = [event for event in events if event.get_id not in redelivered]
+        if not events:
+            return []
+
+    # 2. assign the severities
+    rules = None
+    try:
+        if config_repo and (config := config_repo.get_cached()):
+            rules = severity_rules(config)
+    except Exception:
+        logger.exception("Failed to load the severity rules, the events are inserted without severity")
+
+    # 3. insert the events & their notifications, the ids starting with the publication timestamp
+    models, failed_ids = {}, []
+    for event in events:
+        try:
+            published_at = datetime_str_to_timestamp(event.time)
+            models[event.get_id] = Event(
+                id=f"{published_at}-{event.get_id}",
+                account=event.account,
+                region=event.region,
+                source=event.source,
+                detail=event.detail,
+                detail_type=event.detail_type,
+                severity=rules.evaluate(service_name(event.source), event.detail, 0) if rules else 0,
+                resources=event.resources,
+                published_at=published_at,
+            )
+        except Exception:
+            # a malformed event fails alone, instead of the whole batch
+            logger.exception(f"Invalid monitoring event {event.get_id}")
+            failed_ids.append(event.get_id)
+    if not models:
+        return failed_ids
+
+    skipped, failed = event_repo.create_many_with_notifications(list(models.values()))
+    skipped, failed = set(skipped), set(failed)
+    failed_ids.extend(event_id for event_id, model in models.items() if model.id in failed)
+    logger.info(f"{len(models) - len(skipped) - len(failed)} events inserted, {len(skipped)} already inserted")
+    if failed:
+        logger.warning(f"Failed to insert {len(failed)}/{len(models)} events")
+
+    # 4. remember the outcome of the events written or skipped
+    if inserted_ids is not None:
+        for event_id, model in models.items():
+            if model.id not in failed:
+                inserted_ids.put(event_id, DUPLICATE if model.id in skipped else INSERTED)
+    return failed_ids
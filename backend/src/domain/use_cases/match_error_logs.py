@@ -0,0 +1,31 @@
+import re
+from typing import Iterable
+
+from src.common.logger import logger
+from src.domain.models.logs import LogEntry, LogQueryResult
+from src.domain.ports.publisher import IPublisher
+from src.domain.use_cases.query_error_logs import cluster_log_result, publish_log_results
+
+
+def match_error_logs_use_case(
+    log_group_name: str,
+    logs: Iterable[LogEntry],
+    pattern: re.Pattern,
+    publisher: IPublisher,
+    cluster_samples: int = 3,
+    account: str | None = None,
+):
+    """Match error logs use-case, for logs pushed by a subscription filter.
+    1. Keep the logs whose message matches the error pattern, as they are decoded.
+    2. Cluster the matching logs by template and publish them to the message broker,
+       the same way as the logs found by `query_error_logs_use_case`.
+    """
+    # 1. match the logs in process, no Insights query involved
+    matched = [log for log in logs if pattern.search(log.message)]
+    if not matched:
+        return
+
+    # 2. cluster & publish
+    log_result = LogQueryResult(log_group_name=log_group_name, account=account, logs=matched)
+    publish_log_results([cluster_log_result(log_result, max_samples=cluster_samples)], publisher)
+    logger.info(f"Published {len(matched)} error logs of {log_group_name}")
@@ -1,20 +1,37 @@
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import UTC, datetime, timedelta
+from functools import partial
 
-from pydantic import BaseModel, ValidationInfo, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
+from src.common.logger import logger
+from src.common.utils.log_templates import cluster_messages
 from src.common.utils.objects import chunks
+from src.domain.models.logs import LogCheckpoint, LogQueryResult, LogTemplate
 from src.domain.ports.logs import ILogService
 from src.domain.ports.publisher import IPublisher, Message
+from src.domain.ports.repositories import ILogCheckpointRepository
+
+# Results clustered & published together, the publisher packs their messages into as few PutEvents requests
+# as the count and size limits allow. Only bounds how long results wait before being published
+PUBLISH_BATCH_SIZE = 100
+# Resolution of the Insights time bounds
+SECOND = timedelta(seconds=1)
 
 
 class QueryParam(BaseModel):
     query_string: str
     start_time: datetime
     end_time: datetime
-    timeout: int = 15
-    delay: int = 1
+    deadline: datetime | None = None  # queries still running at this time are abandoned
     chunk_size: int = 10
+    max_concurrent_queries: int = Field(default=10, ge=1, le=30)  # CloudWatch Insights concurrent query quota
+    max_catchup_windows: int = Field(default=12, ge=1)  # windows scanned per run for a lagging log group
     filter_tag: dict = {"key": "monitoring", "value": "true"}
+    cluster_samples: int = Field(default=3, ge=1)  # sample log entries published per template
+    cluster_workers: int = Field(default=0, ge=0)  # processes clustering the results, 0 to cluster in-process
 
     @field_validator("query_string", mode="after")
     @classmethod
@@ -32,35 +49,208 @@ class QueryParam(BaseModel):
             raise ValueError("End time must be greater than or equal to start time")
         return value
 
+    @property
+    def window(self) -> timedelta:
+        return self.end_time - self.start_time
+
+    def pending_windows(self, scanned_until: datetime | None) -> list[tuple[datetime, datetime]]:
+        """Time windows of a log group that have not been scanned yet, oldest first.
+
+        Log groups without a checkpoint are scanned from `start_time`, lagging ones resume from
+        their checkpoint, one window at a time, up to `max_catchup_windows` windows. Insights time
+        bounds are inclusive, so a window starts one second after the checkpoint or the previous
+        window, each second being scanned once.
+        """
+        if scanned_until is None:
+            scanned_until = self.start_time
+
+        oldest = self.end_time - self.window * self.max_catchup_windows + SECOND
+        start_time = max(scanned_until + SECOND, oldest)
+        if start_time > scanned_until + SECOND:
+            logger.warning(f"Logs between {scanned_until} and {start_time} are too old to be caught up")
 
-def query_error_logs_use_case(query: QueryParam, log_service: ILogService, publisher: IPublisher):
+        windows = []
+        while start_time <= self.end_time:
+            end_time = min(start_time + self.window - SECOND, self.end_time)
+            windows.append((start_time, end_time))
+            start_time = end_time + SECOND
+        return windows
+
+
+def query_error_logs_use_case(
+    query: QueryParam,
+    log_service: ILogService,
+    publisher: IPublisher,
+    checkpoint_repo: ILogCheckpointRepository,
+):
     """Query error logs use-case.
     1. List out all log groups that have monitoring enabled (by tag).
-    2. Query logs from CloudWatch Logs using the provided parameters.
-    3. Publish the results to the message broker.
+    2. Work out the windows of each log group that have not been scanned yet (from checkpoints).
+    3. Query logs from CloudWatch Logs window by window.
+    4. Cluster the logs of each log group by template and publish them to the message broker.
+    5. Move the checkpoints of the scanned log groups to the end of the window.
     """
     # 1. list out all monitoring log groups
-    log_groups = log_service.list_monitoring_log_groups_by_tag(query.filter_tag["key"], query.filter_tag["value"])
+    log_groups = list(
+        log_service.list_monitoring_log_groups_by_tag(query.filter_tag["key"], query.filter_tag["value"])
+    )
+
+    # 2. group log groups by pending window, so log groups at the same checkpoint share queries
+    checkpoints = {checkpoint.log_group_name: checkpoint.scanned_until for checkpoint in checkpoint_repo.list_all()}
+    windows = defaultdict(list)
+    for log_group in log_groups:
+        scanned_until = checkpoints.get(log_group)
+        if scanned_until is not None:
+            scanned_until = datetime.fromtimestamp(scanned_until, tz=UTC)
+        for window in query.pending_windows(scanned_until):
+            windows[window].append(log_group)
+
+    with ProcessPoolExecutor(query.cluster_workers) if query.cluster_workers else nullcontext() as pool:
+        failed_log_groups = scan_windows(query, windows, log_service, publisher, checkpoint_repo, pool)
+
+    if failed_log_groups:
+        logger.warning(f"{len(failed_log_groups)} log groups could not be scanned, retrying on the next run")
+
+
+def query_error_logs_all_accounts_use_case(
+    query: QueryParam,
+    targets: dict[str, ILogService],
+    publisher: IPublisher,
+    checkpoint_repo: ILogCheckpointRepository,
+    max_workers: int = 8,
+):
+    """Query error logs use-case, for several AWS accounts & regions.
+    1. Load the checkpoints of all targets at once.
+    2. Run the query error logs use-case for every target (`{account}:{region}` -> log service),
+       up to `max_workers` targets at a time, each with its own checkpoints.
+    """
+    # 1. load the checkpoints of all targets
+    checkpoints = checkpoint_repo.list_all()
+
+    # 2. scan the targets side by side, the run takes about as long as the slowest target
+    failed_targets = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                query_error_logs_use_case,
+                query,
+                log_service,
+                publisher,
+                ScopedCheckpointRepository(checkpoint_repo, scope, checkpoints),
+            ): scope
+            for scope, log_service in targets.items()
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception:
+                logger.exception(f"Error occurred while querying error logs of {futures[future]}")
+                failed_targets.append(futures[future])
+
+    if failed_targets:
+        logger.warning(f"{len(failed_targets)}/{len(targets)} targets could not be scanned: {failed_targets}")
+
 
-    for chunk in chunks(log_groups, query.chunk_size):
-        # 2. query error logs from CloudWatch Logs
-        error_logs = log_service.query_logs(
-            chunk,
+class ScopedCheckpointRepository:
+    """Checkpoints of the log groups of a single target, stored as `{scope}:{log_group_name}`."""
+
+    def __init__(self, checkpoint_repo: ILogCheckpointRepository, scope: str, checkpoints: list[LogCheckpoint]):
+        self.checkpoint_repo = checkpoint_repo
+        self.prefix = f"{scope}:"
+        self.checkpoints = [
+            checkpoint.model_copy(update={"log_group_name": checkpoint.log_group_name.removeprefix(self.prefix)})
+            for checkpoint in checkpoints
+            if checkpoint.log_group_name.startswith(self.prefix)
+        ]
+
+    def list_all(self) -> list[LogCheckpoint]:
+        return self.checkpoints
+
+    def save_many(self, entities: list[LogCheckpoint]):
+        self.checkpoint_repo.save_many(
+            [
+                entity.model_copy(update={"log_group_name": f"{self.prefix}{entity.log_group_name}"})
+                for entity in entities
+            ]
+        )
+
+
+def scan_windows(
+    query: QueryParam,
+    windows: dict[tuple[datetime, datetime], list[str]],
+    log_service: ILogService,
+    publisher: IPublisher,
+    checkpoint_repo: ILogCheckpointRepository,
+    pool: ProcessPoolExecutor | None = None,
+) -> set[str]:
+    """Scan the pending windows oldest first, return the log groups that could not be scanned."""
+    cluster = partial(cluster_log_result, max_samples=query.cluster_samples)
+    failed_log_groups = set()
+    for (start_time, end_time), window_log_groups in sorted(windows.items()):
+        # a log group must not skip a window, its checkpoint would jump over unscanned logs
+        window_log_groups = [log_group for log_group in window_log_groups if log_group not in failed_log_groups]
+        if not window_log_groups:
+            continue
+
+        # 3. query error logs from CloudWatch Logs, all chunks are queried concurrently
+        log_results = log_service.query_logs(
+            window_log_groups,
             query_string=query.query_string,
-            start_time=query.start_time,
-            end_time=query.end_time,
-            timeout=query.timeout,
-            delay=query.delay,
+            start_time=start_time,
+            end_time=end_time,
+            deadline=query.deadline,
+            chunk_size=query.chunk_size,
+            max_concurrent_queries=query.max_concurrent_queries,
         )
 
-        # 3. publish the results to the message broker
-        if messages := [
-            Message(
-                source="monitoring.agent.logs",
-                detail_type="Error Log Query",
-                detail=log_result.model_dump_json(),
-                resources=[log_result.log_group_name],
+        # 4. cluster & publish the results to the message broker as they arrive
+        scanned_log_groups = []
+        for batch in chunks(log_results, PUBLISH_BATCH_SIZE):
+            batch = list(pool.map(cluster, batch) if pool else map(cluster, batch))
+            publish_log_results(batch, publisher)
+            scanned_log_groups.extend(log_result.log_group_name for log_result in batch)
+
+        # 5. move the checkpoints forward
+        if scanned_log_groups:
+            checkpoint_repo.save_many(
+                [
+                    LogCheckpoint(log_group_name=log_group, scanned_until=int(end_time.timestamp()))
+                    for log_group in scanned_log_groups
+                ]
             )
-            for log_result in error_logs
-        ]:
-            publisher.publish(messages)
+        failed_log_groups.update(set(window_log_groups) - set(scanned_log_groups))
+    return failed_log_groups
+
+
+def cluster_log_result(log_result: LogQueryResult, max_samples: int = 3) -> LogQueryResult:
+    """Group the logs of a log group by template, each template keeps its count and a few samples."""
+    if not log_result.logs:
+        return log_result
+
+    clusters = cluster_messages([log.message for log in log_result.logs], max_samples=max_samples)
+    templates = [
+        LogTemplate(
+            template=cluster.template,
+            count=cluster.count,
+            samples=[log_result.logs[index] for index in cluster.samples],
+        )
+        for cluster in clusters
+    ]
+    logger.debug(
+        f"Clustered {len(log_result.logs)} logs of {log_result.log_group_name} into {len(templates)} templates"
+    )
+    return log_result.model_copy(update={"logs": [], "templates": templates})
+
+
+def publish_log_results(log_results: list[LogQueryResult], publisher: IPublisher):
+    if messages := [
+        Message(
+            source="monitoring.agent.logs",
+            detail_type="Error Log Query",
+            detail=log_result.model_dump_json(),
+            resources=[log_result.log_group_name],
+        )
+        for log_result in log_results
+        if not log_result.is_empty
+    ]:
+        publisher.publish(messages)
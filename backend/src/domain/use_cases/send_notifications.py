@@ -0,0 +1,140 @@
+from collections import defaultdict
+from datetime import UTC, datetime
+
+from aws_lambda_powertools.utilities.data_classes import EventBridgeEvent
+
+from src.common.exceptions import NotFoundError
+from src.common.logger import logger
+from src.common.utils.circuit_breaker import CircuitBreaker
+from src.common.utils.datetime_utils import current_utc_timestamp
+from src.domain.models import Event, Notification, NotificationStatus
+from src.domain.ports.notifier import IEventNotifier
+from src.domain.ports.repositories import IEventRepository, INotificationRepository
+
+
+def send_notifications_use_case(
+    notification_repo: INotificationRepository,
+    event_repo: IEventRepository,
+    notifier: IEventNotifier,
+    circuit_breaker: CircuitBreaker,
+    batch_size: int = 100,
+    max_attempts: int = 5,
+    retry_delay: int = 30,
+    max_retry_delay: int = 3600,
+    coalesce_threshold: int = 3,
+    digest_interval: int = 0,
+):
+    """Send notifications use-case, drains the notification outbox.
+    1. List the notifications that are due, up to `batch_size`, oldest first, and load their events.
+    2. With a `digest_interval` (seconds), hold the notifications of the events below high priority back
+       until the end of their digest window, the windows being aligned on `digest_interval`.
+       High-priority events are notified right away.
+    3. Group the events by source and account. A group of at least `coalesce_threshold` events, e.g. when
+       the outbox backs up or a digest window ends, is notified as a single digest message, the other
+       events one by one. Messages are sent as long as the circuit breaker lets calls through.
+    4. Delete the notifications that were sent. Reschedule the failed ones with an exponential
+       delay (`retry_delay` doubled on every attempt, up to `max_retry_delay`), and give up on
+       them after `max_attempts` attempts.
+    """
+    # 1. list the due notifications & load their events
+    notifications = sorted(notification_repo.list_due(limit=batch_size), key=lambda n: n.created_at)
+    if not notifications:
+        return
+
+    done, postponed, failed = [], [], []
+    pending: list[tuple[Notification, Event]] = []
+    for notification in notifications:
+        try:
+            pending.append((notification, event_repo.get(notification.event_id)))
+        except NotFoundError:
+            logger.warning(f"Event<{notification.event_id}> not found, dropping its notification")
+            done.append(notification.event_id)
+
+    # 2. buffer the events below high priority
+    if digest_interval:
+        now = current_utc_timestamp()
+        buffered = []
+        for notification, event in pending:
+            window_end = (notification.created_at // digest_interval + 1) * digest_interval
+            if notification.attempts == 0 and not event.is_high_priority() and now < window_end:
+                postponed.append(notification.model_copy(update={"next_attempt_at": window_end}))
+            else:
+                buffered.append((notification, event))
+        pending = buffered
+
+    # 3. notify the events, coalesced by source & account
+    groups: dict[tuple[str, str], list[tuple[Notification, Event]]] = defaultdict(list)
+    for notification, event in pending:
+        groups[(event.source, event.account)].append((notification, event))
+    messages, sent = [], 0
+    for group in groups.values():
+        if coalesce_threshold and len(group) >= coalesce_threshold:
+            messages.append(group)
+        else:
+            messages.extend([item] for item in group)
+
+    for index, message in enumerate(messages):
+        if not circuit_breaker.allow():
+            left = sum(len(message) for message in messages[index:])
+            logger.warning(f"Circuit open, {left} notifications postponed")
+            break
+        try:
+            if len(message) == 1:
+                notifier.notify(to_eventbridge_event(message[0][1]))
+            else:
+                notifier.notify_digest([to_eventbridge_event(event) for _, event in message])
+        except Exception as err:
+            logger.exception(f"Failed to notify Events<{[n.event_id for n, _ in message]}>")
+            circuit_breaker.record_failure()
+            failed.extend(reschedule(n, err, max_attempts, retry_delay, max_retry_delay) for n, _ in message)
+            continue
+        circuit_breaker.record_success()
+        done.extend(n.event_id for n, _ in message)
+        sent += 1
+
+    # 4. clear the outbox
+    if done:
+        notification_repo.delete_many(done)
+    if failed or postponed:
+        notification_repo.save_many(failed + postponed)
+    logger.info(
+        f"Sent {len(done)} notifications in {sent} messages, {len(failed)} failed, "
+        f"{len(postponed)} held back for the digest"
+    )
+
+
+def reschedule(
+    notification: Notification, error: Exception, max_attempts: int, retry_delay: int, max_retry_delay: int
+) -> Notification:
+    attempts = notification.attempts + 1
+    if attempts >= max_attempts:
+        logger.error(f"Giving up on the notification of Event<{notification.event_id}> after {attempts} attempts")
+        status = NotificationStatus.FAILED
+    else:
+        status = NotificationStatus.PENDING
+    delay = min(retry_delay * 2 ** (attempts - 1), max_retry_delay)
+    return notification.model_copy(
+        update={
+            "status": status,
+            "attempts": attempts,
+            "next_attempt_at": current_utc_timestamp() + delay,
+            "last_error": str(error)[:1000],
+        }
+    )
+
+
+def to_eventbridge_event(event: Event) -> EventBridgeEvent:
+    """Rebuild the EventBridge event a stored event was inserted from."""
+    return EventBridgeEvent(
+        {
+            "version": "0",
+            "id": event.id,
+            "detail-type": event.detail_type,
+            "source": event.source,
+            "account": event.account,
+            "time": datetime.fromtimestamp(event.published_at, tz=UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "region": event.region,
+            "resources": event.resources,
+            "detail": event.detail,
+        }
+    )
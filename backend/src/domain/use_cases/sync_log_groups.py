@@ -0,0 +1,11 @@
+from src.common.logger import logger
+from src.domain.ports.logs import ILogService
+
+
+def sync_log_groups_use_case(resource_arns: list[str], filter_tag: dict, log_service: ILogService):
+    """Sync log groups use-case.
+    1. Refresh the cached log group of every created, deleted or (un)tagged resource.
+    """
+    for resource_arn in resource_arns:
+        log_service.refresh_monitoring_log_group(resource_arn, filter_tag["key"], filter_tag["value"])
+    logger.info(f"Synced log groups of {len(resource_arns)} resources")
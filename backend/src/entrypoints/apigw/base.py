@@ -13,7 +13,7 @@ def create_app(cors_allow_origin: str = "*", cors_max_age: int = 3600) -> APIGat
     @app.exception_handler(ValidationError)
     def handle_validation_error(ex: ValidationError):
         body = {
-            "errors": ex.errors(),
+            "errors": ex.errors(include_context=False),  # the context may hold the exception raised
             "message": "Validation Error",
         }
         return Response(
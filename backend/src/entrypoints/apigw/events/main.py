@@ -3,6 +3,7 @@ from typing import Annotated
 from aws_lambda_powertools.event_handler.openapi.params import Query
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
+from src.adapters.claim_check import default_claim_check
 from src.adapters.db.repositories import EventRepository
 from src.common.utils.encoding import json_to_base64
 from src.domain.models.event import ListEventsDTO
@@ -13,7 +14,7 @@ app = create_app(
     cors_allow_origin=CORS_ALLOW_ORIGIN,
     cors_max_age=CORS_MAX_AGE,
 )
-event_repo = EventRepository()
+event_repo = EventRepository(claim_check=default_claim_check())
 
 
 # API Routes
@@ -30,13 +31,16 @@ def list_events(
     limit: Annotated[int, Query] = 50,
     direction: Annotated[str, Query] = "desc",
     cursor: Annotated[str, Query] = None,
+    fields: Annotated[list[str] | None, Query()] = None,
 ):
+    # e.g. ?fields=severity,source,detail_type,published_at for a list view without details
     dto = ListEventsDTO(
         start_date=start_date,
         end_date=end_date,
         limit=limit,
         direction=direction,
         cursor=cursor,
+        fields=fields,
     )
     result = event_repo.list(dto)
     return {
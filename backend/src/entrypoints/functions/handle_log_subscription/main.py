@@ -0,0 +1,46 @@
+import os
+import re
+
+from src.adapters.aws import EventBridgeService
+from src.adapters.aws.data_classes import CwLogsSubscriptionEvent, event_source
+from src.adapters.claim_check import default_claim_check
+from src.adapters.publisher import Publisher
+from src.common.logger import logger
+from src.domain.models.logs import LogEntry
+from src.domain.use_cases.match_error_logs import match_error_logs_use_case
+
+# Constants
+LOG_ERROR_PATTERN = re.compile(os.getenv("LOG_ERROR_PATTERN", r"(?i)(error|fail|exception)"))
+LOG_CLUSTER_SAMPLES = int(os.getenv("LOG_CLUSTER_SAMPLES", 3))  # sample logs published per template
+# Log group of this function (set by the Lambda runtime), its own error logs must not feed back into it
+OWN_LOG_GROUP_NAME = os.getenv("AWS_LAMBDA_LOG_GROUP_NAME")
+
+publisher = Publisher(client=EventBridgeService(), claim_check=default_claim_check())
+
+
+# @logger.inject_lambda_context(log_event=True)
+@event_source(data_class=CwLogsSubscriptionEvent)
+def handler(event: CwLogsSubscriptionEvent, context):
+    try:
+        if event.is_control_message:
+            logger.debug(f"Control message from subscription filters: {event.subscription_filters}")
+            return
+        if event.log_group == OWN_LOG_GROUP_NAME:
+            logger.warning(f"Ignoring the logs of {event.log_group}, the log group must not be subscribed")
+            return
+
+        logs = (
+            LogEntry(
+                timestamp=log_event["timestamp"],
+                message=log_event["message"],
+                log=event.log_group,
+                log_stream=event.log_stream,
+            )
+            for log_event in event.log_events()
+        )
+        match_error_logs_use_case(
+            event.log_group, logs, LOG_ERROR_PATTERN, publisher, LOG_CLUSTER_SAMPLES, account=event.owner
+        )
+    except Exception:
+        logger.exception("Error occurred while matching subscribed error logs")
+        raise
@@ -1,13 +1,20 @@
+import os
+
 from src.adapters.aws.data_classes import EventBridgeEvent, event_source
-from src.adapters.db.repositories import EventRepository
-from src.adapters.notifiers import EventNotifier, SlackClient
-from src.common.constants import MONITORING_WEBHOOK_URL
+from src.adapters.db.repositories import EventRepository, MonitoringConfigRepository
+from src.common.exceptions import UnprocessedError
 from src.common.logger import logger
-from src.domain.event.use_cases import insert_monitoring_event_use_case
+from src.common.utils.lru_cache import LRUCache
+from src.domain.use_cases.insert_monitoring_event import insert_monitoring_events_use_case
+
+# Constants
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", 10000))  # event ids remembered per container
 
 # Initialize services
 event_repo = EventRepository()
-notifier = EventNotifier(client=SlackClient(MONITORING_WEBHOOK_URL))
+config_repo = MonitoringConfigRepository()  # severity rules, read at most once a minute
+# ids of the events handled lately, kept across warm invocations to short-circuit redeliveries
+inserted_ids = LRUCache[str, str](maxsize=IDEMPOTENCY_CACHE_SIZE)
 
 
 # @logger.inject_lambda_context(log_event=True)
@@ -16,7 +23,8 @@ def handler(event: EventBridgeEvent, context):
     logger.debug(event.raw_event)
 
     try:
-        insert_monitoring_event_use_case(event, event_repo, notifier)
+        if insert_monitoring_events_use_case([event], event_repo, inserted_ids, config_repo):
+            raise UnprocessedError(f"Event<{event.get_id}> could not be handled")
     except Exception:
         logger.exception("Error occurred while handling monitoring event")
         raise
@@ -0,0 +1,46 @@
+import os
+from collections import defaultdict
+
+from src.adapters.aws.data_classes import EventBridgeEvent, SQSEvent, event_source
+from src.adapters.db.repositories import EventRepository, MonitoringConfigRepository
+from src.common.logger import logger
+from src.common.utils.lru_cache import LRUCache
+from src.domain.use_cases.insert_monitoring_event import insert_monitoring_events_use_case
+
+# Constants
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", 10000))  # event ids remembered per container
+
+# Initialize services
+event_repo = EventRepository()
+config_repo = MonitoringConfigRepository()  # severity rules, read at most once a minute
+# ids of the events handled lately, kept across warm invocations to short-circuit redeliveries
+inserted_ids = LRUCache[str, str](maxsize=IDEMPOTENCY_CACHE_SIZE)
+
+
+# @logger.inject_lambda_context(log_event=True)
+@event_source(data_class=SQSEvent)
+def handler(event: SQSEvent, context):
+    """Handle the monitoring events buffered in SQS by EventBridge, a batch at a time.
+
+    Only the messages of the events that failed are reported (ReportBatchItemFailures),
+    the rest of the batch is deleted from the queue.
+    """
+    records = list(event.records)
+    events, message_ids, failed_message_ids = [], defaultdict(list), []
+    for record in records:
+        try:
+            monitoring_event = EventBridgeEvent(record.json_body)
+            if monitoring_event.get_id not in message_ids:  # SQS may deliver an event twice
+                events.append(monitoring_event)
+            message_ids[monitoring_event.get_id].append(record.message_id)
+        except Exception:
+            logger.exception(f"Invalid monitoring event in message {record.message_id}")
+            failed_message_ids.append(record.message_id)
+
+    if events:
+        failed_ids = insert_monitoring_events_use_case(events, event_repo, inserted_ids, config_repo)
+        failed_message_ids.extend(message_id for event_id in failed_ids for message_id in message_ids[event_id])
+
+    if failed_message_ids:
+        logger.warning(f"{len(failed_message_ids)}/{len(records)} messages failed, they will be retried")
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_message_ids]}
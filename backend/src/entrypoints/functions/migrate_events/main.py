@@ -0,0 +1,26 @@
+import os
+
+from src.adapters.db.repositories import EventRepository
+from src.common.logger import logger
+
+# Constants
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", 100))  # events moved per batch
+MIGRATION_TIME_MARGIN = 10_000  # milliseconds left to the invocation when no batch is started anymore
+
+# Initialize services
+event_repo = EventRepository()
+
+
+# @logger.inject_lambda_context(log_event=True)
+def handler(event, context):
+    """Move the events of the legacy partition to their day & shard partitions, invoked manually until done."""
+    migrated = 0
+    try:
+        while context.get_remaining_time_in_millis() > MIGRATION_TIME_MARGIN:
+            if not (count := event_repo.migrate_legacy(limit=MIGRATION_BATCH_SIZE)):
+                return {"migrated": migrated, "done": True}
+            migrated += count
+        return {"migrated": migrated, "done": False}
+    except Exception:
+        logger.exception(f"Error occurred while migrating events, {migrated} events migrated")
+        raise
@@ -1,12 +1,21 @@
 import os
 from datetime import UTC, datetime, timedelta
 
-from src.adapters.aws import CloudwatchLogService, ECSService, EventBridgeService, LambdaService
-from src.adapters.logs import LogService
+from src.adapters.aws import CloudwatchLogService, ECSService, EventBridgeService, LambdaService, STSService
+from src.adapters.claim_check import default_claim_check
+from src.adapters.db.repositories import AwsConfigRepository, LogCheckpointRepository, LogGroupCacheRepository
+from src.adapters.logs import InsightsMetrics, LogService
 from src.adapters.publisher import Publisher
+from src.common.constants import MONITORING_TAG_NAME, MONITORING_TAG_VALUE
 from src.common.logger import logger
 from src.common.utils.datetime_utils import round_n_minutes
-from src.domain.use_cases.query_error_logs import QueryParam, query_error_logs_use_case
+from src.domain.models import AwsConfig
+from src.domain.models.config import AwsConfigStatus
+from src.domain.use_cases.query_error_logs import (
+    QueryParam,
+    query_error_logs_all_accounts_use_case,
+    query_error_logs_use_case,
+)
 
 # Constants
 CW_INSIGHTS_QUERY_STRING = os.getenv(
@@ -15,15 +24,72 @@ CW_INSIGHTS_QUERY_STRING = os.getenv(
 )
 CW_INSIGHTS_QUERY_DURATION = int(os.getenv("CW_INSIGHTS_QUERY_DURATION", 300))  # seconds
 CW_LOGS_DELIVERY_LATENCY = int(os.getenv("CW_LOGS_DELIVERY_LATENCY", 15))  # seconds
-CW_INSIGHTS_QUERY_TIMEOUT = int(os.getenv("CW_INSIGHTS_QUERY_TIMEOUT", 15))  # seconds
+CW_INSIGHTS_QUERY_TIMEOUT = int(os.getenv("CW_INSIGHTS_QUERY_TIMEOUT", 15))  # seconds, used without lambda context
+CW_INSIGHTS_DEADLINE_MARGIN = int(os.getenv("CW_INSIGHTS_DEADLINE_MARGIN", 20))  # seconds kept for publishing
 CW_LOG_GROUPS_CHUNK_SIZE = int(os.getenv("CW_LOG_GROUPS_CHUNK_SIZE", 10))  # limit for log groups per query
+CW_INSIGHTS_MAX_CONCURRENT_QUERIES = int(os.getenv("CW_INSIGHTS_MAX_CONCURRENT_QUERIES", 10))  # queries in flight
+CW_INSIGHTS_MAX_CATCHUP_WINDOWS = int(os.getenv("CW_INSIGHTS_MAX_CATCHUP_WINDOWS", 12))  # windows per log group/run
+LOG_CLUSTER_SAMPLES = int(os.getenv("LOG_CLUSTER_SAMPLES", 3))  # sample logs published per template
+LOG_CLUSTER_WORKERS = int(os.getenv("LOG_CLUSTER_WORKERS", 0))  # clustering processes, 0 to cluster in-process
+LOG_GROUPS_CACHE_TTL = int(os.getenv("LOG_GROUPS_CACHE_TTL", 3600))  # seconds between full discoveries
+SCAN_ALL_ACCOUNTS = os.getenv("SCAN_ALL_ACCOUNTS", "false").lower() == "true"  # scan every active AwsConfig
+SCAN_MAX_WORKERS = int(os.getenv("SCAN_MAX_WORKERS", 8))  # accounts/regions scanned at the same time
 
+insights_metrics = InsightsMetrics()
 log_service = LogService(
     cloudwatch_log_service=CloudwatchLogService(),
     lambda_service=LambdaService(),
     ecs_service=ECSService(),
+    cache_repo=LogGroupCacheRepository(),
+    cache_ttl=LOG_GROUPS_CACHE_TTL,
+    metrics=insights_metrics,
 )
-publisher = Publisher(client=EventBridgeService())
+publisher = Publisher(client=EventBridgeService(), claim_check=default_claim_check())
+checkpoint_repo = LogCheckpointRepository()
+aws_config_repo = AwsConfigRepository()
+sts_service = STSService()
+
+
+def scan_target_scope(config: AwsConfig) -> str:
+    return f"{config.account_id}:{config.region}"
+
+
+def get_log_service(config: AwsConfig) -> LogService:
+    """Log service of an account & region, through the role of the config when set.
+
+    Sessions and clients are cached, so warm invocations reuse the assumed-role credentials.
+    The discovery cache of each account & region is kept apart from the others.
+    """
+    session = sts_service.assume_role_session(config.role_arn, config.region) if config.role_arn else None
+    return LogService(
+        cloudwatch_log_service=CloudwatchLogService(region=config.region, session=session),
+        lambda_service=LambdaService(region=config.region, session=session),
+        ecs_service=ECSService(region=config.region, session=session),
+        cache_repo=LogGroupCacheRepository(scope=scan_target_scope(config)),
+        cache_ttl=LOG_GROUPS_CACHE_TTL,
+        account=config.account_id,
+        region=config.region,
+        metrics=insights_metrics,
+    )
+
+
+def get_scan_targets() -> dict[str, LogService]:
+    """Log services of every active AWS configuration, by `{account}:{region}`."""
+    aws_config_repo.migrate_legacy()
+    return {
+        scan_target_scope(config): get_log_service(config)
+        for config in aws_config_repo.list_all()
+        if config.is_active and config.status == AwsConfigStatus.ACTIVE
+    }
+
+
+def get_deadline(context) -> datetime:
+    """Queries may run until shortly before the invocation times out."""
+    now = datetime.now(UTC)
+    if context is None:
+        return now + timedelta(seconds=CW_INSIGHTS_QUERY_TIMEOUT)
+    remaining = timedelta(milliseconds=context.get_remaining_time_in_millis())
+    return now + max(remaining - timedelta(seconds=CW_INSIGHTS_DEADLINE_MARGIN), timedelta(0))
 
 
 # @logger.inject_lambda_context(log_event=True)
@@ -35,10 +101,21 @@ def handler(event, context):
             query_string=CW_INSIGHTS_QUERY_STRING,
             start_time=start_time,
             end_time=end_time,
-            timeout=CW_INSIGHTS_QUERY_TIMEOUT,
+            deadline=get_deadline(context),
             chunk_size=CW_LOG_GROUPS_CHUNK_SIZE,
+            max_concurrent_queries=CW_INSIGHTS_MAX_CONCURRENT_QUERIES,
+            max_catchup_windows=CW_INSIGHTS_MAX_CATCHUP_WINDOWS,
+            filter_tag={"key": MONITORING_TAG_NAME, "value": MONITORING_TAG_VALUE},
+            cluster_samples=LOG_CLUSTER_SAMPLES,
+            cluster_workers=LOG_CLUSTER_WORKERS,
         )
-        query_error_logs_use_case(query, log_service, publisher)
+        if SCAN_ALL_ACCOUNTS:
+            targets = get_scan_targets()
+            query_error_logs_all_accounts_use_case(query, targets, publisher, checkpoint_repo, SCAN_MAX_WORKERS)
+        else:
+            query_error_logs_use_case(query, log_service, publisher, checkpoint_repo)
     except Exception:
         logger.exception("Error occurred while querying error logs")
         raise
+    finally:
+        insights_metrics.flush_summary()
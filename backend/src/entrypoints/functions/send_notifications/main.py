@@ -0,0 +1,46 @@
+import os
+
+from src.adapters.claim_check import default_claim_check
+from src.adapters.db.repositories import EventRepository, NotificationRepository
+from src.adapters.notifiers import EventNotifier, SlackClient
+from src.common.constants import MONITORING_WEBHOOK_URL
+from src.common.logger import logger
+from src.common.utils.circuit_breaker import CircuitBreaker
+from src.domain.use_cases.send_notifications import send_notifications_use_case
+
+# Constants
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", 100))  # notifications sent per invocation
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", 5))  # attempts before giving up
+NOTIFICATION_RETRY_DELAY = int(os.getenv("NOTIFICATION_RETRY_DELAY", 30))  # seconds, doubled on every attempt
+NOTIFICATION_COALESCE_THRESHOLD = int(os.getenv("NOTIFICATION_COALESCE_THRESHOLD", 3))  # events per digest, 0: off
+NOTIFICATION_DIGEST_INTERVAL = int(os.getenv("NOTIFICATION_DIGEST_INTERVAL", 0))  # seconds, 0: no low-severity digest
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))  # consecutive failures opening it
+CIRCUIT_RESET_TIMEOUT = int(os.getenv("CIRCUIT_RESET_TIMEOUT", 60))  # seconds before a trial call
+
+# Initialize services
+claim_check = default_claim_check()
+event_repo = EventRepository(claim_check=claim_check)
+notification_repo = NotificationRepository()
+notifier = EventNotifier(client=SlackClient(MONITORING_WEBHOOK_URL), claim_check=claim_check)
+# kept across warm invocations, the function runs one invocation at a time
+circuit_breaker = CircuitBreaker(failure_threshold=CIRCUIT_FAILURE_THRESHOLD, reset_timeout=CIRCUIT_RESET_TIMEOUT)
+
+
+# @logger.inject_lambda_context(log_event=True)
+def handler(event, context):
+    """Drain the notification outbox, woken up by new notifications (DynamoDB stream) and by a schedule."""
+    try:
+        send_notifications_use_case(
+            notification_repo,
+            event_repo,
+            notifier,
+            circuit_breaker,
+            batch_size=NOTIFICATION_BATCH_SIZE,
+            max_attempts=NOTIFICATION_MAX_ATTEMPTS,
+            retry_delay=NOTIFICATION_RETRY_DELAY,
+            coalesce_threshold=NOTIFICATION_COALESCE_THRESHOLD,
+            digest_interval=NOTIFICATION_DIGEST_INTERVAL,
+        )
+    except Exception:
+        logger.exception("Error occurred while sending notifications")
+        raise
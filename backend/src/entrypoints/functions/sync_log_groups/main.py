@@ -0,0 +1,33 @@
+import os
+
+from src.adapters.aws import CloudwatchLogService, ECSService, LambdaService
+from src.adapters.aws.data_classes import ResourceChangeEvent, event_source
+from src.adapters.db.repositories import LogGroupCacheRepository
+from src.adapters.logs import LogService
+from src.common.constants import MONITORING_TAG_NAME, MONITORING_TAG_VALUE
+from src.common.logger import logger
+from src.domain.use_cases.sync_log_groups import sync_log_groups_use_case
+
+# Constants
+LOG_GROUPS_CACHE_TTL = int(os.getenv("LOG_GROUPS_CACHE_TTL", 3600))  # seconds
+
+log_service = LogService(
+    cloudwatch_log_service=CloudwatchLogService(),
+    lambda_service=LambdaService(),
+    ecs_service=ECSService(),
+    cache_repo=LogGroupCacheRepository(),
+    cache_ttl=LOG_GROUPS_CACHE_TTL,
+)
+
+
+# @logger.inject_lambda_context(log_event=True)
+@event_source(data_class=ResourceChangeEvent)
+def handler(event: ResourceChangeEvent, context):
+    logger.debug(event.raw_event)
+
+    try:
+        filter_tag = {"key": MONITORING_TAG_NAME, "value": MONITORING_TAG_VALUE}
+        sync_log_groups_use_case(event.resource_arns, filter_tag, log_service)
+    except Exception:
+        logger.exception("Error occurred while syncing log groups")
+        raise
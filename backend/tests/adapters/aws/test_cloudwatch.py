@@ -0,0 +1,130 @@
+import time
+
+from src.adapters.aws.cloudwatch import CloudwatchLogService, InsightsQuery
+from tests.mock import mock_logs_client
+
+
+def test_failed_query_is_not_yielded(monkeypatch):
+    service = CloudwatchLogService()
+    monkeypatch.setattr(service, "client", mock_logs_client({"query-complete": "Complete", "query-failed": "Failed"}))
+    queries = [
+        InsightsQuery(["/aws/lambda/complete"], "fields @message", 1735689600, 1735693200),
+        InsightsQuery(["/aws/lambda/failed"], "fields @message", 1735689600, 1735693200),
+    ]
+
+    results = list(service.query_logs_concurrently(queries, max_concurrent_queries=2, initial_delay=0))
+
+    # the log groups of the failed query are left unscanned, so that they keep their checkpoint
+    assert [(query.log_group_names, len(rows)) for query, rows in results] == [(["/aws/lambda/complete"], 1)]
+
+
+def test_split_query_time_range_without_overlap():
+    query = InsightsQuery(["/aws/lambda/noisy"], "fields @message", 1735689600, 1735689607)
+
+    seconds, queries = [], [query]
+    while queries:
+        query = queries.pop()
+        if sub_queries := query.split():
+            first, second = sub_queries
+            assert (first.start_time, second.end_time) == (query.start_time, query.end_time)
+            assert second.start_time == first.end_time + 1
+            queries.extend(sub_queries)
+        else:
+            seconds.append(query.start_time)
+
+    # split down to single seconds, each read by one query only
+    assert sorted(seconds) == list(range(1735689600, 1735689608))
+
+
+def test_queries_abandoned_at_deadline(monkeypatch):
+    service = CloudwatchLogService()
+    client = mock_logs_client({"query-slow": "Running", "query-next": "Running"})
+    monkeypatch.setattr(service, "client", client)
+    queries = [
+        InsightsQuery(["/aws/lambda/slow"], "fields @message", 1735689600, 1735693200),
+        InsightsQuery(["/aws/lambda/next"], "fields @message", 1735689600, 1735693200),
+    ]
+    statistics = []
+
+    results = service.query_logs_concurrently(
+        queries,
+        max_concurrent_queries=1,
+        deadline=time.time() + 0.2,
+        initial_delay=0.05,
+        max_delay=0.05,
+        on_statistics=statistics.append,
+    )
+
+    # the running query is stopped, the pending one is never started, and neither is yielded
+    assert list(results) == []
+    client.stop_query.assert_called_once_with(queryId="query-slow")
+    assert client.start_query.call_count == 1
+    assert [(item.query_id, item.status) for item in statistics] == [("query-slow", "Abandoned")]
+
+
+class InsightsClient:
+    """A CloudWatch Logs client holding `rows` (log group -> timestamps), queries complete on their first poll."""
+
+    def __init__(self, rows: dict[str, list[int]]):
+        self.rows = rows
+        self.queries = {}
+        self.exceptions = type("Exceptions", (), {"LimitExceededException": type("LimitExceeded", (Exception,), {})})
+
+    def start_query(self, logGroupNames, queryString, startTime, endTime):
+        query_id = f"query-{len(self.queries)}"
+        self.queries[query_id] = (logGroupNames, startTime, endTime, InsightsQuery([], queryString, 0, 0).limit)
+        return {"queryId": query_id}
+
+    def get_query_results(self, queryId):
+        log_group_names, start_time, end_time, limit = self.queries[queryId]
+        results = [
+            [{"field": "@log", "value": log_group_name}, {"field": "@timestamp", "value": str(timestamp)}]
+            for log_group_name in log_group_names
+            for timestamp in self.rows[log_group_name]
+            if start_time <= timestamp <= end_time
+        ]
+        return {"status": "Complete", "results": results[:limit]}
+
+
+def test_noisy_log_group_split_out_of_its_chunk(monkeypatch):
+    start_time = 1735689600
+    rows = {f"/aws/lambda/quiet-{index}": [start_time + index] for index in range(9)}
+    rows["/aws/lambda/noisy"] = [start_time + second for second in range(80)]
+    client = InsightsClient(rows)
+    service = CloudwatchLogService()
+    monkeypatch.setattr(service, "client", client)
+    query = InsightsQuery(list(rows), "fields @message | limit 10", start_time, start_time + 299)
+    statistics = []
+
+    results = list(
+        service.query_logs_concurrently(
+            [query], max_concurrent_queries=4, initial_delay=0, on_statistics=statistics.append
+        )
+    )
+
+    # the chunk is split down to the noisy log group, whose time range is then bisected on its own budget
+    [(result_query, result_rows)] = results
+    assert result_query is query
+    merged = sorted((row[0]["value"], int(row[1]["value"])) for row in result_rows)
+    expected = sorted((log_group_name, timestamp) for log_group_name in rows for timestamp in rows[log_group_name])
+    assert merged == expected
+    assert max(item.depth for item in statistics) > 6
+    assert not any(item.truncated for item in statistics)
+
+
+def test_truncated_query_flagged_in_statistics(monkeypatch):
+    start_time = 1735689600
+    client = InsightsClient({"/aws/lambda/noisy": [start_time] * 20})
+    service = CloudwatchLogService()
+    monkeypatch.setattr(service, "client", client)
+    query = InsightsQuery(["/aws/lambda/noisy"], "fields @message | limit 10", start_time, start_time + 299)
+    statistics = []
+
+    [(_, result_rows)] = service.query_logs_concurrently(
+        [query], initial_delay=0, max_time_split_depth=2, on_statistics=statistics.append
+    )
+
+    # the time range is bisected twice only, the rows of its first quarter are kept but flagged as truncated
+    assert len(result_rows) == 10
+    truncated = [item.query for item in statistics if item.truncated]
+    assert [(query.start_time, query.end_time) for query in truncated] == [(start_time, start_time + 74)]
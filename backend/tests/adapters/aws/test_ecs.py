@@ -0,0 +1,50 @@
+import pytest
+from botocore.stub import Stubber
+
+from src.adapters.aws import ECSService
+from src.adapters.aws.ecs import DESCRIBE_CLUSTERS_MAX
+from src.common.constants import AWS_MAX_ATTEMPTS
+from src.common.exceptions import InternalServerError
+
+CLUSTER_ARN = "arn:aws:ecs:us-east-1:000000000000:cluster/{}"
+
+
+def test_adaptive_retries():
+    config = ECSService().client.meta.config
+
+    # botocore counts the first attempt along with the retries
+    assert config.retries == {"total_max_attempts": AWS_MAX_ATTEMPTS + 1, "mode": "adaptive"}
+
+
+def test_list_clusters_describes_each_page():
+    service = ECSService()
+    include = ["TAGS", "CONFIGURATIONS"]
+
+    with Stubber(service.client) as stubber:
+        # one describe_clusters call per page of cluster ARNs
+        for page, (names, next_token) in enumerate([(["a", "b"], "page-2"), (["c"], None)]):
+            arns = [CLUSTER_ARN.format(name) for name in names]
+            response, params = {"clusterArns": arns}, {"maxResults": DESCRIBE_CLUSTERS_MAX}
+            if next_token:
+                response["nextToken"] = next_token
+            if page:
+                params["nextToken"] = "page-2"
+            stubber.add_response("list_clusters", response, params)
+            stubber.add_response(
+                "describe_clusters",
+                {"clusters": [{"clusterArn": arn} for arn in arns]},
+                {"clusters": arns, "include": include},
+            )
+        clusters = list(service.list_clusters())
+        stubber.assert_no_pending_responses()
+
+    assert [cluster["clusterArn"] for cluster in clusters] == [CLUSTER_ARN.format(name) for name in "abc"]
+
+
+def test_list_clusters_error():
+    service = ECSService()
+
+    with Stubber(service.client) as stubber:
+        stubber.add_client_error("list_clusters", "ServerException")
+        with pytest.raises(InternalServerError):
+            list(service.list_clusters())
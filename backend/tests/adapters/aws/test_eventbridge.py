@@ -0,0 +1,110 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.adapters.aws import eventbridge
+from src.adapters.aws.eventbridge import PUT_EVENTS_MAX_SIZE, EventBridgeService, entry_size, pack_entries
+from src.common.exceptions import UnprocessedError
+
+
+def make_entry(name: str, size: int = 100) -> dict:
+    """An entry of `size` bytes as counted by PutEvents."""
+    source, detail_type = "monitoring", name
+    return {"Source": source, "DetailType": detail_type, "Detail": "x" * (size - len(source) - len(detail_type))}
+
+
+def test_entry_size():
+    entry = {**make_entry("event", 100), "Resources": ["arn:1"], "Time": "2025-01-01T00:00:00Z"}
+
+    assert entry_size(entry) == 100 + 5 + 14
+
+
+def test_pack_entries_by_count():
+    entries = [make_entry(f"event-{index:02}") for index in range(25)]
+
+    batches, oversized = pack_entries(entries)
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert sorted(entry["DetailType"] for batch in batches for entry in batch) == sorted(
+        entry["DetailType"] for entry in entries
+    )
+    assert oversized == []
+
+
+def test_pack_entries_by_size():
+    # 3 entries of 100 KB cannot share a request, the small ones fill the gaps
+    large = [make_entry(f"large-{index}", 100 * 1024) for index in range(3)]
+    small = [make_entry(f"small-{index}", 10 * 1024) for index in range(6)]
+
+    batches, oversized = pack_entries(small + large)
+
+    assert len(batches) == 2
+    for batch in batches:
+        assert len(batch) <= 10
+        assert sum(entry_size(entry) for entry in batch) <= PUT_EVENTS_MAX_SIZE
+    assert sum(len(batch) for batch in batches) == 9
+    assert oversized == []
+
+
+def test_pack_entries_oversized():
+    too_large = make_entry("too-large", PUT_EVENTS_MAX_SIZE + 1)
+
+    batches, oversized = pack_entries([make_entry("event"), too_large])
+
+    assert [[entry["DetailType"] for entry in batch] for batch in batches] == [["event"]]
+    assert oversized == [too_large]
+
+
+def put_events_response(*error_codes: str | None) -> dict:
+    return {
+        "FailedEntryCount": sum(error_code is not None for error_code in error_codes),
+        "Entries": [{"ErrorCode": error_code} if error_code else {"EventId": "1"} for error_code in error_codes],
+    }
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = EventBridgeService()
+    monkeypatch.setattr(service, "client", MagicMock())
+    monkeypatch.setattr(eventbridge.time, "sleep", lambda seconds: None)
+    return service
+
+
+def test_put_batch_resends_failed_entries_only(service):
+    entries = [make_entry(name) for name in ("ok", "throttled", "malformed")]
+    service.client.put_events.side_effect = [
+        put_events_response(None, "ThrottlingException", "MalformedDetail"),
+        put_events_response(None),
+    ]
+
+    errors = service._put_batch(entries, max_attempts=3)
+
+    # the malformed entry is rejected for good, only the throttled one is resent
+    sent = [
+        [entry["DetailType"] for entry in call.kwargs["Entries"]] for call in service.client.put_events.call_args_list
+    ]
+    assert sent == [["ok", "throttled", "malformed"], ["throttled"]]
+    assert errors == [{"ErrorCode": "MalformedDetail", "ErrorMessage": None}]
+
+
+def test_put_batch_gives_up_after_max_attempts(service):
+    service.client.put_events.return_value = put_events_response("InternalFailure")
+
+    errors = service._put_batch([make_entry("event")], max_attempts=3)
+
+    assert service.client.put_events.call_count == 3
+    assert errors == [{"ErrorCode": "InternalFailure", "ErrorMessage": None}]
+
+
+def test_put_events_raises_on_failures(service):
+    service.client.put_events.side_effect = lambda Entries: put_events_response(
+        *("MalformedDetail" if entry["DetailType"] == "malformed" else None for entry in Entries)
+    )
+
+    with pytest.raises(UnprocessedError, match="Failed to publish 2/3 events"):
+        service.put_events(
+            [make_entry("ok"), make_entry("malformed"), make_entry("too-large", PUT_EVENTS_MAX_SIZE + 1)]
+        )
+
+    # the oversized entry is never sent
+    assert service.client.put_events.call_count == 1
@@ -0,0 +1,38 @@
+from botocore.stub import Stubber
+
+from src.adapters.aws import LambdaService
+from src.adapters.aws.lambda_function import LIST_FUNCTIONS_MAX
+from src.common.constants import AWS_MAX_ATTEMPTS
+
+FUNCTION_ARN = "arn:aws:lambda:us-east-1:000000000000:function:{}"
+
+
+def test_adaptive_retries():
+    config = LambdaService().client.meta.config
+
+    # botocore counts the first attempt along with the retries
+    assert config.retries == {"total_max_attempts": AWS_MAX_ATTEMPTS + 1, "mode": "adaptive"}
+
+
+def test_list_functions_follows_pages(monkeypatch):
+    service = LambdaService()
+    monkeypatch.setattr(service.tagging_service, "get_resource_tags", lambda *args: {})
+
+    with Stubber(service.client) as stubber:
+        stubber.add_response(
+            "list_functions",
+            {
+                "Functions": [{"FunctionName": "first", "FunctionArn": FUNCTION_ARN.format("first")}],
+                "NextMarker": "page-2",
+            },
+            {"MaxItems": LIST_FUNCTIONS_MAX},
+        )
+        stubber.add_response(
+            "list_functions",
+            {"Functions": [{"FunctionName": "second", "FunctionArn": FUNCTION_ARN.format("second")}]},
+            {"MaxItems": LIST_FUNCTIONS_MAX, "Marker": "page-2"},
+        )
+        functions = list(service.list_functions())
+        stubber.assert_no_pending_responses()
+
+    assert [function["FunctionName"] for function in functions] == ["first", "second"]
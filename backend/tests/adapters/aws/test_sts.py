@@ -0,0 +1,35 @@
+from datetime import UTC, datetime, timedelta
+
+from botocore.stub import Stubber
+
+from src.adapters.aws import STSService
+
+ROLE_ARN = "arn:aws:iam::111111111111:role/monitoring-scanner"
+
+
+def test_assume_role_session():
+    service = STSService()
+    credentials = {
+        "AccessKeyId": "ASIAEXAMPLEEXAMPLE01",
+        "SecretAccessKey": "secret",
+        "SessionToken": "token",
+        "Expiration": datetime.now(UTC) + timedelta(hours=1),
+    }
+
+    with Stubber(service.client) as stubber:
+        session = service.assume_role_session(ROLE_ARN, "eu-west-1")
+        # the role is only assumed once the credentials are used
+        stubber.assert_no_pending_responses()
+        stubber.add_response(
+            "assume_role",
+            {"Credentials": credentials},
+            {"RoleArn": ROLE_ARN, "RoleSessionName": "monitoring-scanner", "DurationSeconds": 3600},
+        )
+        frozen = session.get_credentials().get_frozen_credentials()
+        stubber.assert_no_pending_responses()
+
+    assert (frozen.access_key, frozen.secret_key, frozen.token) == ("ASIAEXAMPLEEXAMPLE01", "secret", "token")
+    assert session.region_name == "eu-west-1"
+    # sessions are cached per role & region
+    assert service.assume_role_session(ROLE_ARN, "eu-west-1") is session
+    assert service.assume_role_session(ROLE_ARN, "us-east-1") is not session
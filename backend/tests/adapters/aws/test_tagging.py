@@ -0,0 +1,131 @@
+from unittest.mock import MagicMock
+
+from src.adapters.aws import CloudwatchLogService, ECSService, LambdaService, ResourceTaggingService
+from src.adapters.logs import LogService
+
+FUNCTION_ARN = "arn:aws:lambda:us-east-1:000000000000:function:{}"
+CLUSTER_ARN = "arn:aws:ecs:us-east-1:000000000000:cluster/{}"
+
+
+def mock_tagging_client(pages: list[list[tuple[str, dict[str, str]]]]) -> MagicMock:
+    """A Resource Groups Tagging API client returning `pages` of (ARN, tags)."""
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {
+            "ResourceTagMappingList": [
+                {"ResourceARN": arn, "Tags": [{"Key": key, "Value": value} for key, value in tags.items()]}
+                for arn, tags in page
+            ]
+        }
+        for page in pages
+    ]
+    return client
+
+
+def mock_lambda_client(function_names: list[str]) -> MagicMock:
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {
+            "Functions": [
+                {
+                    "FunctionName": name,
+                    "FunctionArn": FUNCTION_ARN.format(name),
+                    "LoggingConfig": {"LogGroup": f"/aws/lambda/{name}"},
+                }
+                for name in function_names
+            ]
+        }
+    ]
+    return client
+
+
+def mock_ecs_client(clusters: dict[str, dict[str, str]]) -> MagicMock:
+    """An ECS client listing the given clusters, by name with their tags."""
+    client = MagicMock()
+    client.get_paginator.return_value.paginate.return_value = [
+        {"clusterArns": [CLUSTER_ARN.format(name) for name in clusters]}
+    ]
+    client.describe_clusters.return_value = {
+        "clusters": [
+            {
+                "clusterArn": CLUSTER_ARN.format(name),
+                "tags": [{"key": key, "value": value} for key, value in tags.items()],
+                "configuration": {
+                    "executeCommandConfiguration": {"logConfiguration": {"cloudWatchLogGroupName": f"/ecs/{name}"}}
+                },
+            }
+            for name, tags in clusters.items()
+        ]
+    }
+    return client
+
+
+def test_get_resource_tags_across_pages(monkeypatch):
+    service = ResourceTaggingService()
+    client = mock_tagging_client(
+        [[(FUNCTION_ARN.format("api"), {"monitoring": "true"})], [(FUNCTION_ARN.format("worker"), {"team": "a"})]]
+    )
+    monkeypatch.setattr(service, "client", client)
+
+    tags = service.get_resource_tags(["lambda:function"], {"monitoring": "true"})
+
+    client.get_paginator.assert_called_once_with("get_resources")
+    client.get_paginator.return_value.paginate.assert_called_once_with(
+        ResourceTypeFilters=["lambda:function"], TagFilters=[{"Key": "monitoring", "Values": ["true"]}]
+    )
+    assert tags == {FUNCTION_ARN.format("api"): {"monitoring": "true"}, FUNCTION_ARN.format("worker"): {"team": "a"}}
+
+
+def test_list_functions_joins_tags(monkeypatch):
+    service = LambdaService()
+    monkeypatch.setattr(service, "client", mock_lambda_client(["api", "untagged"]))
+    tagging_client = mock_tagging_client([[(FUNCTION_ARN.format("api"), {"monitoring": "true"})]])
+    monkeypatch.setattr(service.tagging_service, "client", tagging_client)
+
+    functions = list(service.list_functions())
+
+    # without filters, every function is listed, the untagged ones with no tags
+    assert [(function["FunctionName"], function["Tags"]) for function in functions] == [
+        ("api", {"monitoring": "true"}),
+        ("untagged", {}),
+    ]
+
+
+def test_list_functions_with_tag_filters(monkeypatch):
+    service = LambdaService()
+    monkeypatch.setattr(service, "client", mock_lambda_client(["api", "untagged"]))
+    tagging_client = mock_tagging_client([[(FUNCTION_ARN.format("api"), {"monitoring": "true"})]])
+    monkeypatch.setattr(service.tagging_service, "client", tagging_client)
+
+    functions = list(service.list_functions({"monitoring": "true"}))
+
+    assert [function["FunctionName"] for function in functions] == ["api"]
+
+
+def test_list_functions_without_tagged_resources(monkeypatch):
+    service = LambdaService()
+    client = mock_lambda_client(["api"])
+    monkeypatch.setattr(service, "client", client)
+    monkeypatch.setattr(service.tagging_service, "client", mock_tagging_client([]))
+
+    assert list(service.list_functions({"monitoring": "true"})) == []
+    # no function can match the filters, they are not listed at all
+    client.get_paginator.assert_not_called()
+
+
+def test_discover_log_groups_of_tagged_functions_and_clusters(monkeypatch):
+    lambda_service, ecs_service = LambdaService(), ECSService()
+    monkeypatch.setattr(lambda_service, "client", mock_lambda_client(["api", "worker"]))
+    tagging_client = mock_tagging_client([[(FUNCTION_ARN.format("api"), {"monitoring": "true"})]])
+    monkeypatch.setattr(lambda_service.tagging_service, "client", tagging_client)
+    ecs_client = mock_ecs_client({"web": {"monitoring": "true"}, "batch": {"monitoring": "false"}})
+    monkeypatch.setattr(ecs_service, "client", ecs_client)
+    log_service = LogService(CloudwatchLogService(), lambda_service, ecs_service)
+
+    log_groups = log_service.discover_log_groups("monitoring", "true")
+
+    assert log_groups == {FUNCTION_ARN.format("api"): "/aws/lambda/api", CLUSTER_ARN.format("web"): "/ecs/web"}
+    # the tags of the clusters come along with their description
+    ecs_client.describe_clusters.assert_called_once_with(
+        clusters=[CLUSTER_ARN.format("web"), CLUSTER_ARN.format("batch")], include=["TAGS", "CONFIGURATIONS"]
+    )
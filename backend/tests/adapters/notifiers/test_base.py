@@ -0,0 +1,107 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+from requests import HTTPError, Response
+
+from src.adapters.notifiers.base import Message, SlackClient, pooled_session
+
+WEBHOOK_URL = "https://hooks.slack.com/services/T000/B000/XXXX"
+
+
+def make_response(status_code: int, retry_after: str | None = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.url = WEBHOOK_URL
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+@pytest.fixture
+def client():
+    client = SlackClient(WEBHOOK_URL, max_attempts=3, max_retry_after=30)
+    client.bucket = MagicMock()
+    client.session = MagicMock()
+    return client
+
+
+def test_throttled_message_resent_after_retry_after(client):
+    client.session.post.side_effect = [make_response(429, "2"), make_response(200)]
+
+    client.send(Message(body="Alarm"))
+
+    # the whole webhook is held back for the delay, then the message is sent again through the bucket
+    assert client.session.post.call_count == 2
+    client.bucket.pause.assert_called_once_with(2.0)
+    assert client.bucket.acquire.call_count == 2
+
+
+def test_throttled_message_gives_up_after_max_attempts(client):
+    client.session.post.return_value = make_response(429)
+
+    with pytest.raises(HTTPError):
+        client.send(Message(body="Alarm"))
+
+    assert client.session.post.call_count == 3
+    assert client.bucket.pause.call_count == 3
+
+
+def test_long_retry_after_not_waited(client):
+    client.session.post.return_value = make_response(429, "120")
+
+    with pytest.raises(HTTPError):
+        client.send(Message(body="Alarm"))
+
+    # a delay above max_retry_after fails the message, its notification is rescheduled instead
+    client.session.post.assert_called_once()
+    client.bucket.pause.assert_called_once_with(120.0)
+
+
+def test_pooled_session():
+    session = pooled_session(pool_size=8, max_retries=2, backoff_factor=0.1)
+
+    adapter = session.get_adapter(WEBHOOK_URL)
+    assert adapter is session.get_adapter("http://localhost:4566")
+    assert adapter._pool_maxsize == 8
+    retry = adapter.max_retries
+    assert (retry.total, retry.connect, retry.status, retry.backoff_factor) == (2, 2, 2, 0.1)
+    # server errors are retried, a read timeout is not: the message may have been posted
+    assert retry.read == 0
+    assert set(retry.status_forcelist) == {500, 502, 503, 504}
+    assert "POST" in retry.allowed_methods
+    assert not retry.raise_on_status
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    client_ports: list[int] = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.client_ports.append(self.client_address[1])
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_client_reuses_its_connection():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = SlackClient(f"http://127.0.0.1:{server.server_address[1]}/services/T000/B000/XXXX")
+    client.bucket = MagicMock()
+
+    try:
+        for index in range(3):
+            client.send(Message(body=f"message {index}"))
+    finally:
+        server.shutdown()
+
+    # the messages are posted over a single keep-alive connection
+    assert len(WebhookHandler.client_ports) == 3
+    assert len(set(WebhookHandler.client_ports)) == 1
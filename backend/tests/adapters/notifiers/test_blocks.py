@@ -0,0 +1,32 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.adapters.aws.data_classes import EventBridgeEvent
+from src.adapters.notifiers import EventNotifier, base
+from tests.conftest import TEST_DIR
+
+
+@pytest.mark.parametrize("file_name", ["health_event.json", "guardduty_event.json", "alarm_event.json"])
+def test_blocks_match_template(file_name):
+    with open(TEST_DIR / "data" / file_name) as f:
+        event = EventBridgeEvent(json.load(f))
+
+    message = EventNotifier.event_to_message(event)
+    with patch.object(base, "PAYLOAD_BUILDERS", {}):
+        template_message = EventNotifier.event_to_message(event)
+
+    assert message.attachments == template_message.attachments
+
+
+def test_blocks_escape_log_messages():
+    with open(TEST_DIR / "data" / "logs_event.json") as f:
+        data = json.load(f)
+    data["detail"].pop("templates", None)
+    data["detail"]["logs"] = [{"timestamp": 1754497799934, "message": 'raise Exception("<failed> \\ & retried")'}]
+
+    message = EventNotifier.event_to_message(EventBridgeEvent(data))
+
+    text = message.attachments[0]["blocks"][-1]["text"]["text"]
+    assert 'raise Exception("&lt;failed&gt; \\ &amp; retried")' in text
@@ -0,0 +1,58 @@
+import pytest
+
+from src.adapters.db.models import AwsConfigPersistence
+from src.adapters.db.models.aws_config import LEGACY_AWS_CONFIG_SORT_KEY
+from src.adapters.db.repositories import AwsConfigRepository
+from src.common.exceptions import NotFoundError
+from src.domain.models import AwsConfig
+
+
+@pytest.fixture()
+def aws_config_repo():
+    repo = AwsConfigRepository()
+    yield repo
+    for config in repo.list_all():
+        repo.delete(config.account_id, config.region)
+
+
+def make_config(account_id: str, region: str = "us-east-1") -> AwsConfig:
+    return AwsConfig(id=f"config-{account_id}", account_id=account_id, account_name=account_id, region=region)
+
+
+def test_list_all_aws_configs(aws_config_repo):
+    aws_config_repo.create(make_config("111111111111"))
+    aws_config_repo.create(make_config("222222222222", region="eu-west-1"))
+
+    configs = aws_config_repo.list_all()
+
+    assert {(config.account_id, config.region) for config in configs} == {
+        ("111111111111", "us-east-1"),
+        ("222222222222", "eu-west-1"),
+    }
+    assert aws_config_repo.get("222222222222", "eu-west-1").id == "config-222222222222"
+
+
+def test_migrate_legacy_aws_config(aws_config_repo):
+    # Item stored with the former singleton key
+    legacy = AwsConfigPersistence(
+        pk="CONFIG",
+        sk=LEGACY_AWS_CONFIG_SORT_KEY,
+        id="config-333333333333",
+        account_id="333333333333",
+        account_name="legacy",
+        region="us-east-1",
+        status="active",
+        created_at=0,
+        updated_at=0,
+    )
+    item = legacy.serialize()
+    item["type"] = {"S": "CONFIG"}
+    AwsConfigPersistence._get_connection().put_item("CONFIG", range_key=LEGACY_AWS_CONFIG_SORT_KEY, attributes=item)
+
+    migrated = aws_config_repo.migrate_legacy()
+
+    assert migrated.account_id == "333333333333"
+    assert [config.account_id for config in aws_config_repo.list_all()] == ["333333333333"]
+    assert aws_config_repo.migrate_legacy() is None
+    with pytest.raises(NotFoundError):
+        aws_config_repo._get(hash_key="CONFIG", range_key=LEGACY_AWS_CONFIG_SORT_KEY)
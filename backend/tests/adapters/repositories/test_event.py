@@ -1,7 +1,17 @@
+import json
+import time
+
 import pytest
 
+from src.adapters.db.mappers import EventMapper
+from src.adapters.db.models import EventPersistence
+from src.adapters.db.models.base import CompressedUnicodeAttribute
+from src.adapters.db.models.event import LEGACY_EVENT_PARTITION, event_partition
+from src.adapters.db.repositories import NotificationRepository
 from src.common.exceptions import NotFoundError
-from src.domain.models import Event
+from src.common.utils.encoding import json_to_base64
+from src.domain.models import Event, Notification
+from src.domain.models.event import DEFAULT_LIST_DAYS, SECONDS_PER_DAY, ListEventsDTO
 
 
 def test_create_event(event_repo):
@@ -39,3 +49,163 @@ def test_list_events(event_repo):
 
     events = event_repo.list()
     assert len(events.items) == 5
+
+
+def make_events(source: str, count: int) -> list[Event]:
+    return [
+        Event(
+            id=f"{1735689600 + i}-{source}-{i:08d}",
+            account="000000000000",
+            region="us-east-1",
+            source=source,
+            detail_type="Test Event",
+            detail={"key": f"value-{i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def test_create_many_events(event_repo):
+    events = make_events("monitoring.test", 60)
+    event_repo.create_many(events)
+
+    for event in (events[0], events[42], events[59]):
+        assert event_repo.get(event.id).detail == event.detail
+
+
+def test_delete_range_events(event_repo):
+    events = make_events("monitoring.test", 30)
+    other_events = make_events("monitoring.other", 30)
+    event_repo.create_many(events + other_events)
+
+    # both bounds are inclusive
+    assert event_repo.delete_range("monitoring.test", 1735689600 + 10, 1735689600 + 20) == 11
+    for event in (events[10], events[15], events[20]):
+        with pytest.raises(NotFoundError):
+            event_repo.get(event.id)
+    assert event_repo.get(events[9].id) is not None
+    assert event_repo.get(events[21].id) is not None
+    assert event_repo.get(other_events[15].id) is not None
+
+
+def test_list_events_by_source(event_repo):
+    events = make_events("monitoring.test", 30)
+    event_repo.create_many(events + make_events("monitoring.other", 30))
+
+    result = event_repo.list_by_source("monitoring.test", 1735689600 + 10, 1735689600 + 20)
+    assert sorted(event.id for event in result) == sorted(event.id for event in events[10:21])
+
+
+def test_list_events_default_range(event_repo):
+    now = int(time.time())
+    recent, old = make_events("monitoring.test", 2)
+    recent.id = f"{now - SECONDS_PER_DAY}-recent"
+    old.id = f"{now - (DEFAULT_LIST_DAYS + 1) * SECONDS_PER_DAY}-old"
+    event_repo.create_many([recent, old])
+
+    # without start date, only the last DEFAULT_LIST_DAYS days are read
+    assert [event.id for event in event_repo.list().items] == [recent.id]
+
+
+def test_list_events_projection(event_repo):
+    events = make_events("monitoring.test", 10)
+    event_repo.create_many(events)
+
+    dto = ListEventsDTO(start_date=1735689600, end_date=1735689600 + 60, fields=["source", "published_at"])
+    result = event_repo.list(dto)
+    assert sorted(event.id for event in result.items) == sorted(event.id for event in events)
+    assert result.items[0].model_dump().keys() == {"id", "source", "published_at"}
+    with pytest.raises(AttributeError):
+        result.items[0].detail
+
+    result = event_repo.list(ListEventsDTO(start_date=1735689600, end_date=1735689600 + 60))
+    assert {event.id: event.detail for event in result.items} == {event.id: event.detail for event in events}
+
+
+def test_list_events_across_shards(event_repo):
+    # 3 events an hour over 2 days, spread over the partitions of each day
+    events = [
+        Event(
+            id=f"{1735689600 + i * 1200}-monitoring.test-{i:08d}",
+            account="000000000000",
+            region="us-east-1",
+            source="monitoring.test",
+            detail_type="Test Event",
+            detail={"key": f"value-{i}"},
+            published_at=1735689600 + i * 1200,
+        )
+        for i in range(144)
+    ]
+    event_repo.create_many(events)
+    assert len({event_partition(event.id) for event in events}) > 2
+
+    for direction, expected in (("desc", events[::-1]), ("asc", events)):
+        ids, cursor = [], None
+        while True:
+            dto = ListEventsDTO(
+                start_date=1735689600, end_date=1735689600 + 2 * 86400, limit=25, direction=direction, cursor=cursor
+            )
+            result = event_repo.list(dto)
+            ids += [event.id for event in result.items]
+            if not result.cursor:
+                break
+            cursor = json_to_base64(result.cursor)
+        assert ids == [event.id for event in expected]
+
+
+def test_migrate_legacy_events(event_repo):
+    # Events stored in the single partition before the events were bucketed by day, some without timestamp
+    legacy_events = make_events("monitoring.test", 3)
+    legacy_events[2].id, legacy_events[2].published_at = "00000000-0000-0000-0000-000000000000", 1735689610
+    for event in legacy_events:
+        model = EventMapper.to_persistence(event)
+        model.pk = LEGACY_EVENT_PARTITION
+        model.save()
+    NotificationRepository().save_many([Notification(event_id=legacy_events[2].id)])
+    assert event_repo.get(legacy_events[0].id).detail == legacy_events[0].detail
+
+    assert event_repo.migrate_legacy(limit=2) == 2
+    assert event_repo.migrate_legacy(limit=2) == 1
+    assert event_repo.migrate_legacy(limit=2) == 0
+
+    migrated_id = f"1735689610-{legacy_events[2].id}"
+    # the notification of the event without timestamp follows its new id
+    assert [item.event_id for item in NotificationRepository().list_due()] == [migrated_id]
+    result = event_repo.list(ListEventsDTO(start_date=1735689600, end_date=1735689600 + 60))
+    assert [event.id for event in result.items] == [migrated_id, legacy_events[1].id, legacy_events[0].id]
+    assert event_repo.get(migrated_id).detail == legacy_events[2].detail
+    assert EventPersistence.get(event_partition(legacy_events[0].id), legacy_events[0].id)
+    with pytest.raises(NotFoundError):
+        event_repo.get(legacy_events[2].id)
+
+
+def test_compressed_event_detail(event_repo):
+    entities = [{"entityValue": f"arn:aws:ec2:us-east-1:000000000000:instance/i-{i:017d}"} for i in range(200)]
+    event = Event(
+        id="1735689600-compressed",
+        account="000000000000",
+        region="us-east-1",
+        source="aws.health",
+        detail_type="AWS Health Event",
+        detail={"affectedEntities": entities},
+        resources=[entity["entityValue"] for entity in entities],
+    )
+    event_repo.create(event)
+
+    item = EventPersistence.get(event_partition(event.id), event.id).serialize()
+    assert item["detail"]["B"][:1] == CompressedUnicodeAttribute.ZLIB
+    assert len(item["detail"]["B"]) < len(json.dumps(event.detail)) / 4
+    retrieved_event = event_repo.get(event.id)
+    assert retrieved_event.detail == event.detail
+    assert retrieved_event.resources == event.resources
+
+
+def test_read_plain_text_event_detail():
+    # Item written before the detail was compressed
+    item = EventMapper.to_persistence(make_events("monitoring.test", 1)[0]).serialize()
+    item["detail"] = {"S": json.dumps({"key": "value"})}
+    item["resources"] = {"S": json.dumps(["arn:aws:ec2:us-east-1:000000000000:instance/i-1"])}
+
+    retrieved_event = EventMapper.to_entity(EventPersistence.from_raw_data(item))
+    assert retrieved_event.detail == {"key": "value"}
+    assert retrieved_event.resources == ["arn:aws:ec2:us-east-1:000000000000:instance/i-1"]
@@ -0,0 +1,45 @@
+from contextlib import suppress
+
+import pytest
+
+from src.adapters.db.repositories import LogGroupCacheRepository
+from src.common.exceptions import NotFoundError, UnprocessedError
+from src.common.utils.datetime_utils import current_utc_timestamp
+from src.domain.models import LogGroupCache
+
+SCOPE = "111111111111:eu-west-1"
+
+
+@pytest.fixture()
+def cache_repos():
+    repos = LogGroupCacheRepository(), LogGroupCacheRepository(scope=SCOPE)
+    yield repos
+    for repo in repos:
+        with suppress(NotFoundError, UnprocessedError):
+            repo.delete("monitoring", "true")
+
+
+def make_cache(log_groups: dict[str, str]) -> LogGroupCache:
+    return LogGroupCache(
+        tag_name="monitoring", tag_value="true", log_groups=log_groups, expired_at=current_utc_timestamp() + 3600
+    )
+
+
+def test_scoped_caches_kept_apart(cache_repos):
+    repo, scoped_repo = cache_repos
+    repo.save(make_cache({"arn:aws:lambda:us-east-1:000000000000:function:api": "/aws/lambda/api"}))
+
+    # the cache of another account & region is discovered on its own
+    with pytest.raises(NotFoundError):
+        scoped_repo.get("monitoring", "true")
+
+    scoped_repo.save(make_cache({"arn:aws:lambda:eu-west-1:111111111111:function:worker": "/aws/lambda/worker"}))
+    scoped_repo.update_log_group("monitoring", "true", "arn:aws:ecs:eu-west-1:111111111111:cluster/web", "/ecs/web")
+
+    assert repo.get("monitoring", "true").log_groups == {
+        "arn:aws:lambda:us-east-1:000000000000:function:api": "/aws/lambda/api"
+    }
+    assert scoped_repo.get("monitoring", "true").log_groups == {
+        "arn:aws:lambda:eu-west-1:111111111111:function:worker": "/aws/lambda/worker",
+        "arn:aws:ecs:eu-west-1:111111111111:cluster/web": "/ecs/web",
+    }
@@ -0,0 +1,98 @@
+import gzip
+import json
+from contextlib import suppress
+
+import pytest
+
+from src.adapters.aws import S3Service
+from src.adapters.claim_check import (
+    CLAIM_CHECK_KEY,
+    ClaimCheck,
+    LocalObjectStore,
+    S3ObjectStore,
+    is_claim_check,
+    object_store_from_url,
+)
+from src.common.exceptions import NotFoundError
+
+BUCKET_NAME = "monitoring-claim-check"
+
+
+@pytest.fixture
+def local_store(tmp_path):
+    # a space in the path, percent-encoded in the URIs of the store
+    return LocalObjectStore(tmp_path / "claim check")
+
+
+@pytest.fixture
+def s3_store():
+    client = S3Service().client
+    with suppress(client.exceptions.BucketAlreadyOwnedByYou):
+        client.create_bucket(Bucket=BUCKET_NAME)
+    return S3ObjectStore(BUCKET_NAME, "details/")
+
+
+def test_small_detail_kept(local_store):
+    detail = json.dumps({"message": "x" * 100})
+    claim_check = ClaimCheck(local_store, threshold=len(detail))
+
+    assert claim_check.check_in(detail) == detail
+    assert claim_check.check_out(json.loads(detail)) == json.loads(detail)
+
+
+@pytest.mark.parametrize("store", ["local_store", "s3_store"])
+def test_large_detail_offloaded(store, request):
+    store = request.getfixturevalue(store)
+    data = {"log_group_name": "/aws/lambda/api", "count": 3, "logs": [{"message": "ERROR"}] * 100}
+    detail = json.dumps(data)
+    claim_check = ClaimCheck(store, threshold=len(detail) - 1)
+
+    reference = json.loads(claim_check.check_in(detail))
+
+    assert is_claim_check(reference)
+    assert {k: v for k, v in reference.items() if k != CLAIM_CHECK_KEY} == {
+        "log_group_name": "/aws/lambda/api",
+        "count": 3,
+    }
+    assert reference[CLAIM_CHECK_KEY]["size"] == len(detail)
+    assert json.loads(gzip.decompress(store.get(reference[CLAIM_CHECK_KEY]["uri"]))) == data
+    assert claim_check.check_out(reference) == data
+
+
+def test_reference_under_threshold(local_store):
+    detail = json.dumps({"log_group_name": "g", "message": "x" * 300000, "request_id": "y" * 200})
+    claim_check = ClaimCheck(local_store, threshold=600)
+
+    reference = claim_check.check_in(detail)
+
+    # the long message is truncated, then dropped as the largest field
+    assert len(reference.encode("utf-8")) <= 600
+    summary = json.loads(reference)
+    assert summary["log_group_name"] == "g"
+    assert summary["request_id"] == "y" * 200
+    assert "message" not in summary
+    assert claim_check.check_out(summary) == json.loads(detail)
+
+
+def test_long_strings_truncated_in_summary(local_store):
+    detail = json.dumps({"message": "x" * 1000})
+    claim_check = ClaimCheck(local_store, threshold=999)
+
+    summary = json.loads(claim_check.check_in(detail))
+
+    assert summary["message"] == "x" * 256
+
+
+def test_missing_object(local_store, s3_store):
+    with pytest.raises(NotFoundError):
+        local_store.get(local_store.put("a.json.gz", b"").replace("a.json", "b.json"))
+    with pytest.raises(NotFoundError):
+        s3_store.get(f"s3://{BUCKET_NAME}/details/missing.json.gz")
+
+
+def test_object_store_from_url(tmp_path):
+    assert object_store_from_url(None) is None
+    assert isinstance(object_store_from_url(f"s3://{BUCKET_NAME}/details"), S3ObjectStore)
+    assert isinstance(object_store_from_url(tmp_path.as_uri()), LocalObjectStore)
+    with pytest.raises(ValueError):
+        object_store_from_url("https://example.com/details")
@@ -0,0 +1,76 @@
+import json
+
+from src.adapters.aws import InsightsQuery, QueryStatistics
+from src.adapters.logs import InsightsMetrics
+
+
+def make_statistics(query_id: str, log_group_names: list[str], bytes_scanned: float, **kwargs) -> QueryStatistics:
+    query = InsightsQuery(log_group_names, "fields @message", 1735689600, 1735689899)
+    return QueryStatistics(
+        query_id=query_id,
+        query=query,
+        status=kwargs.pop("status", "Complete"),
+        depth=kwargs.pop("depth", 0),
+        records_scanned=bytes_scanned / 100,
+        bytes_scanned=bytes_scanned,
+        records_matched=1,
+        duration=1.5,
+        polls=3,
+        **kwargs,
+    )
+
+
+def emitted(capsys) -> list[dict]:
+    """EMF documents printed since the last call, metric values come as lists."""
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+
+
+def test_record_emits_query_metrics(capsys):
+    metrics = InsightsMetrics()
+
+    metrics.record(make_statistics("query-1", ["/aws/lambda/a", "/aws/lambda/b"], 2048), "000000000000", "us-east-1")
+
+    [document] = emitted(capsys)
+    assert document["LogGroupCount"] == "2"
+    assert (document["BytesScanned"], document["RecordsScanned"], document["QueryPolls"]) == ([2048], [20.48], [3])
+    assert document["query_id"] == "query-1"
+    assert document["log_group_names"] == ["/aws/lambda/a", "/aws/lambda/b"]
+    assert (document["account"], document["region"]) == ("000000000000", "us-east-1")
+
+
+def test_flush_summary(capsys):
+    metrics = InsightsMetrics(top_chunks=2)
+    metrics.record(make_statistics("query-1", ["/aws/lambda/a"], 100))
+    metrics.record(make_statistics("query-2", ["/aws/lambda/b"], 300, depth=1, truncated=True))
+    metrics.record(make_statistics("query-3", ["/aws/lambda/c"], 200, status="Abandoned"), "111111111111", "eu-west-1")
+    emitted(capsys)
+
+    metrics.flush_summary()
+
+    [document] = emitted(capsys)
+    assert document["Queries"] == [3]
+    assert (document["SplitQueries"], document["AbandonedQueries"], document["TruncatedQueries"]) == ([1], [1], [1])
+    assert (document["TotalBytesScanned"], document["TotalQueryPolls"]) == ([600], [9])
+    # the chunks that scanned the most bytes, along with their account & region
+    assert document["top_chunks"] == [
+        {"log_group_names": ["/aws/lambda/b"], "bytes_scanned": 300, "duration": 1.5, "account": None, "region": None},
+        {
+            "log_group_names": ["/aws/lambda/c"],
+            "bytes_scanned": 200,
+            "duration": 1.5,
+            "account": "111111111111",
+            "region": "eu-west-1",
+        },
+    ]
+
+
+def test_flush_summary_resets(capsys):
+    metrics = InsightsMetrics()
+    metrics.record(make_statistics("query-1", ["/aws/lambda/a"], 100))
+    metrics.flush_summary()
+    emitted(capsys)
+
+    # nothing recorded since the last flush, nothing published
+    metrics.flush_summary()
+
+    assert emitted(capsys) == []
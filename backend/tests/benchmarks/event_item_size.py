@@ -0,0 +1,76 @@
+"""Size and write capacity of the events of the tests/data fixtures, with `detail` & `resources` stored
+as plain text or compressed (CompressedUnicodeAttribute).
+
+The size of an item is computed as DynamoDB bills it: the UTF-8 length of the attribute names and values,
+numbers taking about one byte per two digits. A write consumes one WCU per started KB.
+
+    python -m tests.benchmarks.event_item_size
+"""
+
+import json
+import math
+from pathlib import Path
+
+from src.adapters.db.mappers import EventMapper
+from src.domain.models import Event
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+WCU_SIZE = 1024
+
+
+def attribute_size(value: dict) -> int:
+    (kind, data) = next(iter(value.items()))
+    match kind:
+        case "S":
+            return len(data.encode())
+        case "B":
+            return len(data)
+        case "N":
+            return math.ceil(len(data.lstrip("-").replace(".", "")) / 2) + 1
+        case "BOOL" | "NULL":
+            return 1
+        case "L":
+            return 3 + sum(1 + attribute_size(item) for item in data)
+        case "M":
+            return 3 + sum(len(key.encode()) + 1 + attribute_size(item) for key, item in data.items())
+    raise ValueError(f"Unexpected attribute type {kind}")
+
+
+def item_size(item: dict) -> int:
+    return sum(len(name.encode()) + attribute_size(value) for name, value in item.items())
+
+
+def fixture_event(path: Path) -> Event:
+    data = json.loads(path.read_text())
+    return Event(
+        id=f"1735689600-{data['id']}",
+        account=data["account"],
+        region=data["region"],
+        source=data["source"],
+        detail=data["detail"],
+        detail_type=data["detail-type"],
+        resources=data.get("resources", []),
+    )
+
+
+def main():
+    total_plain = total_compressed = 0
+    print(f"{'fixture':<24} {'plain':>15}    {'compressed':>15}")
+    for path in sorted(DATA_DIR.glob("*_event.json")):
+        data = json.loads(path.read_text())
+        if "detail" not in data:
+            continue
+        model = EventMapper.to_persistence(fixture_event(path))
+        compressed = model.serialize()
+        plain = {**compressed, "detail": {"S": model.detail}, "resources": {"S": model.resources}}
+        plain_size, compressed_size = item_size(plain), item_size(compressed)
+        plain_wcu, compressed_wcu = math.ceil(plain_size / WCU_SIZE), math.ceil(compressed_size / WCU_SIZE)
+        total_plain += plain_wcu
+        total_compressed += compressed_wcu
+        name = path.stem.removesuffix("_event")
+        print(f"{name:<24} {plain_size:6} B {plain_wcu:2} WCU -> {compressed_size:6} B {compressed_wcu:2} WCU")
+    print(f"{'total':<24} {total_plain:11} WCU -> {total_compressed:11} WCU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Per-message cost of rendering the notifications of the tests/data fixtures.
+
+Compares the shared environment of `render_template` (compiled templates cached) with a new
+environment per render, as `render_template` did before, and times the precompilation of every
+template at cold start, with and without a bytecode cache. The Block Kit builders are disabled,
+so that every message is rendered from its template.
+
+    python -m tests.benchmarks.template_render [renders]
+"""
+
+import json
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from unittest.mock import patch
+
+from src.adapters.aws.data_classes import EventBridgeEvent
+from src.adapters.notifiers import EventNotifier
+from src.common.utils import template
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+FIXTURES = ["health_event.json", "alarm_event.json", "guardduty_event.json", "cloudformation_event.json"]
+
+
+def uncached_render_template(template_file: str, context: dict) -> str:
+    return template.create_environment(bytecode_cache_dir=None).get_template(template_file).render(**context)
+
+
+def per_render_ms(event, renders: int) -> float:
+    return timeit.timeit(lambda: EventNotifier.event_to_message(event), number=renders) / renders * 1000
+
+
+@patch.dict("src.adapters.notifiers.base.PAYLOAD_BUILDERS", clear=True)
+def render_messages(renders: int):
+    print(f"Per message, {renders} renders per fixture")
+    for fixture in FIXTURES:
+        event = EventBridgeEvent(json.loads((DATA_DIR / fixture).read_text()))
+        with patch("src.adapters.notifiers.base.render_template", uncached_render_template):
+            uncached = per_render_ms(event, renders)
+        EventNotifier.event_to_message(event)  # compiled by the first render
+        cached = per_render_ms(event, renders)
+        print(f"  {event.source:<20} {uncached:6.2f} -> {cached:6.2f} ms")
+
+
+def precompile(bytecode_cache_dir: str):
+    print("Precompilation of every template")
+    seconds = timeit.timeit(lambda: template.precompile_templates(template.create_environment(None)), number=1)
+    print(f"  no bytecode cache     {seconds * 1000:6.1f} ms")
+    template.precompile_templates(template.create_environment(bytecode_cache_dir))  # fills the cache
+    env = template.create_environment(bytecode_cache_dir)
+    seconds = timeit.timeit(lambda: template.precompile_templates(env), number=1)
+    print(f"  warm bytecode cache   {seconds * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    render_messages(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
+    with tempfile.TemporaryDirectory() as bytecode_cache_dir:
+        precompile(bytecode_cache_dir)
@@ -0,0 +1,25 @@
+from src.common.meta import SingletonMeta
+
+
+class Client(metaclass=SingletonMeta):
+    def __init__(self, region: str = "us-east-1", session=None):
+        self.region = region
+        self.session = session
+
+
+class OtherClient(metaclass=SingletonMeta):
+    def __init__(self, region: str = "us-east-1"):
+        self.region = region
+
+
+def test_one_instance_per_arguments():
+    assert Client() is Client()
+    assert Client("eu-west-1") is Client("eu-west-1")
+    assert Client("eu-west-1") is not Client("us-west-2")
+    assert Client(region="eu-west-1", session="a") is Client(session="a", region="eu-west-1")
+    assert Client(region="eu-west-1", session="a") is not Client(region="eu-west-1", session="b")
+
+
+def test_one_instance_per_class():
+    assert Client("eu-west-1") is not OtherClient("eu-west-1")
+    assert isinstance(OtherClient("eu-west-1"), OtherClient)
@@ -0,0 +1,29 @@
+import random
+from itertools import islice
+
+from src.common.utils.backoff import exponential_backoff
+
+
+def test_delays_grow_up_to_maximum():
+    random.seed(0)
+    delays = list(islice(exponential_backoff(initial=1.0, maximum=8.0), 8))
+
+    # each delay is drawn from [d/2, d], d doubling from 1 up to 8
+    for delay, nominal in zip(delays, [1, 2, 4, 8, 8, 8, 8, 8]):
+        assert nominal / 2 <= delay <= nominal
+
+
+def test_delays_are_jittered():
+    random.seed(0)
+    delays = list(islice(exponential_backoff(initial=1.0, maximum=1.0), 20))
+
+    assert all(0.5 <= delay <= 1.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_delays_with_factor():
+    random.seed(0)
+    delays = list(islice(exponential_backoff(initial=0.1, maximum=10.0, factor=3.0), 4))
+
+    for delay, nominal in zip(delays, [0.1, 0.3, 0.9, 2.7]):
+        assert nominal / 2 <= delay <= nominal + 1e-9
@@ -0,0 +1,57 @@
+from src.common.utils.log_templates import TemplateMiner, cluster_messages, mask_message
+
+
+def test_mask_message():
+    message = (
+        "ERROR request 0b9d8a7e-6f5c-4b3a-9e8d-7c6b5a4f3e2d from 10.0.12.7 failed after 1500 ms "
+        "at 2025-01-01T00:00:00.123Z, trace 5f3a9c0e1d2b4a68"
+    )
+
+    assert mask_message(message) == ("ERROR request <UUID> from <NUM> failed after <NUM> ms at <NUM>, trace <HEX>")
+
+
+def test_mask_message_keeps_words():
+    # digits within identifiers are not numbers
+    assert mask_message("KeyError: 'user_id' in handler_v2") == "KeyError: 'user_id' in handler_v2"
+
+
+def test_similar_messages_merged():
+    miner = TemplateMiner()
+
+    first = miner.add("ERROR Timeout connecting to db-primary after 30 s")
+    second = miner.add("ERROR Timeout connecting to db-replica after 45 s")
+
+    assert second is first
+    assert first.template == "ERROR Timeout connecting to <*> after <NUM> s"
+    assert first.count == 2
+
+
+def test_different_templates_separated():
+    clusters = cluster_messages(
+        [
+            "ERROR Timeout connecting to db-primary after 30 s",
+            "ERROR Unhandled exception in handler",
+            "WARNING Retrying request 42",
+            "ERROR Timeout connecting to db-replica after 45 s",
+        ]
+    )
+
+    assert [(cluster.template, cluster.count) for cluster in clusters] == [
+        ("ERROR Timeout connecting to <*> after <NUM> s", 2),
+        ("ERROR Unhandled exception in handler", 1),
+        ("WARNING Retrying request <NUM>", 1),
+    ]
+
+
+def test_cluster_counts_and_samples():
+    messages = [f"ERROR Job {index} failed" for index in range(5)] + ["ERROR Disk full"] * 2
+
+    clusters = cluster_messages(messages, max_samples=3)
+
+    # most frequent first, samples are the indexes of the first messages of each cluster
+    assert [(cluster.count, cluster.samples) for cluster in clusters] == [(5, [0, 1, 2]), (2, [5, 6])]
+    assert [messages[index] for index in clusters[0].samples] == [
+        "ERROR Job 0 failed",
+        "ERROR Job 1 failed",
+        "ERROR Job 2 failed",
+    ]
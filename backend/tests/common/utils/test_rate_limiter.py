@@ -0,0 +1,40 @@
+import threading
+import time
+
+from src.common.utils.rate_limiter import TokenBucket
+
+
+def timed(function) -> float:
+    started_at = time.monotonic()
+    function()
+    return time.monotonic() - started_at
+
+
+def test_burst_then_rate():
+    bucket = TokenBucket(rate=20, capacity=3)
+
+    # the burst goes through at once, the next call waits for a token
+    assert timed(lambda: [bucket.acquire() for _ in range(3)]) < 0.02
+    assert 0.03 <= timed(bucket.acquire) < 0.1
+
+
+def test_pause_holds_calls_back():
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    bucket.pause(0.2)
+
+    assert timed(bucket.acquire) >= 0.19
+
+
+def test_pause_while_waiting():
+    bucket = TokenBucket(rate=5, capacity=1)
+    bucket.acquire()
+    waited = []
+    waiting = threading.Thread(target=lambda: waited.append(timed(bucket.acquire)))
+    waiting.start()
+    time.sleep(0.05)
+
+    # the waiting call does not hold the bucket, the pause is applied right away and extends its wait
+    assert timed(lambda: bucket.pause(0.5)) < 0.02
+    waiting.join()
+    assert waited[0] >= 0.5
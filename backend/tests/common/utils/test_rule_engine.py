@@ -0,0 +1,49 @@
+from src.common.utils.rule_engine import RuleEngine
+
+
+def test_highest_matching_rule_wins():
+    rules = RuleEngine()
+    rules.add("cloudwatch", "cpu", ">=", 70, 3)
+    rules.add("cloudwatch", "cpu", ">=", 90, 4)
+    rules.add("cloudwatch", "state.value", "==", "ALARM", 2)
+
+    assert rules.evaluate("cloudwatch", {"cpu": 95, "state": {"value": "ALARM"}}) == 4
+    assert rules.evaluate("cloudwatch", {"cpu": 75, "state": {"value": "ALARM"}}) == 3
+    assert rules.evaluate("cloudwatch", {"cpu": 10, "state": {"value": "ALARM"}}) == 2
+    assert rules.evaluate("cloudwatch", {"cpu": 10, "state": {"value": "OK"}}) == 0
+    assert len(rules) == 3
+
+
+def test_missing_path_returns_default():
+    rules = RuleEngine()
+    rules.add("cloudwatch", "state.value", "==", "ALARM", 4)
+
+    assert rules.evaluate("cloudwatch", {}, default=1) == 1
+    assert rules.evaluate("cloudwatch", {"state": {}}, default=1) == 1
+    # a segment of the path is not a dict
+    assert rules.evaluate("cloudwatch", {"state": "ALARM"}, default=1) == 1
+    # no rule for the key, or data that is not a dict
+    assert rules.evaluate("guardduty", {"state": {"value": "ALARM"}}, default=1) == 1
+    assert rules.evaluate("cloudwatch", None, default=1) == 1
+
+
+def test_comparison_type_error_skips_rule():
+    rules = RuleEngine()
+    rules.add("guardduty", "severity", ">=", 7, 4)
+    rules.add("guardduty", "severity", "!=", None, 1)
+
+    # "high" >= 7 raises a TypeError, the next rule is tried
+    assert rules.evaluate("guardduty", {"severity": "high"}) == 1
+    assert rules.evaluate("guardduty", {"severity": 8}) == 4
+
+
+def test_in_and_contains_operators():
+    rules = RuleEngine()
+    rules.add("health", "eventTypeCategory", "in", ["issue", "scheduledChange"], 3)
+    rules.add("health", "eventTypeCode", "contains", "OPERATIONAL", 2)
+
+    assert rules.evaluate("health", {"eventTypeCategory": "issue"}) == 3
+    assert rules.evaluate("health", {"eventTypeCategory": "accountNotification"}) == 0
+    assert rules.evaluate("health", {"eventTypeCode": "AWS_EC2_OPERATIONAL_ISSUE"}) == 2
+    # `contains` on a value that is not a container is a TypeError, i.e. no match
+    assert rules.evaluate("health", {"eventTypeCode": 42}) == 0
@@ -10,7 +10,8 @@ sys.path.append(str(BASE_DIR))
 load_dotenv(BASE_DIR / ".env.local")
 
 # fmt: off
-from src.adapters.db.repositories import EventRepository  # noqa
+from src.adapters.db.models import EventPersistence  # noqa
+from src.adapters.db.repositories import EventRepository, NotificationRepository  # noqa
 from src.domain.models import Event  # noqa
 
 # fmt: on
@@ -21,9 +22,11 @@ from src.domain.models import Event  # noqa
 def event_repo():
     repo = EventRepository()
     yield repo
-    # Cleanup
-    for item in repo.list().items:
-        repo.delete(item.persistence_id)
+    # Cleanup, along with the outbox notifications of the events, whatever their day
+    ids = [item.id for item in EventPersistence.scan()]
+    NotificationRepository().delete_many(ids)
+    for id in ids:
+        repo.delete(id)
 
 
 @pytest.fixture
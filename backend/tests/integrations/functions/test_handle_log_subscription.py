@@ -0,0 +1,43 @@
+import base64
+import gzip
+import json
+from unittest.mock import MagicMock
+
+from src.entrypoints.functions.handle_log_subscription import main
+from src.entrypoints.functions.handle_log_subscription.main import handler, publisher
+from tests.conftest import TEST_DIR
+
+LOG_GROUP_NAME = "/aws/lambda/monitoring-local-HandleMonitoringEvents"
+
+
+def load_payload(file_name: str) -> dict:
+    with open(TEST_DIR / "data" / file_name) as f:
+        return json.load(f)
+
+
+def test_handle_log_subscription():
+    publisher.publish = MagicMock()
+    handler(load_payload("logs_subscription_event.json"), None)
+
+    publisher.publish.assert_called_once()
+    (message,) = publisher.publish.call_args.args[0]
+    assert message.resources == [LOG_GROUP_NAME]
+
+    detail = json.loads(message.detail)
+    assert detail["log_group_name"] == LOG_GROUP_NAME
+    assert detail["account"] == "000000000000"
+    messages = [sample["message"] for template in detail["templates"] for sample in template["samples"]]
+    assert "Exception: Authentication failed" in messages
+    assert not any(message.startswith(("START", "END")) for message in messages)
+
+
+def test_own_logs_ignored(monkeypatch):
+    payload = load_payload("logs_subscription_event.json")
+    data = json.loads(gzip.decompress(base64.b64decode(payload["awslogs"]["data"])))
+    monkeypatch.setattr(main, "OWN_LOG_GROUP_NAME", data["logGroup"])
+    publisher.publish = MagicMock()
+
+    handler(payload, None)
+
+    # the errors of the handler itself would be pushed back to it, over and over
+    publisher.publish.assert_not_called()
@@ -1,13 +1,46 @@
-from unittest.mock import MagicMock
+from unittest.mock import patch
 
-from src.entrypoints.functions.handle_monitoring_events.main import handler, notifier
+import pytest
+
+from src.domain.models import MonitoringConfig, ServiceConfig
+from src.domain.models.event import ListEventsDTO
+from src.entrypoints.functions.handle_monitoring_events.main import config_repo as handler_config_repo
+from src.entrypoints.functions.handle_monitoring_events.main import event_repo as handler_event_repo
+from src.entrypoints.functions.handle_monitoring_events.main import handler, inserted_ids
 from tests.conftest import TEST_DIR
 from tests.mock import load_event
 
 
+@pytest.fixture(autouse=True)
+def clear_inserted_ids():
+    # the tests reuse the same event id
+    inserted_ids.clear()
+    yield
+
+
+@pytest.fixture()
+def monitoring_config():
+    config = MonitoringConfig(
+        services=[
+            ServiceConfig(
+                service_name="cloudwatch",
+                severity_rules=[
+                    {"metric": "state.value", "operator": "==", "value": "ALARM", "severity": "high"},
+                    {"metric": "state.value", "operator": "==", "value": "INSUFFICIENT_DATA", "severity": "low"},
+                ],
+            )
+        ]
+    )
+    handler_config_repo.create(config)
+    # the handler reads the config at most once a minute
+    handler_config_repo._cached_at = None
+    yield config
+    handler_config_repo.delete()
+    handler_config_repo._cached_at = None
+
+
 def test_handle_health_event(event_repo):
     health_event = load_event(TEST_DIR / "data" / "health_event.json")
-    notifier.client.send = MagicMock(side_effect=lambda *a, **kw: None)
     handler(health_event, None)
 
     event = event_repo.get("1735689600-00000000-0000-0000-0000-000000000000")
@@ -20,7 +53,6 @@ def test_handle_health_event(event_repo):
 
 def test_handle_guardduty_event(event_repo):
     guardduty_event = load_event(TEST_DIR / "data" / "guardduty_event.json")
-    notifier.client.send = MagicMock(side_effect=lambda *a, **kw: None)
     handler(guardduty_event, None)
 
     event = event_repo.get("1735689600-00000000-0000-0000-0000-000000000000")
@@ -33,7 +65,6 @@ def test_handle_guardduty_event(event_repo):
 
 def test_handle_alarm_event(event_repo):
     alarm_event = load_event(TEST_DIR / "data" / "alarm_event.json")
-    notifier.client.send = MagicMock(side_effect=lambda *a, **kw: None)
     handler(alarm_event, None)
 
     event = event_repo.get("1735689600-00000000-0000-0000-0000-000000000000")
@@ -44,9 +75,17 @@ def test_handle_alarm_event(event_repo):
     assert event.detail_type == "CloudWatch Alarm State Change"
 
 
+def test_handle_event_severity(event_repo, monitoring_config):
+    alarm_event = load_event(TEST_DIR / "data" / "alarm_event.json")
+    handler(alarm_event, None)
+
+    # the alarm is in ALARM state, so the "high" rule of the stored config applies
+    event = event_repo.get("1735689600-00000000-0000-0000-0000-000000000000")
+    assert event.severity == 3
+
+
 def test_handle_cwlog_event(event_repo):
     cwlog_event = load_event(TEST_DIR / "data" / "logs_event.json")
-    notifier.client.send = MagicMock(side_effect=lambda *a, **kw: None)
     handler(cwlog_event, None)
 
     event = event_repo.get("1735689600-00000000-0000-0000-0000-000000000000")
@@ -55,3 +94,18 @@ def test_handle_cwlog_event(event_repo):
     assert event.region == "us-east-1"
     assert event.source == "monitoring.agent.logs"
     assert event.detail_type == "Error Logs Query"
+
+
+def test_handle_redelivered_event(event_repo):
+    health_event = load_event(TEST_DIR / "data" / "health_event.json")
+    handler(health_event, None)
+
+    # a redelivery is short-circuited by the container, without writing to the database
+    with patch.object(handler_event_repo, "create_many_with_notifications") as create_many:
+        handler(health_event, None)
+    create_many.assert_not_called()
+
+    # a redelivery to another container is skipped by the conditional write
+    inserted_ids.clear()
+    handler(health_event, None)
+    assert len(event_repo.list(ListEventsDTO(start_date=1735689600, end_date=1735689600)).items) == 1
@@ -0,0 +1,72 @@
+import json
+from unittest.mock import patch
+
+from src.adapters.db.mappers import EventMapper
+from src.domain.models.event import ListEventsDTO
+from src.entrypoints.functions.handle_monitoring_events_batch.main import handler, inserted_ids
+from tests.conftest import TEST_DIR
+
+
+def mock_sqs_event(*file_names: str) -> dict:
+    records = []
+    for index, file_name in enumerate(file_names):
+        with open(TEST_DIR / "data" / file_name) as f:
+            body = json.load(f)
+        body["id"] = f"0000000{index}-0000-0000-0000-000000000000"
+        records.append(
+            {
+                "messageId": f"message-{index}",
+                "receiptHandle": f"handle-{index}",
+                "body": json.dumps(body),
+                "attributes": {},
+                "messageAttributes": {},
+                "eventSource": "aws:sqs",
+                "eventSourceARN": "arn:aws:sqs:us-east-1:000000000000:monitoring-local-MonitoringEventQueue",
+                "awsRegion": "us-east-1",
+            }
+        )
+    return {"Records": records}
+
+
+def test_handle_monitoring_events_batch(event_repo):
+    event = mock_sqs_event("health_event.json", "guardduty_event.json", "alarm_event.json")
+    event["Records"].append({**event["Records"][0], "messageId": "message-invalid", "body": "not json"})
+    response = handler(event, None)
+
+    assert [item["itemIdentifier"] for item in response["batchItemFailures"]] == ["message-invalid"]
+    assert len(event_repo.list(ListEventsDTO(start_date=1735689600, end_date=1735689600)).items) == 3
+
+    # a redelivered batch is skipped, its events are stored & notified once
+    response = handler(mock_sqs_event("health_event.json"), None)
+    assert response["batchItemFailures"] == []
+    assert len(event_repo.list(ListEventsDTO(start_date=1735689600, end_date=1735689600)).items) == 3
+
+
+def test_invalid_event_fails_alone(event_repo):
+    inserted_ids.clear()
+    event = mock_sqs_event("health_event.json", "guardduty_event.json", "alarm_event.json")
+    body = json.loads(event["Records"][1]["body"])
+    del body["time"]
+    event["Records"][1]["body"] = json.dumps(body)
+
+    response = handler(event, None)
+
+    assert [item["itemIdentifier"] for item in response["batchItemFailures"]] == ["message-1"]
+    assert len(event_repo.list(ListEventsDTO(start_date=1735689600, end_date=1735689600)).items) == 2
+
+
+def test_unwritable_event_fails_alone(event_repo):
+    inserted_ids.clear()
+    to_persistence = EventMapper.to_persistence
+
+    def failing_to_persistence(entity, *args, **kwargs):
+        if entity.id.endswith("00000002-0000-0000-0000-000000000000"):
+            raise ValueError("Unserializable detail")
+        return to_persistence(entity, *args, **kwargs)
+
+    # the transaction of the batch fails, its events are written again one by one
+    with patch.object(EventMapper, "to_persistence", side_effect=failing_to_persistence):
+        response = handler(mock_sqs_event("health_event.json", "guardduty_event.json", "alarm_event.json"), None)
+
+    assert [item["itemIdentifier"] for item in response["batchItemFailures"]] == ["message-2"]
+    assert len(event_repo.list(ListEventsDTO(start_date=1735689600, end_date=1735689600)).items) == 2
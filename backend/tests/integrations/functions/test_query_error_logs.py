@@ -1,12 +1,19 @@
 import json
 import time
+from datetime import UTC, datetime, timedelta
 from unittest.mock import MagicMock
 from uuid import uuid4
 
 import boto3
 
+from src.adapters.aws import CloudwatchLogService
+from src.adapters.db.repositories import LogCheckpointRepository
+from src.adapters.logs import LogService
 from src.common.constants import AWS_ENDPOINT, AWS_REGION
-from src.entrypoints.functions.query_error_logs.main import handler, log_service
+from src.domain.models import LogCheckpoint
+from src.domain.use_cases.query_error_logs import QueryParam, query_error_logs_use_case
+from src.entrypoints.functions.query_error_logs.main import CW_INSIGHTS_QUERY_STRING, handler, log_service
+from tests.mock import mock_logs_client
 
 
 def mock_cloudwatch_logs(log_group_name: str):
@@ -69,3 +76,109 @@ def test_query_logs():
     log_group_name = "/aws/lambda/monitoring-local-HandleMonitoringEvents"
     mock_cloudwatch_logs(log_group_name)
     handler(None, None)
+
+
+def mock_log_service(
+    log_group_names: list[str], statuses: dict[str, str], monkeypatch, results: dict[str, list] | None = None
+) -> LogService:
+    """A log service discovering the given log groups, whose Insights queries end with the given statuses."""
+    cloudwatch_log_service = CloudwatchLogService()
+    monkeypatch.setattr(cloudwatch_log_service, "client", mock_logs_client(statuses, results))
+    service = LogService(cloudwatch_log_service, lambda_service=MagicMock(), ecs_service=MagicMock())
+    service.lambda_service.list_functions.return_value = [
+        {"Tags": {"monitoring": "true"}, "LoggingConfig": {"LogGroup": name}} for name in log_group_names
+    ]
+    service.ecs_service.list_clusters.return_value = []
+    return service
+
+
+def test_deadline_keeps_checkpoints(monkeypatch):
+    log_group = f"/aws/lambda/slow-{uuid4()}"
+    service = mock_log_service([log_group], {"query-slow": "Running"}, monkeypatch)
+    checkpoint_repo = LogCheckpointRepository()
+    end_time = datetime.now(UTC).replace(microsecond=0)
+    scanned_until = int((end_time - timedelta(minutes=5)).timestamp())
+    checkpoint_repo.save_many([LogCheckpoint(log_group_name=log_group, scanned_until=scanned_until)])
+    query = QueryParam(
+        query_string=CW_INSIGHTS_QUERY_STRING,
+        start_time=end_time - timedelta(minutes=5),
+        end_time=end_time,
+        deadline=datetime.now(UTC) + timedelta(seconds=1),
+    )
+    publisher = MagicMock()
+
+    query_error_logs_use_case(query, service, publisher, checkpoint_repo)
+
+    # the query is abandoned: nothing published, the log group is scanned again on the next run
+    service.cloudwatch_log_service.client.stop_query.assert_called_once_with(queryId="query-slow")
+    publisher.publish.assert_not_called()
+    checkpoints = {checkpoint.log_group_name: checkpoint.scanned_until for checkpoint in checkpoint_repo.list_all()}
+    assert checkpoints[log_group] == scanned_until
+
+
+def make_query(max_catchup_windows: int = 12) -> QueryParam:
+    end_time = datetime(2025, 1, 1, 1, tzinfo=UTC)
+    return QueryParam(
+        query_string=CW_INSIGHTS_QUERY_STRING,
+        start_time=end_time - timedelta(minutes=5),
+        end_time=end_time,
+        max_catchup_windows=max_catchup_windows,
+    )
+
+
+def test_pending_windows_without_checkpoint():
+    query = make_query()
+
+    assert query.pending_windows(None) == [(query.start_time + timedelta(seconds=1), query.end_time)]
+
+
+def test_pending_windows_resume_after_checkpoint():
+    query = make_query()
+
+    windows = query.pending_windows(query.end_time - timedelta(minutes=15))
+
+    # three 5-minute windows, each starting one second after the previous one ends (inclusive bounds)
+    assert len(windows) == 3
+    assert windows[0][0] == query.end_time - timedelta(minutes=15) + timedelta(seconds=1)
+    assert windows[-1][1] == query.end_time
+    for (_, previous_end), (start, _) in zip(windows, windows[1:]):
+        assert start == previous_end + timedelta(seconds=1)
+    assert all(end - start == query.window - timedelta(seconds=1) for start, end in windows)
+    # up to date
+    assert query.pending_windows(query.end_time) == []
+
+
+def test_pending_windows_catchup_limit():
+    query = make_query(max_catchup_windows=2)
+
+    windows = query.pending_windows(query.end_time - timedelta(days=1))
+
+    # the older logs are skipped, the last 2 windows are scanned
+    assert windows == [
+        (query.end_time - timedelta(minutes=10) + timedelta(seconds=1), query.end_time - timedelta(minutes=5)),
+        (query.end_time - timedelta(minutes=5) + timedelta(seconds=1), query.end_time),
+    ]
+
+
+def test_checkpoints_move_to_window_end(monkeypatch):
+    log_group = f"/aws/lambda/quiet-{uuid4()}"
+    lagging_log_group = f"/aws/lambda/lagging-{uuid4()}"
+    statuses = {"query-1": "Complete", "query-2": "Complete", "query-3": "Complete"}
+    service = mock_log_service(
+        [log_group, lagging_log_group], statuses, monkeypatch, results={query_id: [] for query_id in statuses}
+    )
+    checkpoint_repo = LogCheckpointRepository()
+    query = make_query()
+    lagging_since = int((query.end_time - timedelta(minutes=10)).timestamp())
+    checkpoint_repo.save_many([LogCheckpoint(log_group_name=lagging_log_group, scanned_until=lagging_since)])
+
+    query_error_logs_use_case(query, service, MagicMock(), checkpoint_repo)
+
+    # the lagging log group is scanned alone first, then along with the other one
+    calls = service.cloudwatch_log_service.client.start_query.call_args_list
+    assert [(call.kwargs["logGroupNames"], call.kwargs["startTime"], call.kwargs["endTime"]) for call in calls] == [
+        ([lagging_log_group], lagging_since + 1, lagging_since + 300),
+        ([lagging_log_group, log_group], lagging_since + 301, lagging_since + 600),
+    ]
+    checkpoints = {checkpoint.log_group_name: checkpoint.scanned_until for checkpoint in checkpoint_repo.list_all()}
+    assert checkpoints[log_group] == checkpoints[lagging_log_group] == int(query.end_time.timestamp())
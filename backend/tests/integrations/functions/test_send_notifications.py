@@ -0,0 +1,137 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.common.utils.circuit_breaker import CircuitBreaker
+from src.common.utils.datetime_utils import current_utc_timestamp
+from src.domain.models import Event, Notification, NotificationStatus
+from src.domain.use_cases.send_notifications import send_notifications_use_case
+from src.entrypoints.functions.handle_monitoring_events.main import handler as handle_monitoring_event
+from src.entrypoints.functions.handle_monitoring_events.main import inserted_ids
+from src.entrypoints.functions.send_notifications.main import circuit_breaker, handler, notification_repo, notifier
+from tests.conftest import TEST_DIR
+from tests.mock import load_event
+
+
+@pytest.fixture(autouse=True)
+def clear_inserted_ids():
+    # the tests reuse the same event id
+    inserted_ids.clear()
+    yield
+
+
+def test_send_notifications(event_repo):
+    handle_monitoring_event(load_event(TEST_DIR / "data" / "health_event.json"), None)
+    assert len(notification_repo.list_due()) == 1
+
+    notifier.client.send = MagicMock()
+    handler({}, None)
+
+    notifier.client.send.assert_called_once()
+    assert notification_repo.list_due() == []
+
+
+def test_send_notifications_failure(event_repo):
+    handle_monitoring_event(load_event(TEST_DIR / "data" / "health_event.json"), None)
+
+    notifier.client.send = MagicMock(side_effect=Exception("Slack is down"))
+    handler({}, None)
+
+    # rescheduled, not due before its retry delay
+    assert notification_repo.list_due() == []
+    (notification,) = notification_repo._query(hash_key="NOTIFICATION", limit=None)
+    assert notification.attempts == 1
+    assert notification.status == NotificationStatus.PENDING.value
+    notification_repo.delete_many([notification.event_id])
+    circuit_breaker.record_success()
+
+
+def test_send_notifications_digest(event_repo):
+    with open(TEST_DIR / "data" / "health_event.json") as f:
+        health_event = json.load(f)
+    for index in range(3):
+        handle_monitoring_event({**health_event, "id": f"0000000{index}-0000-0000-0000-000000000000"}, None)
+
+    notifier.client.send = MagicMock()
+    handler({}, None)
+
+    # events of the same source & account are coalesced into a single message
+    notifier.client.send.assert_called_once()
+    assert notification_repo.list_due() == []
+
+
+def run_use_case(
+    events: list[Event], notifications: list[Notification] | None = None, **kwargs
+) -> tuple[MagicMock, MagicMock]:
+    """Send the notifications of `events` with mock repositories, return the notifier and the notification repo."""
+    notifications = notifications or [Notification(event_id=event.id) for event in events]
+    repo, events_by_id, notifier = MagicMock(), {event.id: event for event in events}, MagicMock()
+    repo.list_due.return_value = notifications
+    event_repo = MagicMock()
+    event_repo.get.side_effect = lambda event_id: events_by_id[event_id]
+    send_notifications_use_case(repo, event_repo, notifier, CircuitBreaker(), **kwargs)
+    return notifier, repo
+
+
+def make_event(index: int, source: str = "aws.health", account: str = "000000000000", severity: int = 0) -> Event:
+    return Event(
+        id=f"1735689600-{index:08}",
+        account=account,
+        region="us-east-1",
+        source=source,
+        detail={"key": "value"},
+        detail_type="Test Event",
+        severity=severity,
+        published_at=1735689600,
+    )
+
+
+def test_coalesce_by_source_and_account():
+    events = [make_event(index) for index in range(3)]
+    events += [make_event(3, source="aws.guardduty"), make_event(4, account="111111111111")]
+
+    notifier, repo = run_use_case(events, coalesce_threshold=3)
+
+    # a digest for the group reaching the threshold, the other events one by one
+    (digest,) = [call.args[0] for call in notifier.notify_digest.call_args_list]
+    assert [event.get_id for event in digest] == [event.id for event in events[:3]]
+    assert sorted(call.args[0].get_id for call in notifier.notify.call_args_list) == [events[3].id, events[4].id]
+    repo.delete_many.assert_called_once()
+    assert sorted(repo.delete_many.call_args.args[0]) == [event.id for event in events]
+
+
+def test_coalesce_below_threshold():
+    notifier, _ = run_use_case([make_event(index) for index in range(2)], coalesce_threshold=3)
+
+    notifier.notify_digest.assert_not_called()
+    assert notifier.notify.call_count == 2
+
+
+def test_digest_holds_low_priority_back():
+    now = current_utc_timestamp()
+    low, high = make_event(0), make_event(1, severity=3)
+    notifications = [Notification(event_id=event.id, created_at=now) for event in (low, high)]
+
+    notifier, repo = run_use_case([low, high], notifications, digest_interval=3600)
+
+    # the high-priority event is notified right away, the other one at the end of its digest window
+    notifier.notify.assert_called_once()
+    assert notifier.notify.call_args.args[0].get_id == high.id
+    repo.delete_many.assert_called_once_with([high.id])
+    (postponed,) = repo.save_many.call_args.args[0]
+    assert postponed.event_id == low.id
+    assert postponed.next_attempt_at == (now // 3600 + 1) * 3600
+
+
+def test_digest_window_ended():
+    created_at = (current_utc_timestamp() // 60 - 1) * 60
+    events = [make_event(index) for index in range(3)]
+    notifications = [Notification(event_id=event.id, created_at=created_at) for event in events]
+
+    notifier, repo = run_use_case(events, notifications, digest_interval=60, coalesce_threshold=3)
+
+    # the events buffered during the window are sent as a single digest
+    notifier.notify_digest.assert_called_once()
+    notifier.notify.assert_not_called()
+    repo.save_many.assert_not_called()
@@ -0,0 +1,70 @@
+from contextlib import suppress
+from unittest.mock import MagicMock
+
+from src.common.exceptions import NotFoundError, UnprocessedError
+from src.entrypoints.functions.sync_log_groups.main import handler, log_service
+
+FUNCTION_ARN = "arn:aws:lambda:us-east-1:000000000000:function:monitoring-local-Dummy"
+LOG_GROUP_NAME = "/aws/lambda/monitoring-local-Dummy"
+
+
+def mock_functions(*functions: dict):
+    def get_function(function_name):
+        for function in functions:
+            if function_name in (function["FunctionName"], function["FunctionArn"]):
+                return function
+        raise NotFoundError(f"Function {function_name} not found")
+
+    log_service.ecs_service.list_clusters = MagicMock(side_effect=lambda *a, **kw: [])
+    log_service.lambda_service.list_functions = MagicMock(side_effect=lambda *a, **kw: list(functions))
+    log_service.lambda_service.get_function = MagicMock(side_effect=get_function)
+
+
+def test_sync_log_groups():
+    # Start from a cache without the function
+    with suppress(UnprocessedError):
+        log_service.cache_repo.delete("monitoring", "true")
+    mock_functions()
+    assert LOG_GROUP_NAME not in log_service.list_monitoring_log_groups_by_tag("monitoring", "true")
+
+    # The function gets tagged
+    mock_functions(
+        {
+            "FunctionName": "monitoring-local-Dummy",
+            "FunctionArn": FUNCTION_ARN,
+            "Tags": {"monitoring": "true"},
+            "LoggingConfig": {"LogGroup": LOG_GROUP_NAME},
+        }
+    )
+    event = {
+        "version": "0",
+        "id": "1",
+        "detail-type": "Tag Change on Resource",
+        "source": "aws.tag",
+        "account": "000000000000",
+        "time": "2025-01-01T00:00:00Z",
+        "region": "us-east-1",
+        "resources": [FUNCTION_ARN],
+        "detail": {"changed-tag-keys": ["monitoring"], "service": "lambda", "resource-type": "function"},
+    }
+    handler(event, None)
+    assert LOG_GROUP_NAME in log_service.list_monitoring_log_groups_by_tag("monitoring", "true")
+
+    # The function gets deleted
+    mock_functions()
+    event = {
+        "version": "0",
+        "id": "2",
+        "detail-type": "AWS API Call via CloudTrail",
+        "source": "aws.lambda",
+        "account": "000000000000",
+        "time": "2025-01-01T00:00:00Z",
+        "region": "us-east-1",
+        "resources": [],
+        "detail": {
+            "eventName": "DeleteFunction20150331",
+            "requestParameters": {"functionName": "monitoring-local-Dummy"},
+        },
+    }
+    handler(event, None)
+    assert LOG_GROUP_NAME not in log_service.list_monitoring_log_groups_by_tag("monitoring", "true")
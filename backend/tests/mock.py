@@ -1,6 +1,7 @@
 import json
 from dataclasses import dataclass
 from pathlib import Path
+from unittest.mock import MagicMock
 from uuid import uuid4
 
 import boto3
@@ -100,6 +101,24 @@ def load_event(file: Path) -> EventBridgeEvent:
     return EventBridgeEvent(data)
 
 
+def mock_logs_client(statuses: dict[str, str], results: dict[str, list] | None = None) -> MagicMock:
+    """A CloudWatch Logs client whose queries, started in order, end with the given statuses.
+
+    Complete queries return their `results`, a single row by default.
+    """
+    results = results or {}
+    client = MagicMock()
+    client.exceptions.LimitExceededException = type("LimitExceededException", (Exception,), {})
+    client.start_query.side_effect = [{"queryId": query_id} for query_id in statuses]
+    client.get_query_results.side_effect = lambda queryId: {
+        "status": statuses[queryId],
+        "results": results.get(queryId, [[{"field": "@message", "value": "ERROR"}]])
+        if statuses[queryId] == "Complete"
+        else [],
+    }
+    return client
+
+
 def truncate_event_table():
     repo = EventRepository()
     dto = ListEventsDTO()